@@ -0,0 +1,160 @@
+"""
+配置模版检测微基准
+
+测量 cfg.check_auto 与 cfg_meta.load_by_schema 在大型配置文件
+和玩家数据文件上的检测速度。
+指定 --baseline 时, 会用 git archive 取出该版本的 tooldelta 到临时目录,
+在子进程中以相同的数据测量一次作为对照, 例如对比模版编译前的解释执行实现:
+
+    python benchmarks/bench_cfg_schema.py 5000 --baseline 7ab017d^
+
+用法: python benchmarks/bench_cfg_schema.py [条目数] [--baseline <git 版本>]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# 内部参数: 从指定目录导入 tooldelta, 用于测量对照版本
+if "--tree" in sys.argv:
+    sys.path.insert(0, sys.argv[sys.argv.index("--tree") + 1])
+else:
+    sys.path.insert(0, REPO_ROOT)
+
+from tooldelta.utils import cfg, cfg_meta
+from tooldelta.utils.cfg_meta import JsonSchema, field
+
+
+def make_config_schema():
+    return {
+        "服务器名称": str,
+        "是否启用": bool,
+        "刷新间隔": cfg.PFloat,
+        "最大玩家数": cfg.IntRange(1, 1000),
+        "管理员": cfg.JsonList(str),
+        "商店": cfg.AnyKeyValue(
+            {
+                "价格": cfg.PInt,
+                "库存": cfg.NNInt,
+                "描述": str,
+                "标签": cfg.JsonList(str),
+                "折扣": [cfg.FloatRange(0, 1), type(None)],
+            }
+        ),
+    }
+
+
+def make_config(items: int) -> dict:
+    return {
+        "服务器名称": "测试服",
+        "是否启用": True,
+        "刷新间隔": 1.5,
+        "最大玩家数": 100,
+        "管理员": [f"Admin{i}" for i in range(20)],
+        "商店": {
+            f"item_{i}": {
+                "价格": i + 1,
+                "库存": i % 64,
+                "描述": f"商品 {i}",
+                "标签": ["武器", "稀有"],
+                "折扣": 0.5 if i % 2 else None,
+            }
+            for i in range(items)
+        },
+    }
+
+
+class Inventory(JsonSchema):
+    item_id: str = field("id", "minecraft:air", optional=True)
+    count: int = field("count", 0, optional=True)
+
+
+class PlayerData(JsonSchema):
+    name: str = field("name", "", optional=True)
+    money: int = field("money", 0, optional=True)
+    level: int = field("level", 0, optional=True)
+    inventory: list[Inventory] = field("inventory", [], optional=True)
+    stats: dict[str, int] = field("stats", {}, optional=True)
+    title: str | None = field("title", None, optional=True)
+
+
+def make_player_data(players: int) -> dict:
+    return {
+        f"player_{i}": {
+            "name": f"玩家{i}",
+            "money": i * 37 % 100000,
+            "level": i % 100,
+            "inventory": [{"id": "minecraft:diamond", "count": i % 64}] * 4,
+            "stats": {"kills": i % 500, "deaths": i % 300},
+            "title": None,
+        }
+        for i in range(players)
+    }
+
+
+def bench(name: str, func, entries: int, number: int):
+    t = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {name:<32}{t * 1e3:>10.2f} ms {entries / t:>14,.0f} 条/秒")
+
+
+def run(entries: int):
+    schema = make_config_schema()
+    config = make_config(entries)
+    print(f"cfg 配置文件 ({entries} 个商品):")
+    bench("check_auto", lambda: cfg.check_auto(schema, config), entries, 5)
+
+    data = make_player_data(entries)
+    data_type = dict[str, PlayerData]
+    print(f"cfg_meta 玩家数据 ({entries} 名玩家):")
+    bench(
+        "load_by_schema", lambda: cfg_meta.load_by_schema(data, data_type), entries, 5
+    )
+    one = data["player_0"]
+    bench(
+        "load_by_schema (单条写入)",
+        lambda: cfg_meta.load_by_schema(one, PlayerData),
+        1,
+        20000,
+    )
+
+
+def run_baseline(entries: int, rev: str):
+    with tempfile.TemporaryDirectory() as tree:
+        archive = subprocess.run(
+            ["git", "archive", rev, "tooldelta"],
+            cwd=REPO_ROOT,
+            check=True,
+            capture_output=True,
+        ).stdout
+        subprocess.run(["tar", "-x", "-C", tree], input=archive, check=True)
+        print(f"== 对照版本 {rev} ==")
+        # 在临时目录中运行, 避免对照版本在仓库目录下生成缓存文件
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), str(entries), "--tree", tree],
+            cwd=tree,
+            check=True,
+        )
+
+
+def main():
+    entries = 5000
+    baseline = None
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg == "--baseline":
+            baseline = next(args)
+        elif arg == "--tree":
+            next(args)
+        else:
+            entries = int(arg)
+    if baseline is not None:
+        run_baseline(entries, baseline)
+        print("== 当前版本 ==")
+    run(entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+颜色代码转换微基准
+
+对比原先基于 re.sub 回调的 color_to_rich 与当前的单次扫描实现 (带缓存 / 不带缓存)
+每秒可以转换的日志行数。日志行取自加入/退出提示、聊天和接入点启动输出等典型文本,
+其中大部分为重复出现的模板。
+
+用法: python benchmarks/bench_color_to_rich.py [日志行数]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from rich.markup import escape
+
+from tooldelta.utils.fmts import logger
+
+re_color = re.compile(r"§([0-9a-z])")
+
+
+def color_to_rich_regex(text: str):
+    "原先的实现, 作为对照"
+    last_color = ""
+    bold = False
+
+    text = escape(text)
+
+    def repl_cb(match: re.Match[str]) -> str:
+        nonlocal bold, last_color
+        color_char = match.group()[1]
+        if color_char == "r":
+            if bold:
+                bold = False
+                return "[/bold]"
+            if last_color:
+                _last_color = last_color
+                last_color = ""
+                return f"[/#{_last_color}]"
+            return ""
+        elif color_char == "l":
+            bold = True
+            return "[bold]"
+        elif m := logger.color_map.get(color_char):
+            last_color = m
+            return f"[#{m}]"
+        else:
+            return ""
+
+    return re_color.sub(repl_cb, text)
+
+
+def make_lines(count: int) -> list[str]:
+    rnd = random.Random(0)
+    players = [f"Player{i}" for i in range(40)]
+    templates = [
+        "§e{p} 加入了游戏",
+        "§e{p} 退出了游戏",
+        "§a[NOMG] §f正在加载 §b[{n}/60] §7模块",
+        "§6[NOMG] §r区块缓存已就绪 §l§a✓",
+        "§a[Core] §f插件 §b{p}Plugin §f已加载",
+    ]
+    lines = []
+    for _ in range(count):
+        if rnd.random() < 0.1:
+            # 少量不重复的聊天消息
+            lines.append(f"<{rnd.choice(players)}> §f{rnd.random():.6f}")
+        else:
+            lines.append(
+                rnd.choice(templates).format(
+                    p=rnd.choice(players), n=rnd.randint(1, 60)
+                )
+            )
+    return lines
+
+
+def bench(name: str, func, lines: list[str]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        if hasattr(func, "cache_clear"):
+            func.cache_clear()
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    rate = len(lines) / best
+    print(f"  {name:<28}{rate:>14,.0f} 行/秒")
+    return rate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lines = make_lines(count)
+    for line in lines[:1000]:
+        assert logger.color_to_rich.__wrapped__(line) == color_to_rich_regex(line)
+    print(f"{count} 行日志:")
+    old = bench("re.sub 回调 (原实现)", color_to_rich_regex, lines)
+    bench("单次扫描 (无缓存)", logger.color_to_rich.__wrapped__, lines)
+    new = bench("单次扫描 + LRU 缓存", logger.color_to_rich, lines)
+    print(f"  加速比: {new / old:.2f}x")
+    info = logger.color_to_rich.cache_info()
+    print(f"  缓存命中率: {info.hits / max(1, info.hits + info.misses):.1%}")
+
+
+if __name__ == "__main__":
+    main()
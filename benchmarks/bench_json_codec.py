@@ -0,0 +1,108 @@
+"""
+JSON 编解码微基准
+
+对比标准库 json 与 tooldelta.utils.json_codec (安装了 orjson 时使用 orjson)
+在游戏数据包和插件数据文件两类典型数据上的编解码耗时。
+
+用法: python benchmarks/bench_json_codec.py [玩家数据条目数]
+"""
+
+import json
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tooldelta.utils import json_codec
+
+
+def make_text_packet() -> dict:
+    return {
+        "TextType": 1,
+        "NeedsTranslation": False,
+        "SourceName": "玩家名称",
+        "Message": "§a欢迎来到服务器, 输入 .help 查看菜单",
+        "Parameters": [],
+        "XUID": "2535412345678901",
+        "PlatformChatID": "",
+        "PlayerRuntimeID": "-4294967295",
+    }
+
+
+def make_command_output() -> dict:
+    return {
+        "CommandOrigin": {
+            "Origin": 5,
+            "UUID": str(uuid.uuid4()),
+            "RequestID": "96045347-a6a3-4114-94c0-1bc4cc561694",
+            "PlayerUniqueID": 0,
+        },
+        "OutputType": 3,
+        "SuccessCount": 1,
+        "OutputMessages": [
+            {
+                "Success": True,
+                "Message": "commands.querytarget.success",
+                "Parameters": [
+                    '[{"dimension":0,"position":{"x":12.5,"y":64.0,"z":-3.5},'
+                    '"uniqueId":"-21474836479","yRot":90.0}]'
+                ],
+            }
+        ],
+        "DataSet": "",
+    }
+
+
+def make_player_data(players: int) -> dict:
+    return {
+        str(uuid.UUID(int=i)): {
+            "name": f"玩家{i}",
+            "money": i * 37 % 100000,
+            "level": i % 100,
+            "last_login": 1700000000 + i,
+            "inventory": [{"id": "minecraft:diamond", "count": i % 64}] * 4,
+            "stats": {"kills": i % 500, "deaths": i % 300, "online_time": i * 60},
+        }
+        for i in range(players)
+    }
+
+
+def bench(name: str, func, number: int) -> float:
+    t = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {name:<24}{t * 1e6:>12.2f} us")
+    return t
+
+
+def compare(title: str, obj, indent: int | None, number: int):
+    print(f"{title}:")
+    encoded = json.dumps(obj, indent=indent, ensure_ascii=False)
+    raw = encoded.encode("utf-8")
+    old = bench(
+        "json.dumps",
+        lambda: json.dumps(obj, indent=indent, ensure_ascii=False).encode("utf-8"),
+        number,
+    )
+    new = bench(
+        f"{json_codec.ENGINE} dumps_bytes",
+        lambda: json_codec.dumps_bytes(obj, indent=indent),
+        number,
+    )
+    print(f"  编码加速比: {old / new:.2f}x")
+    old = bench("json.loads", lambda: json.loads(raw), number)
+    new = bench(f"{json_codec.ENGINE} loads", lambda: json_codec.loads(raw), number)
+    print(f"  解码加速比: {old / new:.2f}x\n")
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"编解码引擎: {json_codec.ENGINE}\n")
+    compare("Text 数据包", make_text_packet(), None, 20000)
+    compare("CommandOutput 数据包", make_command_output(), None, 20000)
+    data = make_player_data(players)
+    compare(f"玩家数据文件 ({players} 名玩家, indent=2)", data, 2, 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+SubChunk / LevelChunk 解码微基准
+
+对比基于 BytesIO + struct.unpack 逐字段读取的旧解码方式
+与基于偏移 + struct.unpack_from 的零复制解码方式。
+
+用法: python benchmarks/bench_sub_chunk.py [条目数] [每个条目的 NBT 字节数]
+"""
+
+import os
+import struct
+import sys
+import timeit
+from io import BytesIO
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tooldelta.mc_bytes_packet.level_chunk import LevelChunk
+from tooldelta.mc_bytes_packet.sub_chunk import (
+    SUB_CHUNK_RESULT_SUCCESS_ALL_AIR,
+    SubChunk,
+    SubChunkEntry,
+)
+
+
+def legacy_decode_sub_chunk(bs: bytes) -> SubChunk:
+    pk = SubChunk()
+    reader = BytesIO(bs)
+    pk.Dimension = reader.read(1)[0]
+    for _ in range(struct.unpack("<H", reader.read(2))[0]):
+        s = SubChunkEntry()
+        s.Result = reader.read(1)[0]
+        s.SubChunkPosX, s.SubChunkPosY, s.SubChunkPosZ = struct.unpack(
+            "<ihi", reader.read(10)
+        )
+        s.NBTData = numpy.frombuffer(
+            reader.read(struct.unpack("<I", reader.read(4))[0]), dtype=numpy.uint8
+        )
+        s.BlobHash = struct.unpack("<Q", reader.read(8))[0]
+        pk.Entries.append(s)
+    pk.CacheEnabled = bool(reader.read(1)[0])
+    return pk
+
+
+def legacy_decode_level_chunk(bs: bytes) -> LevelChunk:
+    pk = LevelChunk()
+    reader = BytesIO(bs)
+    pk.Dimension = reader.read(1)[0]
+    pk.ChunkPosX, pk.ChunkPosZ = struct.unpack("<ii", reader.read(8))
+    pk.HighestSubChunkIndex = reader.read(1)[0]
+    pk.CacheEnabled = bool(reader.read(1)[0])
+    return pk
+
+
+def filter_all_air_objects(bs: bytes) -> list[tuple[int, int, int]]:
+    s = SubChunk()
+    s.decode(bs)
+    return [
+        (i.SubChunkPosX, i.SubChunkPosY, i.SubChunkPosZ)
+        for i in s.Entries
+        if i.Result == SUB_CHUNK_RESULT_SUCCESS_ALL_AIR
+    ]
+
+
+def filter_all_air_columns(bs: bytes) -> list[tuple[int, int, int]]:
+    s = SubChunk.decode_columns(bs)
+    mask = s.Result == SUB_CHUNK_RESULT_SUCCESS_ALL_AIR
+    return list(
+        zip(
+            s.SubChunkPosX[mask].tolist(),
+            s.SubChunkPosY[mask].tolist(),
+            s.SubChunkPosZ[mask].tolist(),
+        )
+    )
+
+
+def make_sub_chunk(entries: int, nbt_size: int) -> bytes:
+    parts = [struct.pack("<BH", 0, entries)]
+    for i in range(entries):
+        # 大约一半的条目是全空气的 (没有 NBT 数据)
+        nbt = b"" if i % 2 else os.urandom(nbt_size)
+        parts.append(
+            struct.pack("<BihiI", 1 if nbt else 6, i, i % 24 - 4, -i, len(nbt))
+        )
+        parts.append(nbt)
+        parts.append(struct.pack("<Q", i * 2654435761))
+    parts.append(b"\x01")
+    return b"".join(parts)
+
+
+def bench(name: str, func, number: int):
+    cost = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{name:<32} {cost * 1e6:10.2f} us/op")
+    return cost
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    nbt_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    bs = make_sub_chunk(entries, nbt_size)
+    print(f"SubChunk: {entries} 个条目, 包体 {len(bs) / 1024:.1f} KiB")
+    old = bench("BytesIO + struct.unpack", lambda: legacy_decode_sub_chunk(bs), 200)
+    new = bench("unpack_from + 零复制视图", lambda: SubChunk().decode(bs), 200)
+    print(f"加速比: {old / new:.2f}x\n")
+
+    print("筛选全空气条目:")
+    old = bench("SubChunk 对象 + Python 循环", lambda: filter_all_air_objects(bs), 200)
+    new = bench("列式解码 + 向量化掩码", lambda: filter_all_air_columns(bs), 200)
+    print(f"加速比: {old / new:.2f}x\n")
+
+    lc = struct.pack("<BiiBB", 0, 12, -34, 15, 1)
+    print("LevelChunk:")
+    old = bench(
+        "BytesIO + struct.unpack", lambda: legacy_decode_level_chunk(lc), 100000
+    )
+    new = bench("unpack_from", lambda: LevelChunk().decode(lc), 100000)
+    print(f"加速比: {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,7 @@ from .internal.launch_cli import (
 )
 
 from .utils import internal as utils_internal, cfg, fmts, mc_translator
+from .utils import startup_profiler
 from .version import get_tool_delta_version
 from .plugin_load.plugins import PluginGroup
 
@@ -62,6 +63,7 @@ class ToolDelta:
         def signal_handler(_, pyframe) -> None:
             fmts.print_war("§6ToolDelta 已被手动终止")
             self.system_exit("用户退出程序")
+            fmts.logger.flush_async_logs()
             os._exit(1)
 
         signal.signal(signal.SIGINT, signal_handler)
@@ -163,7 +165,6 @@ class ToolDelta:
                 fmts.print_inf("重载: 正在让插件自行退出..")
                 fmts.print_inf("重载: 正在保存数据缓存文件..")
                 utils.safe_close(SysStatus.RELOAD)
-                self.cmd_manager.reset_cmds()
                 fmts.print_inf("重载: 正在重新载入插件..")
                 self.plugin_group.reload()
                 fmts.print_suc("重载插件: 全部插件重载成功！")
@@ -237,7 +238,6 @@ class GameCtrl:
         Args:
             frame (ToolDelta): 继承 Frame 的对象
         """
-        mc_translator.init_pool()
         self.linked_frame = frame
 
     def hook_packet_handler(self, hdl: "PacketHandler"):
@@ -296,6 +296,7 @@ class GameCtrl:
     def system_inject(self):
         self.linked_frame.players_maintainer.block_init()
         self.linked_frame.plugin_group.execute_init(self.linked_frame.on_plugin_err)
+        startup_profiler.finish()
         self.inject_welcome()
 
     def inject_welcome(self) -> None:
@@ -412,6 +413,22 @@ class GameCtrl:
         resp: Packet_CommandOutput = self.sendwscmd(cmd, True, timeout)  # type: ignore
         return resp
 
+    async def sendwscmd_with_resp_async(
+        self, cmd: str, timeout: float = 30
+    ) -> Packet_CommandOutput:
+        """
+        发送 WebSocket 指令并异步等待返回, 需要在框架的异步事件循环中等待
+        (见 `tooldelta.utils.async_loop`)。
+
+        Args:
+            cmd (str): MC WebSocket 指令
+            timeout (float, optional): 超时时间, 超时则引发 TimeoutError
+
+        Returns:
+            Packet_CommandOutput: 指令返回类
+        """
+        return await self.launcher.sendwscmd_with_resp_async(cmd, timeout)
+
     def sendwocmd(self, cmd: str) -> None:
         """
         发送 SettingsCommand 指令。
@@ -4,7 +4,15 @@ from typing import Any, TYPE_CHECKING
 from collections.abc import Callable
 from .. import plugin_market
 from ..constants import SysStatus
-from ..utils import fmts, mc_translator, thread_func, ToolDeltaThread
+from ..utils import (
+    fmts,
+    mc_translator,
+    thread_func,
+    try_int,
+    ToolDeltaThread,
+    get_thread_usage_counts,
+)
+from ..plugin_load.classic_plugin import listener_stats
 from .launch_cli import FrameNeOmegaLauncher, FrameNeOmgAccessPoint
 
 
@@ -201,6 +209,15 @@ class ConsoleCmdManager:
             players_format = ", ".join(p.name for p in players)
             fmts.print_inf(f"在线玩家 {len(list(players))} 人: {players_format}")
 
+        def _threads(_):
+            counts = get_thread_usage_counts()
+            fmts.print_inf(f"正在运行的线程 {sum(counts.values())} 个:")
+            for usage, count in counts.items():
+                fmts.print_inf(f" §e{count:>4}§f  {usage}")
+
+        def _slow_listeners(args: list[str]):
+            listener_stats.print_top_listeners(try_int(args[0]) or 10 if args else 10)
+
         def _exit(_):
             fmts.print_inf("准备退出..")
             self.frame.launcher.update_status(SysStatus.NORMAL_EXIT)
@@ -230,6 +247,15 @@ class ConsoleCmdManager:
             lambda args: _execute_mc_command_and_get_callback(args) and None,
         )
         self.add_console_cmd_trigger(["list"], None, "查询在线玩家", _list)
+        self.add_console_cmd_trigger(
+            ["threads"], None, "查询各用途正在运行的线程数", _threads
+        )
+        self.add_console_cmd_trigger(
+            ["slowcb"],
+            "[数量]",
+            "查询插件监听器的耗时排行",
+            _slow_listeners,
+        )
         self.add_console_cmd_trigger(
             ["reload"],
             None,
@@ -242,9 +268,17 @@ class ConsoleCmdManager:
             )
         self.add_console_cmd_trigger(["!"], "[消息]", "在游戏内广播消息", say)
 
-    def reset_cmds(self):
+    def reset_cmds(self, keep: Callable[[CommandTrigger], bool] | None = None):
+        """
+        清除插件注册的控制台命令并重新注册内置命令
+
+        Args:
+            keep (Callable[[CommandTrigger], bool], optional): 返回 True 的命令会被保留
+        """
+        kept = {k: v for k, v in self.commands.items() if keep and keep(v)}
         self.commands.clear()
         self.prepare_internal_cmds()
+        self.commands.update(kept)
 
     def start_proc_thread(self):
         self.prepare_internal_cmds()
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 from ..auths import fblike_sign_login
 from ..constants import tooldelta_cfg, tooldelta_cli
 from ..utils import cfg, urlmethod, sys_args, fbtokenFix, if_token, fmts
+from ..utils import startup_profiler
 from .launch_cli import (
     FrameNeOmegaLauncher,
     FrameNeOmgAccessPoint,
@@ -43,6 +44,7 @@ class ConfigLoader:
     def __init__(self, frame: "ToolDelta"):
         self.frame = frame
 
+    @startup_profiler.profiled("读取配置")
     def load_tooldelta_cfg_and_get_launcher(self) -> LAUNCHERS:
         """加载配置文件"""
         cfg.write_default_cfg_file("ToolDelta基本配置.json", tooldelta_cfg.LAUNCH_CFG)
@@ -1,4 +1,3 @@
-import json
 import uuid
 import msgpack
 import threading
@@ -11,7 +10,7 @@ from dataclasses import dataclass
 from .... import constants, utils
 from ....constants import PacketIDS
 from ....internal.types import Packet_CommandOutput
-from ....utils import fmts
+from ....utils import fmts, json_codec
 from ....mc_bytes_packet.base_bytes_packet import BaseBytesPacket
 from ....mc_bytes_packet.pool import BYTES_PACKET_ID_POOL
 
@@ -166,7 +165,7 @@ class Eulogist:
                 self.send(
                     Message(
                         MessageType.MSG_CLIENT_PKT_JSON,
-                        {"ID": pkID, "Content": json.dumps(pk).encode()},
+                        {"ID": pkID, "Content": json_codec.dumps_bytes(pk)},
                     )
                 )
 
@@ -61,6 +61,20 @@ class BlobHashHolder:
         """
         return self._base_blob_hash_holder.omega.update_blob_cache(hash, payload)
 
+    def load_blob_caches(self, hashes: list[int]) -> list[bytes]:
+        """
+        load_blob_caches 是 load_blob_cache 的批量版本,
+        返回与 hashes 一一对应的数据负载，不存在的为空 bytes
+        """
+        return self._base_blob_hash_holder.omega.load_blob_caches(hashes)
+
+    def update_blob_caches(self, pairs: list[tuple[int, bytes]]) -> list[bool]:
+        """
+        update_blob_caches 是 update_blob_cache 的批量版本,
+        返回与 pairs 一一对应的写入结果
+        """
+        return self._base_blob_hash_holder.omega.update_blob_caches(pairs)
+
     def as_server_side(self) -> None:
         """
         as_server_side 返回针对服务者实现的函数。
@@ -1,10 +1,13 @@
+import numpy
 from tooldelta.internal.launch_cli.neo_libs.blob_hash.define import (
     BLOCKING_DEADLINE_SECONDS,
     BaseBlobHashHolder,
 )
 from tooldelta.internal.launch_cli.neo_libs.blob_hash.packet.define import (
+    HASH_WITH_POSITION_DTYPE,
     HashWithPosition,
     PayloadByHash,
+    find_hashes,
 )
 from tooldelta.internal.launch_cli.neo_libs.blob_hash.packet.server_and_client import (
     ClientGetDiskHashPayload,
@@ -65,9 +68,10 @@ class ClientFunction:
         resp = GetHashPayloadResponse()
         resp.decode(resp_bytes)
 
-        for i in resp.payload:
-            payload = i.payload.tobytes()
-            if self.base_blob_hash_holder.omega.update_blob_cache(i.hash.hash, payload):
+        pairs = [(i.hash.hash, i.payload.tobytes()) for i in resp.payload]
+        states = self.base_blob_hash_holder.omega.update_blob_caches(pairs)
+        for i, (_, payload), success in zip(resp.payload, pairs, states):
+            if success:
                 mapping[i.hash] = payload
 
         return mapping
@@ -130,3 +134,51 @@ class ClientFunction:
                 miss.append(hashes[i])
 
         return hit, miss
+
+    def query_disk_hash_exist_array(
+        self, hashes: numpy.ndarray
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        query_disk_hash_exist_array 是 query_disk_hash_exist 的数组版本。
+
+        hashes 为 HASH_WITH_POSITION_DTYPE 结构化数组，
+        返回的元组中的每个元素从左到右依次代表命中的缓存和
+        未被命中的缓存，同样为结构化数组
+        """
+        request = ClientQueryDiskHashExist(hashes)
+        resp_bytes: bytes = self.base_blob_hash_holder.omega.soft_call_with_bytes(
+            request.packet_name, request.encode(), timeout=BLOCKING_DEADLINE_SECONDS
+        )  # type: ignore
+
+        resp = ClientQueryDiskHashExistResponse()
+        resp.decode(resp_bytes)
+
+        hashes = numpy.asarray(hashes, dtype=HASH_WITH_POSITION_DTYPE)
+        states = numpy.zeros(len(hashes), dtype=numpy.bool)
+        states[: len(resp.states)] = resp.states[: len(hashes)]
+        return hashes[states], hashes[~states]
+
+    def get_disk_hash_payload_array(
+        self, hashes: numpy.ndarray
+    ) -> tuple[numpy.ndarray, list[numpy.ndarray], numpy.ndarray]:
+        """
+        get_disk_hash_payload_array 是 get_disk_hash_payload 的数组版本。
+
+        hashes 为 HASH_WITH_POSITION_DTYPE 结构化数组，
+        返回的元组中的每个元素从左到右依次代表命中的缓存、
+        与命中的缓存一一对应的数据荷载，以及未被命中的缓存
+        """
+        request = ClientGetDiskHashPayload(hashes)
+        resp_bytes: bytes = self.base_blob_hash_holder.omega.soft_call_with_bytes(
+            request.packet_name, request.encode(), timeout=BLOCKING_DEADLINE_SECONDS
+        )  # type: ignore
+
+        resp_hashes, resp_payloads = ClientGetDiskHashPayloadResponse.decode_arrays(
+            resp_bytes
+        )
+
+        hashes = numpy.asarray(hashes, dtype=HASH_WITH_POSITION_DTYPE)
+        index = find_hashes(hashes, resp_hashes)
+        found = index >= 0
+        payloads = [resp_payloads[i] for i in index[found].tolist()]
+        return hashes[found], payloads, hashes[~found]
@@ -0,0 +1,339 @@
+import mmap
+import os
+import struct
+import threading
+import uuid
+import numpy
+
+from pathlib import Path
+from tooldelta.constants import TOOLDELTA_SYSTEM_PATH
+from tooldelta.internal.launch_cli.neo_libs.blob_hash.packet.define import (
+    HashWithPosition,
+    PayloadByHash,
+)
+
+DEFAULT_STORE_PATH = TOOLDELTA_SYSTEM_PATH / "mirror_world"
+
+# 文件头: 魔数 + 代号。数据文件与索引文件的代号相同时索引才可信,
+# 否则 (例如压缩整理时在替换两个文件之间崩溃) 将从数据文件重建索引
+_FILE_HEADER = struct.Struct("<8s16s")
+_DATA_MAGIC = b"TDMWDATA"
+_INDEX_MAGIC = b"TDMWINDX"
+# 数据记录头: hash, x, y, z, dimension, len(payload), 其后紧跟 payload;
+# hash 为 0 且没有 payload 的记录表示该子区块被置为空气
+_DATA_RECORD = struct.Struct("<QiiiBI")
+# 索引记录: x, y, z, dimension, hash, payload 在数据文件中的偏移, len(payload)
+_INDEX_RECORD = struct.Struct("<iiiBQQI")
+_INDEX_DTYPE = numpy.dtype(
+    [
+        ("x", "<i4"),
+        ("y", "<i4"),
+        ("z", "<i4"),
+        ("dimension", "u1"),
+        ("hash", "<u8"),
+        ("offset", "<u8"),
+        ("length", "<u4"),
+    ]
+)
+
+PosKey = tuple[int, int, int, int]
+IndexEntry = tuple[int, int, int]
+
+
+class LocalMirrorWorldStore:
+    """
+    LocalMirrorWorldStore 是镜像存档持有人处理函数的本地参考实现，
+    以 (子区块位置, 维度) 为键保存该子区块当前的 blob hash 及其数据荷载。
+
+    数据荷载以追加写入的方式存放在数据文件中，并通过内存映射读取；
+    被置为空气的子区块同样在数据文件中写入一条空记录, 使索引可以完全从数据文件重建。
+    索引文件同样只追加写入，启动时一次读入内存，用于处理 QueryDiskHashExist。
+    被覆盖的旧荷载在失效数据达到阈值后通过 compact 压缩整理清除
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_STORE_PATH,
+        fsync: bool = True,
+        compact_min_bytes: int = 64 * 1024 * 1024,
+        compact_garbage_ratio: float = 0.5,
+    ):
+        """
+        Args:
+            path (str | Path): 存放数据文件和索引文件的目录
+            fsync (bool): 每批写入后是否调用 fsync 确保数据落盘
+            compact_min_bytes (int): 失效数据至少达到多少字节才会自动压缩整理
+            compact_garbage_ratio (float): 失效数据占数据文件的比例达到多少时自动压缩整理
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_garbage_ratio = compact_garbage_ratio
+        self._lock = threading.RLock()
+        self._data_path = self.path / "payloads.dat"
+        self._index_path = self.path / "index.dat"
+        self._index: dict[PosKey, IndexEntry] = {}
+        self._garbage_bytes = 0
+        self._mmap: mmap.mmap | None = None
+        self._mmap_size = 0
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    # 镜像存档持有人处理函数 (MirrorWorldHandler.set_handler)
+
+    def query_disk_hash_exist(self, hashes: list[HashWithPosition]) -> list[bool]:
+        """检查 hashes 是否与镜像存档中对应子区块记录的 blob hash 一致"""
+        index = self._index
+        return [
+            (entry := index.get(_pos_key(h))) is not None and entry[0] == h.hash
+            for h in hashes
+        ]
+
+    def get_disk_hash_payload(
+        self, hashes: list[HashWithPosition]
+    ) -> list[PayloadByHash]:
+        """批量读取 hashes 中命中镜像存档的子区块的数据荷载"""
+        with self._lock:
+            hits: list[tuple[int, int, HashWithPosition]] = []
+            for h in hashes:
+                entry = self._index.get(_pos_key(h))
+                if entry is not None and entry[0] == h.hash and entry[2] > 0:
+                    hits.append((entry[1], entry[2], h))
+            if not hits:
+                return []
+            mm = self._get_mmap()
+            # 按文件偏移顺序读取, 减少随机读
+            payloads = {
+                id(h): numpy.frombuffer(mm[offset : offset + length], numpy.uint8)
+                for offset, length, h in sorted(hits, key=lambda x: x[0])
+            }
+            return [PayloadByHash(h, payloads[id(h)]) for _, _, h in hits]
+
+    def require_sync_hash_to_disk(self, payloads: list[PayloadByHash]) -> None:
+        """将 (hash, payload) 写入镜像存档, 整批写入后只进行一次 fsync"""
+        if not payloads:
+            return
+        with self._lock:
+            data_parts: list[bytes] = []
+            index_parts: list[bytes] = []
+            offset = self._data_size
+            for p in payloads:
+                h = p.hash
+                key = _pos_key(h)
+                payload = p.payload.tobytes()
+                data_parts.append(
+                    _DATA_RECORD.pack(h.hash, *key[:3], key[3], len(payload))
+                )
+                data_parts.append(payload)
+                payload_offset = offset + _DATA_RECORD.size
+                index_parts.append(
+                    _INDEX_RECORD.pack(*key, h.hash, payload_offset, len(payload))
+                )
+                self._replace_entry(key, (h.hash, payload_offset, len(payload)))
+                offset = payload_offset + len(payload)
+            self._data_file.write(b"".join(data_parts))
+            self._sync_file(self._data_file)
+            self._data_size = offset
+            self._index_file.write(b"".join(index_parts))
+            self._sync_file(self._index_file)
+            self._maybe_compact()
+
+    def clean_blob_hash_and_apply_to_world(self, pos: list[HashWithPosition]) -> None:
+        """将 pos 中的子区块置为空气 (blob hash 为 0), 已经是空气的子区块不会产生写入"""
+        with self._lock:
+            data_parts: list[bytes] = []
+            index_parts: list[bytes] = []
+            offset = self._data_size
+            for h in pos:
+                key = _pos_key(h)
+                entry = self._index.get(key)
+                if entry is not None and entry[0] == 0:
+                    continue
+                data_parts.append(_DATA_RECORD.pack(0, *key[:3], key[3], 0))
+                offset += _DATA_RECORD.size
+                index_parts.append(_INDEX_RECORD.pack(*key, 0, offset, 0))
+                self._replace_entry(key, (0, offset, 0))
+            if index_parts:
+                self._data_file.write(b"".join(data_parts))
+                self._sync_file(self._data_file)
+                self._data_size = offset
+                self._index_file.write(b"".join(index_parts))
+                self._sync_file(self._index_file)
+                self._maybe_compact()
+
+    # 维护
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> dict[str, int]:
+        """返回存储的统计信息"""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "data_bytes": self._data_size,
+                "garbage_bytes": self._garbage_bytes,
+            }
+
+    def flush(self) -> None:
+        """将已写入的数据刷新并落盘"""
+        with self._lock:
+            for f in (self._data_file, self._index_file):
+                f.flush()
+                os.fsync(f.fileno())
+
+    def compact(self) -> None:
+        """压缩整理: 重写数据文件和索引文件, 只保留每个子区块的最新荷载"""
+        with self._lock:
+            mm = self._get_mmap()
+            generation = uuid.uuid4().bytes
+            data_tmp = self._data_path.with_suffix(".dat.tmp")
+            index_tmp = self._index_path.with_suffix(".dat.tmp")
+            new_index: dict[PosKey, IndexEntry] = {}
+            with open(data_tmp, "wb") as data_f, open(index_tmp, "wb") as index_f:
+                data_f.write(_FILE_HEADER.pack(_DATA_MAGIC, generation))
+                index_f.write(_FILE_HEADER.pack(_INDEX_MAGIC, generation))
+                offset = _FILE_HEADER.size
+                index_parts: list[bytes] = []
+                for key, (h, old_offset, length) in sorted(
+                    self._index.items(), key=lambda x: x[1][1]
+                ):
+                    # 空气记录同样保留, 否则重建索引后会丢失
+                    data_f.write(_DATA_RECORD.pack(h, *key[:3], key[3], length))
+                    if length:
+                        data_f.write(mm[old_offset : old_offset + length])
+                    new_offset = offset + _DATA_RECORD.size
+                    offset = new_offset + length
+                    new_index[key] = (h, new_offset, length)
+                    index_parts.append(_INDEX_RECORD.pack(*key, h, new_offset, length))
+                index_f.write(b"".join(index_parts))
+                for f in (data_f, index_f):
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._close_files()
+            # 先替换数据文件; 若在两次替换之间崩溃, 代号不一致会使索引从数据文件重建
+            os.replace(data_tmp, self._data_path)
+            os.replace(index_tmp, self._index_path)
+            self._index = new_index
+            self._garbage_bytes = 0
+            self._open_files()
+
+    def close(self) -> None:
+        """落盘并关闭存储"""
+        with self._lock:
+            self.flush()
+            self._close_files()
+
+    # 内部实现
+
+    def _open(self):
+        if not self._data_path.is_file():
+            with open(self._data_path, "wb") as f:
+                f.write(_FILE_HEADER.pack(_DATA_MAGIC, uuid.uuid4().bytes))
+        with open(self._data_path, "rb") as f:
+            magic, generation = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+        if magic != _DATA_MAGIC:
+            raise ValueError(f"{self._data_path} 不是镜像存档数据文件")
+        if not self._load_index(generation):
+            self._rebuild_index(generation)
+        self._open_files()
+
+    def _open_files(self):
+        self._data_file = open(self._data_path, "ab")
+        self._index_file = open(self._index_path, "ab")
+        self._data_size = self._data_file.tell()
+
+    def _close_files(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mmap_size = 0
+        self._data_file.close()
+        self._index_file.close()
+
+    def _load_index(self, generation: bytes) -> bool:
+        if not self._index_path.is_file():
+            return False
+        with open(self._index_path, "rb") as f:
+            header = f.read(_FILE_HEADER.size)
+            if len(header) != _FILE_HEADER.size or header != _FILE_HEADER.pack(
+                _INDEX_MAGIC, generation
+            ):
+                return False
+            records = numpy.fromfile(f, dtype=_INDEX_DTYPE)
+        data_size = self._data_path.stat().st_size
+        # 丢弃指向数据文件末尾之外的记录 (数据未完全写入时崩溃)
+        valid = records["offset"] + records["length"] <= data_size
+        if not valid.all():
+            records = records[: int(numpy.argmin(valid))]
+        for x, y, z, dim, h, offset, length in records.tolist():
+            self._replace_entry((x, y, z, dim), (h, offset, length))
+        # 截断末尾不完整的记录, 保证之后追加的记录对齐
+        with open(self._index_path, "r+b") as f:
+            f.truncate(_FILE_HEADER.size + len(records) * _INDEX_RECORD.size)
+        # 数据文件中未被索引的尾部 (写入索引前崩溃) 同样截断,
+        # 否则之后从数据文件重建索引时会将其误认为记录
+        data_end = int((records["offset"] + records["length"]).max(initial=0))
+        with open(self._data_path, "r+b") as f:
+            f.truncate(max(data_end, _FILE_HEADER.size))
+        return True
+
+    def _rebuild_index(self, generation: bytes):
+        self._index = {}
+        index_parts: list[bytes] = []
+        offset = _FILE_HEADER.size
+        # 通过内存映射逐条扫描, 不将整个数据文件读入内存
+        with (
+            open(self._data_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            size = len(mm)
+            while offset + _DATA_RECORD.size <= size:
+                h, x, y, z, dim, length = _DATA_RECORD.unpack_from(mm, offset)
+                payload_offset = offset + _DATA_RECORD.size
+                if payload_offset + length > size:
+                    break
+                key = (x, y, z, dim)
+                self._replace_entry(key, (h, payload_offset, length))
+                index_parts.append(_INDEX_RECORD.pack(*key, h, payload_offset, length))
+                offset = payload_offset + length
+        # 丢弃末尾不完整的数据记录
+        with open(self._data_path, "r+b") as f:
+            f.truncate(offset)
+        with open(self._index_path, "wb") as f:
+            f.write(_FILE_HEADER.pack(_INDEX_MAGIC, generation))
+            f.write(b"".join(index_parts))
+
+    def _replace_entry(self, key: PosKey, entry: IndexEntry):
+        old = self._index.get(key)
+        # 空气记录的偏移为 0 时来自旧版本, 数据文件中没有对应的记录
+        if old is not None and (old[2] or old[1]):
+            self._garbage_bytes += _DATA_RECORD.size + old[2]
+        self._index[key] = entry
+
+    def _sync_file(self, f):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _get_mmap(self) -> mmap.mmap:
+        if self._mmap is None or self._mmap_size != self._data_size:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._data_file.flush()
+            with open(self._data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_size = self._data_size
+        return self._mmap
+
+    def _maybe_compact(self):
+        if (
+            self._garbage_bytes >= self.compact_min_bytes
+            and self._garbage_bytes >= self._data_size * self.compact_garbage_ratio
+        ):
+            self.compact()
+
+
+def _pos_key(h: HashWithPosition) -> PosKey:
+    pos = h.sub_chunk_pos
+    return (pos.x, pos.y, pos.z, h.dimension)
@@ -1,5 +1,10 @@
 from collections.abc import Callable
+from pathlib import Path
 from tooldelta.internal.launch_cli.neo_libs.blob_hash.define import BaseBlobHashHolder
+from tooldelta.internal.launch_cli.neo_libs.blob_hash.disk_store import (
+    DEFAULT_STORE_PATH,
+    LocalMirrorWorldStore,
+)
 from tooldelta.internal.launch_cli.neo_libs.blob_hash.packet.define import (
     HashWithPosition,
     PayloadByHash,
@@ -122,3 +127,29 @@ class MirrorWorldHandler:
         self.f3 = handle_require_sync_hash_to_disk
         self.f4 = handle_clean_blob_hash_and_apply_to_world
         self.f5 = handle_server_disconnect
+
+    def use_local_store(
+        self,
+        path: str | Path = DEFAULT_STORE_PATH,
+        handle_server_disconnect: Callable[[], None] | None = None,
+        **store_kwargs,
+    ) -> LocalMirrorWorldStore:
+        """use_local_store 使用内置的本地持久化存储作为镜像存档，并据此设置处理器
+
+        Args:
+            path (str | Path): 存放镜像存档数据文件和索引文件的目录
+            handle_server_disconnect (Callable[[], None] | None): 同 set_handler
+            **store_kwargs: 传给 LocalMirrorWorldStore 的其他参数
+
+        Returns:
+            LocalMirrorWorldStore: 所使用的本地存储，可用于手动压缩整理或关闭
+        """
+        store = LocalMirrorWorldStore(path, **store_kwargs)
+        self.set_handler(
+            store.query_disk_hash_exist,
+            store.get_disk_hash_payload,
+            store.require_sync_hash_to_disk,
+            store.clean_blob_hash_and_apply_to_world,
+            handle_server_disconnect,
+        )
+        return store
@@ -94,20 +94,16 @@ class MirrorWorldListener:
         if self.mirror_world_handler.f4 is None:
             return
 
-        pos: list[HashWithPosition] = []
-
-        s = SubChunk()
-        s.decode(bs)
-
-        for i in s.Entries:
-            if i.Result == SUB_CHUNK_RESULT_SUCCESS_ALL_AIR:
-                pos.append(
-                    HashWithPosition(
-                        0,
-                        SubChunkPos(i.SubChunkPosX, i.SubChunkPosY, i.SubChunkPosZ),
-                        s.Dimension,
-                    )
-                )
+        s = SubChunk.decode_columns(bs)
+        all_air = s.Result == SUB_CHUNK_RESULT_SUCCESS_ALL_AIR
+        pos: list[HashWithPosition] = [
+            HashWithPosition(0, SubChunkPos(x, y, z), s.Dimension)
+            for x, y, z in zip(
+                s.SubChunkPosX[all_air].tolist(),
+                s.SubChunkPosY[all_air].tolist(),
+                s.SubChunkPosZ[all_air].tolist(),
+            )
+        ]
 
         if len(pos) > 0:
             self.mirror_world_handler.f4(pos)
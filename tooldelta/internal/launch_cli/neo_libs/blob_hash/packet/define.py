@@ -43,6 +43,118 @@ def decode_hash_with_position(reader: BytesIO) -> HashWithPosition:
     return HashWithPosition(hash, SubChunkPos(x, y, z), dimension)
 
 
+# HashWithPosition 的数组形式, 每个元素的内存布局与网络格式 (<Qiii + 维度 u1) 完全一致,
+# 因此可以直接通过 tobytes/frombuffer 编解码
+HASH_WITH_POSITION_DTYPE = numpy.dtype(
+    [
+        ("hash", "<u8"),
+        ("x", "<i4"),
+        ("y", "<i4"),
+        ("z", "<i4"),
+        ("dimension", "u1"),
+    ]
+)
+# 将整个元素视为一个定长字节串, 用于数组之间的成员检测和查找
+_HASH_WITH_POSITION_KEY = numpy.dtype((numpy.void, HASH_WITH_POSITION_DTYPE.itemsize))
+_PAYLOAD_HEADER = struct.Struct("<QiiiBI")
+
+
+def hashes_to_array(hashes: list[HashWithPosition]) -> numpy.ndarray:
+    """将 HashWithPosition 列表转换为 HASH_WITH_POSITION_DTYPE 结构化数组"""
+    return numpy.array(
+        [
+            (
+                h.hash,
+                h.sub_chunk_pos.x,
+                h.sub_chunk_pos.y,
+                h.sub_chunk_pos.z,
+                h.dimension,
+            )
+            for h in hashes
+        ],
+        dtype=HASH_WITH_POSITION_DTYPE,
+    )
+
+
+def array_to_hashes(arr: numpy.ndarray) -> list[HashWithPosition]:
+    """将 HASH_WITH_POSITION_DTYPE 结构化数组转换为 HashWithPosition 列表"""
+    return [
+        HashWithPosition(h, SubChunkPos(x, y, z), dim)
+        for h, x, y, z, dim in arr.tolist()
+    ]
+
+
+def encode_hashes(hashes: list[HashWithPosition] | numpy.ndarray) -> bytes:
+    """编码带长度前缀 (<H) 的 HashWithPosition 序列, 可以传入列表或结构化数组"""
+    if not isinstance(hashes, numpy.ndarray):
+        hashes = hashes_to_array(hashes)
+    return (
+        struct.pack("<H", len(hashes))
+        + numpy.ascontiguousarray(hashes, dtype=HASH_WITH_POSITION_DTYPE).tobytes()
+    )
+
+
+def decode_hashes_array(bs: bytes, offset: int = 0) -> tuple[numpy.ndarray, int]:
+    """
+    解码带长度前缀 (<H) 的 HashWithPosition 序列
+
+    Returns:
+        tuple[numpy.ndarray, int]: 结构化数组 (与 bs 共享内存) 和解码结束后的偏移
+    """
+    (count,) = struct.unpack_from("<H", bs, offset)
+    offset += 2
+    arr = numpy.frombuffer(bs, HASH_WITH_POSITION_DTYPE, count, offset)
+    return arr, offset + arr.nbytes
+
+
+def decode_payloads_array(
+    bs: bytes, offset: int = 0
+) -> tuple[numpy.ndarray, list[numpy.ndarray]]:
+    """
+    解码带长度前缀 (<H) 的 PayloadByHash 序列
+
+    Returns:
+        tuple[numpy.ndarray, list[numpy.ndarray]]:
+            HASH_WITH_POSITION_DTYPE 结构化数组, 以及与之一一对应的数据荷载 (与 bs 共享内存)
+    """
+    (count,) = struct.unpack_from("<H", bs, offset)
+    offset += 2
+    hashes = numpy.empty(count, dtype=HASH_WITH_POSITION_DTYPE)
+    payloads: list[numpy.ndarray] = []
+    for i in range(count):
+        h, x, y, z, dim, length = _PAYLOAD_HEADER.unpack_from(bs, offset)
+        offset += _PAYLOAD_HEADER.size
+        hashes[i] = (h, x, y, z, dim)
+        payloads.append(numpy.frombuffer(bs, numpy.uint8, length, offset))
+        offset += length
+    return hashes, payloads
+
+
+def find_hashes(hashes: numpy.ndarray, targets: numpy.ndarray) -> numpy.ndarray:
+    """
+    在 targets 中查找 hashes 的每个元素 (hash 与位置、维度均相同)
+
+    Returns:
+        numpy.ndarray: 与 hashes 等长的下标数组, 未找到的元素为 -1
+    """
+    result = numpy.full(len(hashes), -1, dtype=numpy.intp)
+    if len(hashes) == 0 or len(targets) == 0:
+        return result
+    keys = numpy.ascontiguousarray(hashes, HASH_WITH_POSITION_DTYPE).view(
+        _HASH_WITH_POSITION_KEY
+    )
+    target_keys = numpy.ascontiguousarray(targets, HASH_WITH_POSITION_DTYPE).view(
+        _HASH_WITH_POSITION_KEY
+    )
+    order = numpy.argsort(target_keys)
+    pos = numpy.searchsorted(target_keys, keys, sorter=order)
+    pos[pos == len(targets)] = 0
+    candidate = order[pos]
+    found = target_keys[candidate] == keys
+    result[found] = candidate[found]
+    return result
+
+
 @dataclass
 class PayloadByHash:
     hash: HashWithPosition = field(default_factory=lambda: HashWithPosition())
@@ -5,7 +5,10 @@ from dataclasses import dataclass, field
 from io import BytesIO
 from tooldelta.internal.launch_cli.neo_libs.blob_hash.packet.define import (
     HashWithPosition,
+    HASH_WITH_POSITION_DTYPE,
     PayloadByHash,
+    decode_payloads_array,
+    encode_hashes,
 )
 
 
@@ -35,15 +38,11 @@ class SetHolderResponse:
 
 @dataclass
 class GetHashPayload:
-    hashes: list[HashWithPosition] = field(default_factory=lambda: [])
+    hashes: list[HashWithPosition] | numpy.ndarray = field(default_factory=lambda: [])
     packet_name: str = "blob-hash-get-hash-payload"
 
     def encode(self) -> bytes:
-        writer = BytesIO()
-        writer.write(struct.pack("<H", len(self.hashes)))
-        for i in self.hashes:
-            i.encode(writer)
-        return writer.getvalue()
+        return encode_hashes(self.hashes)
 
 
 @dataclass
@@ -63,15 +62,11 @@ class GetHashPayloadResponse:
 
 @dataclass
 class ClientQueryDiskHashExist:
-    hashes: list[HashWithPosition] = field(default_factory=lambda: [])
+    hashes: list[HashWithPosition] | numpy.ndarray = field(default_factory=lambda: [])
     packet_name: str = "blob-hash-client-query-disk-hash-exist"
 
     def encode(self) -> bytes:
-        writer = BytesIO()
-        writer.write(struct.pack("<H", len(self.hashes)))
-        for i in self.hashes:
-            i.encode(writer)
-        return writer.getvalue()
+        return encode_hashes(self.hashes)
 
 
 @dataclass
@@ -92,15 +87,11 @@ class ClientQueryDiskHashExistResponse:
 
 @dataclass
 class ClientGetDiskHashPayload:
-    hashes: list[HashWithPosition] = field(default_factory=lambda: [])
+    hashes: list[HashWithPosition] | numpy.ndarray = field(default_factory=lambda: [])
     packet_name: str = "blob-hash-client-get-disk-hash-payload"
 
     def encode(self) -> bytes:
-        writer = BytesIO()
-        writer.write(struct.pack("<H", len(self.hashes)))
-        for i in self.hashes:
-            i.encode(writer)
-        return writer.getvalue()
+        return encode_hashes(self.hashes)
 
 
 @dataclass
@@ -116,3 +107,16 @@ class ClientGetDiskHashPayloadResponse:
             p = PayloadByHash()
             p.decode(reader)
             self.payload.append(p)
+
+    @staticmethod
+    def decode_arrays(bs: bytes | None) -> tuple[numpy.ndarray, list[numpy.ndarray]]:
+        """
+        以数组形式解码, 不构造 PayloadByHash
+
+        Returns:
+            tuple[numpy.ndarray, list[numpy.ndarray]]:
+                HASH_WITH_POSITION_DTYPE 结构化数组, 以及与之一一对应的数据荷载
+        """
+        if bs is None:
+            return numpy.empty(0, dtype=HASH_WITH_POSITION_DTYPE), []
+        return decode_payloads_array(bs)
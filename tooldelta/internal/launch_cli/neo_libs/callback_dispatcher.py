@@ -0,0 +1,194 @@
+"""
+接入点回调分发执行器
+
+使用固定数量的工作线程执行接入点事件 (数据包, 软监听, 玩家变动) 的回调,
+同一个分发键 (如数据包类型名) 下的回调严格按提交顺序依次执行,
+不同分发键之间并行执行。
+"""
+
+import threading
+import traceback
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from ....utils import fmts, sys_args, try_int, ToolDeltaThread
+
+CallbackTask = tuple[Callable[..., Any], tuple, str]
+
+
+class CallbackDispatcher:
+    """
+    按键保序的固定线程池回调执行器。
+
+    待执行回调总数超出上限时, 提交方会被阻塞 (背压) 至多 `put_timeout` 秒,
+    超时仍无空位则丢弃该回调并计数。
+
+    注意: 同一分发键下的回调是串行执行的,
+    回调内请勿阻塞等待同一类型的下一个事件, 否则会造成死锁。
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        max_pending: int = 4096,
+        put_timeout: float = 5,
+    ):
+        """
+        Args:
+            workers (int): 工作线程数
+            max_pending (int): 所有分发键待执行回调的总数上限
+            put_timeout (float): 队列已满时提交方最长等待时间, 超时后丢弃回调
+        """
+        if workers < 1:
+            raise ValueError("回调分发工作线程数至少为 1")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.put_timeout = put_timeout
+        self._lock = threading.Lock()
+        self._has_ready = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._queues: dict[str, deque[CallbackTask]] = {}
+        # 待被工作线程领取的分发键; 一个键同一时刻最多只在一个工作线程上运行
+        self._ready_keys: deque[str] = deque()
+        self._scheduled_keys: set[str] = set()
+        self._pending = 0
+        self._closed = False
+        self.submitted = 0
+        self.executed = 0
+        self.dropped = 0
+        self.max_pending_seen = 0
+        self.dropped_by_key: dict[str, int] = {}
+        self._worker_threads = [
+            ToolDeltaThread(
+                self._worker,
+                usage=f"接入点回调分发线程 #{i}",
+                thread_level=ToolDeltaThread.SYSTEM,
+            )
+            for i in range(workers)
+        ]
+
+    def submit(
+        self, key: str, func: Callable[..., Any], args: tuple = (), usage: str = ""
+    ) -> bool:
+        """
+        提交一个回调。
+
+        Args:
+            key (str): 分发键, 同一键下的回调按提交顺序执行
+            func (Callable): 回调
+            args (tuple): 回调参数
+            usage (str): 回调用途说明, 用于出错时输出
+
+        Returns:
+            bool: 是否提交成功 (队列满且等待超时, 或执行器已关闭时为 False)
+        """
+        with self._lock:
+            if self._pending >= self.max_pending and not self._closed:
+                self._not_full.wait_for(
+                    lambda: self._pending < self.max_pending or self._closed,
+                    self.put_timeout,
+                )
+            if self._closed or self._pending >= self.max_pending:
+                self.dropped += 1
+                self.dropped_by_key[key] = self.dropped_by_key.get(key, 0) + 1
+                return False
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+            queue.append((func, args, usage))
+            self._pending += 1
+            self.submitted += 1
+            if self._pending > self.max_pending_seen:
+                self.max_pending_seen = self._pending
+            if key not in self._scheduled_keys:
+                self._scheduled_keys.add(key)
+                self._ready_keys.append(key)
+                self._has_ready.notify()
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """
+        获取执行器运行统计。
+
+        Returns:
+            dict[str, Any]: 统计信息
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "max_pending_seen": self.max_pending_seen,
+                "submitted": self.submitted,
+                "executed": self.executed,
+                "dropped": self.dropped,
+                "dropped_by_key": self.dropped_by_key.copy(),
+                "queue_depths": {k: len(v) for k, v in self._queues.items() if v},
+            }
+
+    def shutdown(self):
+        """关闭执行器, 已提交的回调仍会被执行完毕"""
+        with self._lock:
+            self._closed = True
+            self._has_ready.notify_all()
+            self._not_full.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                while not self._ready_keys:
+                    if self._closed:
+                        return
+                    self._has_ready.wait()
+                key = self._ready_keys.popleft()
+                func, args, usage = self._queues[key].popleft()
+            try:
+                func(*args)
+            except SystemExit:
+                # 回调中的 exit() 或 ThreadExit 只结束该回调, 工作线程继续运行
+                pass
+            except BaseException:
+                fmts.print_err(
+                    f"回调 {usage or getattr(func, '__name__', func)} 出错:\n"
+                    + traceback.format_exc()
+                )
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    self.executed += 1
+                    self._not_full.notify()
+                    if self._queues[key]:
+                        # 放回队尾, 避免繁忙的分发键饿死其他键
+                        self._ready_keys.append(key)
+                        self._has_ready.notify()
+                    else:
+                        self._scheduled_keys.discard(key)
+
+
+_shared_dispatcher: CallbackDispatcher | None = None
+
+
+def get_dispatcher_by_launch_args() -> CallbackDispatcher | None:
+    """
+    根据启动参数 `-callback-workers <线程数>` 和 `-callback-queue-size <上限>`
+    获取进程内共享的回调分发执行器。
+
+    Returns:
+        CallbackDispatcher | None: 未指定启动参数时返回 None, 即沿用每个回调一个线程的模式
+    """
+    global _shared_dispatcher
+    if _shared_dispatcher is not None:
+        return _shared_dispatcher
+    launch_args = sys_args.sys_args_to_dict()
+    if "callback-workers" not in launch_args:
+        return None
+    workers = try_int(launch_args["callback-workers"])
+    max_pending = try_int(launch_args.get("callback-queue-size")) or 4096
+    if workers is None or workers < 1:
+        fmts.print_war(
+            "启动参数 -callback-workers 需要为正整数, 将使用默认的回调线程模式"
+        )
+        return None
+    _shared_dispatcher = CallbackDispatcher(workers, max_pending)
+    return _shared_dispatcher
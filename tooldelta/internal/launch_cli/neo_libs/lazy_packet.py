@@ -0,0 +1,158 @@
+"""
+按需解码的 msgpack 数据包
+
+接入点以 msgpack 格式传来的数据包顶层总是一个 map,
+这里只在构造时扫描一遍顶层键及其值在原始数据中的偏移,
+值在首次被访问时才被解码。
+"""
+
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+import msgpack
+
+# 尚未解码的值在字典中的占位符
+_PENDING = object()
+
+
+def index_msgpack_map(raw: bytes) -> dict[Any, tuple[int, int]]:
+    """
+    扫描 msgpack map 的顶层键, 返回 键 -> (值起始偏移, 值结束偏移)。
+    值只会被跳过而不会被解码。
+
+    Args:
+        raw (bytes): msgpack 数据, 顶层需要为 map
+
+    Raises:
+        ValueError: 顶层不是 map 或数据不完整
+
+    Returns:
+        dict[Any, tuple[int, int]]: 键和值偏移
+    """
+    unpacker = msgpack.Unpacker(
+        strict_map_key=False, max_buffer_size=max(len(raw), 1024)
+    )
+    unpacker.feed(raw)
+    try:
+        length = unpacker.read_map_header()
+        offsets: dict[Any, tuple[int, int]] = {}
+        for _ in range(length):
+            key = unpacker.unpack()
+            start = unpacker.tell()
+            unpacker.skip()
+            offsets[key] = (start, unpacker.tell())
+    except (msgpack.OutOfData, msgpack.UnpackValueError) as err:
+        raise ValueError(f"无效的 msgpack 数据包: {err}") from err
+    return offsets
+
+
+class LazyMsgpackPacket(dict):
+    """
+    按需解码的字典型数据包。
+
+    所有顶层键在构造时就已存在, `in`, `len`, 迭代键不会触发解码;
+    `pk[key]`, `pk.get` 只会解码被访问到的值;
+    需要全部值的操作 (`items`, `values`, `==`, `copy`, `json.dumps` 等)
+    会先把剩余的值全部解码, 之后与普通字典完全一致。
+    """
+
+    __slots__ = ("_lock", "_offsets", "_raw")
+
+    def __init__(self, raw: bytes):
+        self._raw = raw
+        # 为 None 时表示所有值都已解码
+        self._offsets: dict[Any, tuple[int, int]] | None = index_msgpack_map(raw)
+        self._lock = threading.Lock()
+        super().__init__(dict.fromkeys(self._offsets, _PENDING))
+
+    def _load(self, key: Any) -> Any:
+        with self._lock:
+            val = dict.__getitem__(self, key)
+            if val is _PENDING:
+                start, end = self._offsets[key]  # type: ignore[index]
+                val = msgpack.unpackb(
+                    memoryview(self._raw)[start:end], strict_map_key=False
+                )
+                dict.__setitem__(self, key, val)
+            return val
+
+    def _materialize(self) -> None:
+        if self._offsets is None:
+            return
+        for key, val in list(dict.items(self)):
+            if val is _PENDING:
+                self._load(key)
+        self._offsets = None
+        self._raw = b""
+
+    def __getitem__(self, key: Any) -> Any:
+        val = dict.__getitem__(self, key)
+        if val is _PENDING:
+            return self._load(key)
+        return val
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        val = dict.get(self, key, default)
+        if val is _PENDING:
+            return self._load(key)
+        return val
+
+    def __iter__(self) -> Iterator:
+        # 必须覆写: 否则 dict(pk) 和 {**pk} 会走 C 层快速路径直接复制占位符
+        return dict.__iter__(self)
+
+    def values(self):  # type: ignore[override]
+        self._materialize()
+        return dict.values(self)
+
+    def items(self):  # type: ignore[override]
+        self._materialize()
+        return dict.items(self)
+
+    def copy(self) -> dict:
+        self._materialize()
+        return dict.copy(self)
+
+    def __eq__(self, other: object) -> bool:
+        self._materialize()
+        if isinstance(other, LazyMsgpackPacket):
+            other._materialize()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        self._materialize()
+        if isinstance(other, LazyMsgpackPacket):
+            other._materialize()
+        return dict.__ne__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._materialize()
+        return dict.__repr__(self)
+
+    def __or__(self, other: Any) -> dict:
+        self._materialize()
+        return dict.__or__(self, other)
+
+    def __ror__(self, other: Any) -> dict:
+        self._materialize()
+        return dict.__ror__(self, other)
+
+    def __reduce_ex__(self, protocol: Any):
+        self._materialize()
+        return (dict, (dict.copy(self),))
+
+    def pop(self, *args: Any) -> Any:
+        self._materialize()
+        return dict.pop(self, *args)
+
+    def popitem(self) -> tuple[Any, Any]:
+        self._materialize()
+        return dict.popitem(self)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return self[key]
+        return dict.setdefault(self, key, default)
@@ -1,9 +1,12 @@
+import asyncio
 import ctypes
 import enum
 import json
 import msgpack
+import numpy
 import os.path
 import platform
+import struct
 import threading
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -11,9 +14,12 @@ from threading import Thread
 from typing import Any, ClassVar, Optional
 
 from ....constants import TOOLDELTA_BIN_PATH
-from ....utils import fmts, thread_func, ToolDeltaThread
+from ....utils import fmts, json_codec, thread_func, ToolDeltaThread
+from ....utils import startup_profiler
 from ....mc_bytes_packet.base_bytes_packet import BaseBytesPacket
 from ....internal.types import Packet_CommandOutput
+from .lazy_packet import LazyMsgpackPacket
+from .callback_dispatcher import CallbackDispatcher, get_dispatcher_by_launch_args
 
 CInt = ctypes.c_int
 CLongLong = ctypes.c_longlong
@@ -25,6 +31,19 @@ APIVersion: int = 0
 OldAccessPointVersion = False
 
 USE_FASTER_MSGPACK_SEND_PACKET = True
+# 一次 FFI 调用取出多个待处理事件及其数据。
+# EventPollBatch 是提议中的接入点 ABI, 目前的 NeOmega 接入点尚未导出该函数,
+# 导出函数名、缓冲区布局与 API 版本号均为暂定值, 在接入点实现并确定版本号之前默认关闭
+USE_BATCH_EVENT_POLL = False
+EVENT_POLL_BATCH_SIZE = 256
+# 暂定的接入点 API 版本号
+EVENT_POLL_BATCH_API_VERSION = 120
+# 较大的 msgpack 数据包只在监听器访问对应字段时才解码
+USE_LAZY_MSGPACK_PACKET = True
+# 小于该字节数的数据包直接完整解码; 小包建立索引和按需解码的开销比完整解码更大
+LAZY_MSGPACK_MIN_SIZE = 4096
+BatchEventPollSupported = False
+BlobCacheBatchSupported = False
 
 
 def NewAccessPointVersionCheck(attr_name: str):
@@ -53,6 +72,12 @@ def toPyString(c_string: CString | None):
     return result
 
 
+def unpackMsgpackPacket(bs: bytes) -> dict:
+    if USE_LAZY_MSGPACK_PACKET and len(bs) >= LAZY_MSGPACK_MIN_SIZE:
+        return LazyMsgpackPacket(bs)
+    return msgpack.unpackb(bs, strict_map_key=False)
+
+
 def toByteCSlice(bs: bytes) -> CBytes:
     return ctypes.cast(ctypes.c_char_p(bs), CBytes)
 
@@ -113,6 +138,51 @@ def OmitEvent():
     LIB.OmitEvent()
 
 
+class EventPollBatch_return(ctypes.Structure):
+    bs: CBytes
+    length: CInt
+    count: CInt
+    _fields_ = (("bs", CBytes), ("length", CInt), ("count", CInt))
+
+
+# 批量事件缓冲区中每个事件的头部 (提议中的布局, 接入点尚未实现):
+# 数据是否已随事件取出 (u8), 事件类型长度 (u8), retriever 长度 (u16), 数据长度 (u32)
+# 其后依次紧跟 事件类型, retriever, 数据
+_EVENT_BATCH_HEADER = struct.Struct("<BBHI")
+
+
+def EventPollBatch(max_events: int) -> list[tuple[str, str, bytes | None]]:
+    """
+    阻塞直到有事件到来, 一次取出至多 max_events 个待处理事件。
+    这是提议中的接入点 ABI, 目前的接入点尚未提供, 以下约定需要接入点在实现时一并保证。
+
+    数据未随事件取出的事件 (例如需要传入回应 ID 的 SoftAPICall)
+    其数据为 None, 需要再调用对应的 Consume* 方法取出;
+    这类事件需要总是批次中的最后一个。
+
+    Returns:
+        list[tuple[str, str, bytes | None]]: (事件类型, retriever, 数据) 列表
+    """
+    ret: EventPollBatch_return = LIB.EventPollBatch(CInt(max_events))
+    buf = as_python_bytes(ret.bs, ret.length)
+    LIB.FreeMem(ret.bs)
+    unpack_header = _EVENT_BATCH_HEADER.unpack_from
+    header_size = _EVENT_BATCH_HEADER.size
+    events: list[tuple[str, str, bytes | None]] = []
+    offset = 0
+    for _ in range(ret.count):
+        consumed, type_len, retriever_len, payload_len = unpack_header(buf, offset)
+        offset += header_size
+        eventType = buf[offset : offset + type_len].decode(errors="ignore")
+        offset += type_len
+        retriever = buf[offset : offset + retriever_len].decode(errors="ignore")
+        offset += retriever_len
+        payload = buf[offset : offset + payload_len] if consumed else None
+        offset += payload_len
+        events.append((eventType, retriever, payload))
+    return events
+
+
 # end lib core: event
 
 # event retrievers
@@ -273,7 +343,7 @@ def JsonStrAsIsGamePacketBytes(packetID: int, jsonStr: str) -> bytes:
 
 
 def SendJsonGamePacket(packetID: int, pk: dict) -> None:
-    bs = json.dumps(pk, ensure_ascii=False).encode(encoding="utf-8")
+    bs = json_codec.dumps_bytes(pk)
     r = LIB.SendGamePacket(
         to_GoInt(packetID),
         toByteCSlice(bs),
@@ -325,6 +395,12 @@ class LoadBlobCache_return(ctypes.Structure):
     _fields_ = (("bs", CBytes), ("length", CInt))
 
 
+class LoadBlobCaches_return(ctypes.Structure):
+    bs: CBytes
+    length: CLongLong
+    _fields_ = (("bs", CBytes), ("length", CLongLong))
+
+
 @dataclass
 class ClientMaintainedExtendInfo:
     CompressThreshold: int | None = None
@@ -371,7 +447,7 @@ class CommandOutput:
 
 
 def unpackCommandOutput(jsonStr: str | None) -> Packet_CommandOutput | None:
-    return None if jsonStr is None else Packet_CommandOutput(json.loads(jsonStr))
+    return None if jsonStr is None else Packet_CommandOutput(json_codec.loads(jsonStr))
 
 
 @dataclass
@@ -641,6 +717,10 @@ class ThreadOmega:
         self._soft_reg: dict[str, Callable[[Any], Any]] = {}
         self._soft_reg_is_bytes_api: dict[str, bool] = {}
         self._soft_resp_counter = Counter("soft_resp")
+        # 为 None 时每个回调单独开一个线程执行 (兼容模式)
+        self.callback_dispatcher: CallbackDispatcher | None = (
+            get_dispatcher_by_launch_args()
+        )
 
     def connect(self):
         if self.connect_type == ConnectType.Local:
@@ -688,43 +768,80 @@ class ThreadOmega:
 
     @thread_func("接入点反应核心", ToolDeltaThread.SYSTEM)
     def _react(self):
-        while True:
-            eventType, retriever = EventPoll()
+        if USE_BATCH_EVENT_POLL and BatchEventPollSupported:
+            while True:
+                for eventType, retriever, payload in EventPollBatch(
+                    EVENT_POLL_BATCH_SIZE
+                ):
+                    if not self._handle_event(eventType, retriever, payload):
+                        return
+        else:
+            while True:
+                eventType, retriever = EventPoll()
+                if not self._handle_event(eventType, retriever):
+                    return
+
+    def _handle_event(
+        self, eventType: str, retriever: str, payload: bytes | None = None
+    ) -> bool:
+        """
+        处理单个接入点事件。
+
+        Args:
+            eventType (str): 事件类型
+            retriever (str): 事件 retriever
+            payload (bytes | None): 批量取出时附带的事件数据, 为 None 则调用 Consume* 取出
 
-            if eventType == "OmegaConnErr":
-                self._handle_omega_conn_err()
-                break
+        Returns:
+            bool: 是否继续处理后续事件 (与接入点断开连接时为 False)
+        """
+        if eventType == "OmegaConnErr":
+            self._handle_omega_conn_err(payload)
+            return False
 
-            if eventType == "CommandResponseCB":
-                self._handle_command_response_cb(retriever)
+        if eventType == "CommandResponseCB":
+            self._handle_command_response_cb(retriever, payload)
 
-            elif eventType == "SoftCallResp":
-                self._handle_soft_call_resp(retriever)
+        elif eventType == "SoftCallResp":
+            self._handle_soft_call_resp(retriever, payload)
 
-            elif eventType == "SoftListen":
-                self._handle_soft_listen(retriever)
+        elif eventType == "SoftListen":
+            self._handle_soft_listen(retriever, payload)
 
-            elif eventType == "SoftAPICall":
-                self._handle_soft_api_call(retriever)
+        elif eventType == "SoftAPICall":
+            self._handle_soft_api_call(retriever)
 
-            elif eventType == "MCPacket":
-                self._handle_mc_packet(retriever)
+        elif eventType == "MCPacket":
+            self._handle_mc_packet(retriever, payload)
 
-            elif eventType == "MCBytesPacket":
-                self._handle_mc_bytes_packet(retriever)
+        elif eventType == "MCBytesPacket":
+            self._handle_mc_bytes_packet(retriever, payload)
 
-            elif eventType == "PlayerChange":
-                self._handle_player_change(retriever)
+        elif eventType == "PlayerChange":
+            self._handle_player_change(retriever, payload)
 
-            elif eventType in ["PlayerInterceptInput", "Chat"]:
+        elif eventType in ["PlayerInterceptInput", "Chat"]:
+            if payload is None:
                 self._handle_player_intercept_or_chat()
 
-    def _handle_omega_conn_err(self):
-        self._omega_disconnected_reason = toPyString(LIB.ConsumeOmegaConnError())
+        return True
+
+    def _handle_omega_conn_err(self, payload: bytes | None = None):
+        if payload is None:
+            self._omega_disconnected_reason = toPyString(
+                LIB.ConsumeOmegaConnError()
+            )
+        else:
+            self._omega_disconnected_reason = payload.decode(errors="ignore")
         self._omega_disconnected_lock.set()
 
-    def _handle_command_response_cb(self, retriever: str):
-        cmdResp = unpackCommandOutput(toPyString(LIB.ConsumeCommandResponseCB()))
+    def _handle_command_response_cb(
+        self, retriever: str, payload: bytes | None = None
+    ):
+        if payload is None:
+            cmdResp = unpackCommandOutput(toPyString(LIB.ConsumeCommandResponseCB()))
+        else:
+            cmdResp = unpackCommandOutput(payload.decode(errors="ignore"))
         if callback_event := self._omega_cmd_callback_events.get(retriever):
             callback_event(cmdResp)
         else:
@@ -732,10 +849,8 @@ class ThreadOmega:
                 f"接入点核心进程：指令返回 {retriever} 没有对应的回调，已忽略"
             )
 
-    def _handle_soft_call_resp(self, retriever: str):
-        softResp: ConsumeSoftData_return = LIB.ConsumeSoftData()
-        bs: bytes = as_python_bytes(softResp.bs, softResp.length)
-        LIB.FreeMem(softResp.bs)
+    def _handle_soft_call_resp(self, retriever: str, payload: bytes | None = None):
+        bs = self._consume_soft_data() if payload is None else payload
         if (
             retriever not in self._soft_call_cbs_is_bytes_result
             or retriever not in self._soft_call_cbs
@@ -744,32 +859,37 @@ class ThreadOmega:
         if self._soft_call_cbs_is_bytes_result[retriever]:
             self._soft_call_cbs[retriever](bs)
         else:
-            self._soft_call_cbs[retriever](json.loads(bs.decode(encoding="utf-8")))
+            self._soft_call_cbs[retriever](json_codec.loads(bs))
 
-    def _handle_soft_listen(self, retriever: str):
+    def _handle_soft_listen(self, retriever: str, payload: bytes | None = None):
         api_name = retriever
         listeners = self._soft_listeners.get(api_name, [])
-        softResp: ConsumeSoftData_return = LIB.ConsumeSoftData()
-        bs: bytes = as_python_bytes(softResp.bs, softResp.length)
-        LIB.FreeMem(softResp.bs)
-        if self._soft_listeners_is_listen_bytes:
+        bs = self._consume_soft_data() if payload is None else payload
+        if self._soft_listeners_is_listen_bytes.get(api_name):
             for listener in listeners:
-                ToolDeltaThread(
+                self._dispatch_callback(
+                    f"SoftListen:{api_name}",
                     listener,
                     (bs,),
-                    usage="Soft (JSON) Listen Callback Thread",
-                    thread_level=ToolDeltaThread.SYSTEM,
+                    usage="Soft (Bytes) Listen Callback Thread",
                 )
         else:
-            json_dict = json.loads(bs.decode(encoding="utf-8"))
+            json_dict = json_codec.loads(bs)
             for listener in listeners:
-                ToolDeltaThread(
+                self._dispatch_callback(
+                    f"SoftListen:{api_name}",
                     listener,
                     (json_dict,),
-                    usage="Soft (Bytes) Listen Callback Thread",
-                    thread_level=ToolDeltaThread.SYSTEM,
+                    usage="Soft (JSON) Listen Callback Thread",
                 )
 
+    @staticmethod
+    def _consume_soft_data() -> bytes:
+        softResp: ConsumeSoftData_return = LIB.ConsumeSoftData()
+        bs: bytes = as_python_bytes(softResp.bs, softResp.length)
+        LIB.FreeMem(softResp.bs)
+        return bs
+
     def _handle_soft_api_call(self, retriever: str):
         api_name = retriever
         handler = self._soft_reg[api_name]
@@ -787,7 +907,7 @@ class ThreadOmega:
                         toCString(resp_id), 1, toByteCSlice(ret), len(ret), ""
                     )
                 else:
-                    json_ret = json.dumps(ret)
+                    json_ret = json_codec.dumps(ret)
                     LIB.FinishSoftCall(
                         toCString(resp_id),
                         0,
@@ -813,7 +933,7 @@ class ThreadOmega:
                 thread_level=ToolDeltaThread.SYSTEM,
             )
         else:
-            json_represents = json.loads(bs.decode(encoding="utf-8"))
+            json_represents = json_codec.loads(bs)
             ToolDeltaThread(
                 wrapper,
                 (json_represents, resp_id),
@@ -821,8 +941,23 @@ class ThreadOmega:
                 thread_level=ToolDeltaThread.SYSTEM,
             )
 
-    def _handle_mc_packet(self, packetTypeName):
-        if packetTypeName == "":
+    def _handle_mc_packet(self, packetTypeName, payload: bytes | None = None):
+        if payload is not None:
+            # 批量取出的事件已附带 msgpack 格式的包体, 无需再调用 Consume*
+            if listeners := self._packet_listeners.get(packetTypeName):
+                try:
+                    pkt = unpackMsgpackPacket(payload)
+                except Exception as e:
+                    fmts.print_err(f"数据包 {packetTypeName} 处理出错: {e}")
+                    return
+                for listener in listeners:
+                    self._dispatch_callback(
+                        packetTypeName,
+                        listener,
+                        (packetTypeName, pkt),
+                        usage="Packet Callback Thread",
+                    )
+        elif packetTypeName == "":
             LIB.OmitEvent()
         elif listeners := self._packet_listeners.get(packetTypeName, []):
             if APIVersion >= 100:
@@ -831,18 +966,17 @@ class ThreadOmega:
                     fmts.print_err(f"数据包 {packetTypeName} 处理出错: {convertError}")
                     return
                 try:
-                    pkt = msgpack.unpackb(
+                    pkt = unpackMsgpackPacket(
                         as_python_bytes(
                             msgpack_ret.packetDataAsMsgpack, msgpack_ret.bs_len
-                        ),
-                        strict_map_key=False,
+                        )
                     )
                 except Exception as e:
                     # use fallback
                     pk_ret: MCPacketEvent = LIB.ConsumeMCPacket()
                     pk_jsonstr = toPyString(pk_ret.packetDataAsJsonStr)
                     try:
-                        pkt = json.loads(pk_jsonstr)
+                        pkt = json_codec.loads(pk_jsonstr)
                         fmts.print_war(
                             f"数据包 {packetTypeName} 处理出错 ({e}), 使用默认处理方式, 包体: {pk_jsonstr[:1000]}"
                         )
@@ -853,65 +987,101 @@ class ThreadOmega:
                         )
                         return
                 for listener in listeners:
-                    ToolDeltaThread(
+                    self._dispatch_callback(
+                        packetTypeName,
                         listener,
                         (packetTypeName, pkt),
                         usage="Packet Callback Thread",
-                        thread_level=ToolDeltaThread.SYSTEM,
                     )
             else:
                 json_ret: MCPacketEvent = LIB.ConsumeMCPacket()
                 if convertError := toPyString(json_ret.convertError):
                     fmts.print_err(f"数据包 {packetTypeName} 处理出错: {convertError}")
                     return
-                jsonPkt = json.loads(toPyString(json_ret.packetDataAsJsonStr))
+                jsonPkt = json_codec.loads(toPyString(json_ret.packetDataAsJsonStr))
                 for listener in listeners:
-                    ToolDeltaThread(
+                    self._dispatch_callback(
+                        packetTypeName,
                         listener,
                         (packetTypeName, jsonPkt),
                         usage="Packet Callback Thread",
-                        thread_level=ToolDeltaThread.SYSTEM,
                     )
 
         else:
             LIB.OmitEvent()
 
-    def _handle_mc_bytes_packet(self, customPacketTypeName):
+    def _handle_mc_bytes_packet(
+        self, customPacketTypeName, payload: bytes | None = None
+    ):
         if OldAccessPointVersion:
             # New end point & old access point
             return
         customPacketTypeName = customPacketTypeName
         listeners = self._packet_listeners.get(customPacketTypeName, [])
         if len(listeners) == 0:
-            LIB.OmitEvent()
+            if payload is None:
+                LIB.OmitEvent()
         else:
-            ret: ConsumeMCBytesPacket_return = LIB.ConsumeMCBytesPacket()
-            bs: bytes = as_python_bytes(ret.pktBytes, ret.length)
-            LIB.FreeMem(ret.pktBytes)
+            if payload is None:
+                ret: ConsumeMCBytesPacket_return = LIB.ConsumeMCBytesPacket()
+                bs: bytes = as_python_bytes(ret.pktBytes, ret.length)
+                LIB.FreeMem(ret.pktBytes)
+            else:
+                bs = payload
             for listener in listeners:
-                ToolDeltaThread(
+                self._dispatch_callback(
+                    customPacketTypeName,
                     listener,
                     (customPacketTypeName, bs),
                     usage="Packet Bytes Callback Thread",
-                    thread_level=ToolDeltaThread.SYSTEM,
                 )
 
-    def _handle_player_change(self, playerUUID):
+    def _handle_player_change(self, playerUUID, payload: bytes | None = None):
         if not self._player_change_listeners:
-            LIB.OmitEvent()
+            if payload is None:
+                LIB.OmitEvent()
         else:
-            action = toPyString(LIB.ConsumePlayerChange())
+            if payload is None:
+                action = toPyString(LIB.ConsumePlayerChange())
+            else:
+                action = payload.decode(errors="ignore")
             for callback in self._player_change_listeners:
-                ToolDeltaThread(
+                self._dispatch_callback(
+                    "PlayerChange",
                     callback,
                     (self._get_bind_player(playerUUID), action),
                     usage="Player Change Callback Thread",
+                    thread_level=ToolDeltaThread.PLUGIN,
                 )
 
     @staticmethod
     def _handle_player_intercept_or_chat():
         LIB.OmitEvent()
 
+    def _dispatch_callback(
+        self,
+        key: str,
+        callback: Callable,
+        args: tuple,
+        usage: str,
+        thread_level=ToolDeltaThread.SYSTEM,
+    ):
+        if self.callback_dispatcher is None:
+            ToolDeltaThread(callback, args, usage=usage, thread_level=thread_level)
+        else:
+            self.callback_dispatcher.submit(key, callback, args, usage)
+
+    def get_callback_dispatch_stats(self) -> dict[str, Any] | None:
+        """
+        获取回调分发执行器的运行统计 (队列深度, 丢弃数等)
+
+        Returns:
+            dict[str, Any] | None: 统计信息, 未启用回调分发执行器时返回 None
+        """
+        if self.callback_dispatcher is None:
+            return None
+        return self.callback_dispatcher.stats()
+
     def wait_disconnect(self) -> str:
         """return: disconnect reason"""
         self._omega_disconnected_lock.wait()
@@ -945,6 +1115,39 @@ class ThreadOmega:
         SendWebSocketCommandNeedResponse(cmd, retriever_id)
         return self.send_cmd_resp(getter, timeout, retriever_id)
 
+    async def send_websocket_command_need_response_async(
+        self, cmd: str, timeout: float = -1
+    ) -> Packet_CommandOutput | None:
+        """
+        send_websocket_command_need_response 的协程版本,
+        等待返回时不占用线程, 需要在 asyncio 事件循环中等待。
+
+        Returns:
+            Packet_CommandOutput | None: 指令返回, 超时则为 None
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Packet_CommandOutput] = loop.create_future()
+
+        def setter(result):
+            loop.call_soon_threadsafe(
+                lambda: future.done() or future.set_result(result)
+            )
+
+        try:
+            retriever_id = next(self._cmd_callback_retriever_counter)
+        except StopIteration as err:
+            raise ValueError("retriever counter overflow") from err
+        self._omega_cmd_callback_events[retriever_id] = setter
+        try:
+            SendWebSocketCommandNeedResponse(cmd, retriever_id)
+            return await asyncio.wait_for(
+                future, None if timeout is None or timeout < 0 else timeout
+            )
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._omega_cmd_callback_events.pop(retriever_id, None)
+
     def send_player_command_need_response(
         self, cmd: str, timeout: float = -1
     ) -> Packet_CommandOutput | None:
@@ -962,7 +1165,7 @@ class ThreadOmega:
         retriever_id = next(self._soft_call_counter)
         self._soft_call_cbs[retriever_id] = setter
         self._soft_call_cbs_is_bytes_result[retriever_id] = False
-        SoftCallWithJSON(api, json.dumps(args), retriever_id)
+        SoftCallWithJSON(api, json_codec.dumps(args), retriever_id)
         res = getter(timeout=timeout)
         del self._soft_call_cbs[retriever_id]
         del self._soft_call_cbs_is_bytes_result[retriever_id]
@@ -985,7 +1188,7 @@ class ThreadOmega:
         SetPacketFilterMode(pkID, enabled)
 
     def soft_pub_json(self, api: str, args: Any) -> None:
-        SoftPubJSON(api, json.dumps(args))
+        SoftPubJSON(api, json_codec.dumps(args))
 
     def soft_pub_bytes(self, api: str, message: bytes) -> None:
         SoftPubBytes(api, message)
@@ -1064,7 +1267,9 @@ class ThreadOmega:
     def construct_game_packet_bytes_in_json_as_is(
         self, packet_type: int, content: Any
     ) -> tuple[int, bytes]:
-        return packet_type, JsonStrAsIsGamePacketBytes(packet_type, json.dumps(content))
+        return packet_type, JsonStrAsIsGamePacketBytes(
+            packet_type, json_codec.dumps(content)
+        )
 
     def send_packet(self, packetID: int, content: dict | bytes | BaseBytesPacket):
         if isinstance(content, dict):
@@ -1122,6 +1327,70 @@ class ThreadOmega:
             return True
         return False
 
+    def load_blob_caches(self, hashes: list[int]) -> list[bytes]:
+        """
+        批量从底层缓存数据集检索 hashes 所指示的数据负载, 不存在的为空 bytes。
+        整批一次 FFI 调用的 LoadBlobCaches 是提议中的接入点 ABI,
+        目前的接入点尚未导出, 因此实际仍逐个调用 LoadBlobCache。
+
+        Args:
+            hashes (list[int]): 哈希列表
+
+        Returns:
+            list[bytes]: 与 hashes 一一对应的数据负载
+        """
+        NewAccessPointVersionCheck("load_blob_caches")
+        OmegaAvailable()
+        if not BlobCacheBatchSupported:
+            return [self.load_blob_cache(h) for h in hashes]
+        if not hashes:
+            return []
+        c_hashes = numpy.asarray(hashes, dtype=numpy.uint64)
+        lengths = numpy.zeros(len(hashes), dtype=numpy.uint32)
+        ret: LoadBlobCaches_return = LIB.LoadBlobCaches(
+            c_hashes.ctypes.data, len(hashes), lengths.ctypes.data
+        )
+        buf = as_python_bytes(ret.bs, ret.length)
+        LIB.FreeMem(ret.bs)
+        ends = numpy.cumsum(lengths, dtype=numpy.int64).tolist()
+        starts = [0, *ends[:-1]]
+        return [buf[start:end] for start, end in zip(starts, ends)]
+
+    def update_blob_caches(self, pairs: list[tuple[int, bytes]]) -> list[bool]:
+        """
+        批量向底层缓存数据集写入 (哈希, 二进制负载)。
+        整批一次 FFI 调用的 UpdateBlobCaches 是提议中的接入点 ABI,
+        目前的接入点尚未导出, 因此实际仍逐个调用 UpdateBlobCache。
+
+        Args:
+            pairs (list[tuple[int, bytes]]): (哈希, 负载) 列表
+
+        Returns:
+            list[bool]: 与 pairs 一一对应的写入结果, 哈希与负载不符的写入会被拒绝
+        """
+        NewAccessPointVersionCheck("update_blob_caches")
+        OmegaAvailable()
+        if not BlobCacheBatchSupported:
+            return [self.update_blob_cache(h, payload) for h, payload in pairs]
+        if not pairs:
+            return []
+        c_hashes = numpy.fromiter(
+            (h for h, _ in pairs), dtype=numpy.uint64, count=len(pairs)
+        )
+        lengths = numpy.fromiter(
+            (len(payload) for _, payload in pairs), dtype=numpy.uint32, count=len(pairs)
+        )
+        payloads = b"".join(payload for _, payload in pairs)
+        results = numpy.zeros(len(pairs), dtype=numpy.uint8)
+        LIB.UpdateBlobCaches(
+            c_hashes.ctypes.data,
+            toByteCSlice(payloads),
+            lengths.ctypes.data,
+            len(pairs),
+            results.ctypes.data,
+        )
+        return (results == 1).tolist()
+
     def _get_bind_player(self, uuidStr: str) -> PlayerKit | None:
         return None if uuidStr is None or not uuidStr else PlayerKit(uuidStr, self)
 
@@ -1173,8 +1442,10 @@ class ThreadOmega:
             t.join()
 
 
+@startup_profiler.profiled("加载 neOmega 库")
 def load_lib():
     global LIB, APIVersion, OldAccessPointVersion
+    global BatchEventPollSupported, BlobCacheBatchSupported
 
     sys_machine = platform.machine().lower()
     sys_type = platform.uname().system
@@ -1331,6 +1602,26 @@ def load_lib():
     except Exception:
         OldAccessPointVersion = True
 
+    # 批量读写 blob 缓存的 LoadBlobCaches / UpdateBlobCaches 是提议中的接入点 ABI,
+    # 函数签名为暂定值, 需要与接入点确认; 未导出时逐个调用 LoadBlobCache / UpdateBlobCache
+    BlobCacheBatchSupported = (
+        not OldAccessPointVersion
+        and hasattr(LIB, "LoadBlobCaches")
+        and hasattr(LIB, "UpdateBlobCaches")
+    )
+    if BlobCacheBatchSupported:
+        # hashes (uint64[]), count, lengths_out (uint32[])
+        LIB.LoadBlobCaches.argtypes = [ctypes.c_void_p, CInt, ctypes.c_void_p]
+        LIB.LoadBlobCaches.restype = LoadBlobCaches_return
+        # hashes (uint64[]), payloads, lengths (uint32[]), count, results_out (uint8[])
+        LIB.UpdateBlobCaches.argtypes = [
+            ctypes.c_void_p,
+            CBytes,
+            ctypes.c_void_p,
+            CInt,
+            ctypes.c_void_p,
+        ]
+
     if hasattr(LIB, "OmegaAPIVersion"):
         LIB.OmegaAPIVersion.restype = ctypes.c_int32
         APIVersion = LIB.OmegaAPIVersion()
@@ -1343,3 +1634,11 @@ def load_lib():
     if APIVersion >= 115:
         LIB.SetPacketFilterMode.argtypes = [CInt, ctypes.c_bool]
         LIB.SetPacketFilterMode.restype = CString
+
+    # 接入点未导出提议中的 EventPollBatch 时, 使用逐个事件 EventPoll + Consume* 的方式
+    BatchEventPollSupported = APIVersion >= EVENT_POLL_BATCH_API_VERSION and hasattr(
+        LIB, "EventPollBatch"
+    )
+    if BatchEventPollSupported:
+        LIB.EventPollBatch.argtypes = [CInt]
+        LIB.EventPollBatch.restype = EventPollBatch_return
@@ -303,7 +303,7 @@ class FrameNeOmgAccessPoint(StandardFrame):
             raise ValueError("未连接到接入点")
 
         pkID: int = self.omega.get_packet_name_to_id_mapping(pkt_type)  # type: ignore
-        if type(pkt) is dict:
+        if isinstance(pkt, dict):
             self.dict_packet_handler(pkID, pkt)
         elif type(pkt) is bytes:
             real_pkt = bytes_packet_by_id(pkID)
@@ -338,6 +338,15 @@ class FrameNeOmgAccessPoint(StandardFrame):
         self.omega.send_websocket_command_omit_response(cmd)
         return None
 
+    async def sendwscmd_with_resp_async(
+        self, cmd: str, timeout: float = 30
+    ) -> Packet_CommandOutput:
+        self.check_avaliable()
+        res = await self.omega.send_websocket_command_need_response_async(cmd, timeout)
+        if res is None:
+            raise TimeoutError(f"指令超时: {cmd}")
+        return res
+
     def sendwocmd(self, cmd: str) -> None:
         self.check_avaliable()
         self.omega.send_settings_command(cmd)
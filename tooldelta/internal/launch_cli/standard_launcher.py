@@ -4,6 +4,7 @@ from collections.abc import Callable
 
 from ...constants import SysStatus, PacketIDS
 from ...internal.types import Packet_CommandOutput
+from ...utils import async_loop
 from ...mc_bytes_packet.base_bytes_packet import BaseBytesPacket
 from ..packet_handler import PacketHandler
 from ..types import UnreadyPlayer
@@ -140,6 +141,22 @@ class StandardFrame(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def sendwscmd_with_resp_async(
+        self, cmd: str, timeout: float = 30
+    ) -> Packet_CommandOutput:
+        """
+        以 WebSocket 身份发送命令并异步等待结果, 需要在框架的异步事件循环中等待。
+        默认实现在线程池中调用 sendwscmd, 接入点可以覆写为不占用线程的实现
+
+        Args:
+            cmd (str): 命令
+            timeout (int | float, optional): 超时时间, 超时则引发 TimeoutError
+
+        Returns:
+            Packet_CommandOutput: 返回命令结果
+        """
+        return await async_loop.run_in_thread(self.sendwscmd, cmd, True, timeout)  # type: ignore
+
     @abstractmethod
     def sendwocmd(self, cmd: str) -> None:
         """
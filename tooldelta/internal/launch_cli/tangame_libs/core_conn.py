@@ -1,4 +1,3 @@
-import json
 import uuid
 import msgpack
 import threading
@@ -11,7 +10,7 @@ from dataclasses import dataclass
 from .... import constants, utils
 from ....constants import PacketIDS
 from ....internal.types import Packet_CommandOutput
-from ....utils import fmts
+from ....utils import fmts, json_codec
 from ....mc_bytes_packet.base_bytes_packet import BaseBytesPacket
 from ....mc_bytes_packet.pool import BYTES_PACKET_ID_POOL
 
@@ -245,7 +244,7 @@ class TanGame:
                 case MessageType.MSG_SERVER_PKT_JSON:
                     if self.server_dict_packet_handler is not None:
                         pkID = msg.content["ID"]
-                        pk = json.loads(msg.content["Content"])
+                        pk = json_codec.loads(msg.content["Content"])
                         if pkID == constants.PacketIDS.CommandOutput:
                             pkUUID: bytes = uuid.UUID(pk["CommandOrigin"]["UUID"]).bytes
                             if pkUUID in self.command_cbs.keys():
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 from threading import Event
 import uuid
 
-from ...utils import fmts, create_result_cb
+from ...utils import fmts, create_result_cb, startup_profiler
 from ...utils.basic import validate_uuid
 from ..types.player import Player, UnreadyPlayer
 from ..types.player_abilities import Abilities, update_player_ability_from_ability_data
@@ -54,6 +54,7 @@ class PlayerInfoMaintainer:
             priority=100,
         )
 
+    @startup_profiler.profiled("获取玩家数据")
     def block_init(self):
         # 载入初始玩家数据
         if not self.name_to_player:
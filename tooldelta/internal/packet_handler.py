@@ -1,3 +1,4 @@
+import threading
 from typing import TYPE_CHECKING
 from collections.abc import Callable
 
@@ -26,6 +27,11 @@ class PacketHandler:
             int, dict[int, list[BytesPacketListener]]
         ] = {}
         self.dict_packet_wait_callbacks: dict[int, list[DictPacketWaiter]] = {}
+        # 预编译的分发表: 数据包 ID -> 已按优先级从高到低展开的监听器元组
+        # 仅在增删监听器时重建, 收包时直接遍历
+        self._dict_packet_dispatch: dict[int, tuple[DictPacketListener, ...]] = {}
+        self._bytes_packet_dispatch: dict[int, tuple[BytesPacketListener, ...]] = {}
+        self._listeners_lock = threading.Lock()
 
     def wait_next_packet(self, packet_id: PacketIDS, timeout: float = 30) -> dict | None:
         getter, setter = create_result_cb(dict)
@@ -41,13 +47,14 @@ class PacketHandler:
         priority: int = 0,
     ):
         self.listen_packets.add(packet_id)
-
-        self.dict_packet_listener_with_priority.setdefault(packet_id, {})
-        self.dict_packet_listener_with_priority[packet_id].setdefault(priority, [])
-
-        plist = self.dict_packet_listener_with_priority[packet_id][priority]
-        if cb not in plist:
-            plist.append(cb)
+        with self._listeners_lock:
+            self._add_listener(
+                self.dict_packet_listener_with_priority,
+                self._dict_packet_dispatch,
+                packet_id,
+                cb,
+                priority,
+            )
 
     def add_bytes_packet_listener(
         self,
@@ -56,13 +63,66 @@ class PacketHandler:
         priority: int = 0,
     ):
         self.listen_packets.add(packet_id)
-
-        self.bytes_packet_listener_with_priority.setdefault(packet_id, {})
-        self.bytes_packet_listener_with_priority[packet_id].setdefault(priority, [])
-
-        plist = self.bytes_packet_listener_with_priority[packet_id][priority]
-        if cb not in plist:
-            plist.append(cb)
+        with self._listeners_lock:
+            self._add_listener(
+                self.bytes_packet_listener_with_priority,
+                self._bytes_packet_dispatch,
+                packet_id,
+                cb,
+                priority,
+            )
+
+    def remove_dict_packet_listener(
+        self,
+        packet_id: PacketIDS,
+        cb: DictPacketListener,
+        priority: int | None = None,
+    ) -> bool:
+        """
+        移除字典数据包监听器。
+
+        Args:
+            packet_id (PacketIDS): 数据包 ID
+            cb (DictPacketListener): 需要移除的监听器
+            priority (int | None): 仅从该优先级中移除, 为 None 则从所有优先级中移除
+
+        Returns:
+            bool: 是否有监听器被移除
+        """
+        with self._listeners_lock:
+            return self._remove_listener(
+                self.dict_packet_listener_with_priority,
+                self._dict_packet_dispatch,
+                packet_id,
+                cb,
+                priority,
+            )
+
+    def remove_bytes_packet_listener(
+        self,
+        packet_id: PacketIDS,
+        cb: BytesPacketListener,
+        priority: int | None = None,
+    ) -> bool:
+        """
+        移除二进制数据包监听器。
+
+        Args:
+            packet_id (PacketIDS): 数据包 ID
+            cb (BytesPacketListener): 需要移除的监听器
+            priority (int | None): 仅从该优先级中移除, 为 None 则从所有优先级中移除
+
+        Returns:
+            bool: 是否有监听器被移除
+        """
+        with self._listeners_lock:
+            return self._remove_listener(
+                self.bytes_packet_listener_with_priority,
+                self._bytes_packet_dispatch,
+                packet_id,
+                cb,
+                priority,
+            )
 
     def entrance_dict_packet(self, packetID: int, packet: dict):
         self._handle_dict_packet(packetID, packet)
@@ -71,22 +131,79 @@ class PacketHandler:
         self._handle_bytes_packet(packetID, packet)
 
     def _handle_dict_packet(self, packetID: int, packet: dict):
-        pkt_cbs = self.dict_packet_listener_with_priority.get(packetID)
-        if pkt_cbs:
-            for priority in sorted(pkt_cbs.keys(), reverse=True):
-                for cb in pkt_cbs[priority]:
-                    if cb(packet):
-                        return
+        for cb in self._dict_packet_dispatch.get(packetID, ()):
+            if cb(packet):
+                return
 
     def _handle_bytes_packet(self, packetID: int, packet: BaseBytesPacket):
-        pkt_cbs = self.bytes_packet_listener_with_priority.get(packetID)
-        if pkt_cbs:
-            for priority in sorted(pkt_cbs.keys(), reverse=True):
-                for cb in pkt_cbs[priority]:
-                    if cb(packet):
-                        return
+        for cb in self._bytes_packet_dispatch.get(packetID, ()):
+            if cb(packet):
+                return
 
     def _handle_next_dict_packet(self, packetID: int, packet: dict):
         cbs = self.dict_packet_wait_callbacks.get(packetID, [])
         for cb in cbs.copy():
             cb(packet)
+
+    @staticmethod
+    def _add_listener(
+        listeners_with_priority: dict[int, dict[int, list]],
+        dispatch_table: dict[int, tuple],
+        packet_id: int,
+        cb: Callable,
+        priority: int,
+    ):
+        listeners_with_priority.setdefault(packet_id, {})
+        listeners_with_priority[packet_id].setdefault(priority, [])
+
+        plist = listeners_with_priority[packet_id][priority]
+        if cb not in plist:
+            plist.append(cb)
+            PacketHandler._compile_dispatch(
+                listeners_with_priority, dispatch_table, packet_id
+            )
+
+    @staticmethod
+    def _remove_listener(
+        listeners_with_priority: dict[int, dict[int, list]],
+        dispatch_table: dict[int, tuple],
+        packet_id: int,
+        cb: Callable,
+        priority: int | None,
+    ) -> bool:
+        pkt_cbs = listeners_with_priority.get(packet_id)
+        if not pkt_cbs:
+            return False
+        removed = False
+        priorities = list(pkt_cbs.keys()) if priority is None else [priority]
+        for p in priorities:
+            plist = pkt_cbs.get(p)
+            if plist and cb in plist:
+                plist.remove(cb)
+                removed = True
+                if not plist:
+                    del pkt_cbs[p]
+        if not pkt_cbs:
+            del listeners_with_priority[packet_id]
+        if removed:
+            PacketHandler._compile_dispatch(
+                listeners_with_priority, dispatch_table, packet_id
+            )
+        return removed
+
+    @staticmethod
+    def _compile_dispatch(
+        listeners_with_priority: dict[int, dict[int, list]],
+        dispatch_table: dict[int, tuple],
+        packet_id: int,
+    ):
+        # 整体替换元组, 收包线程不会读到重建到一半的分发表
+        pkt_cbs = listeners_with_priority.get(packet_id)
+        if not pkt_cbs:
+            dispatch_table.pop(packet_id, None)
+            return
+        dispatch_table[packet_id] = tuple(
+            cb
+            for priority in sorted(pkt_cbs.keys(), reverse=True)
+            for cb in pkt_cbs[priority]
+        )
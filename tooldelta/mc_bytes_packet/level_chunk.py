@@ -1,9 +1,11 @@
 import struct
 from dataclasses import dataclass
-from io import BytesIO
 from tooldelta.constants.packets import PacketIDS
 from tooldelta.mc_bytes_packet.base_bytes_packet import BaseBytesPacket
 
+# Dimension, ChunkPosX, ChunkPosZ, HighestSubChunkIndex, CacheEnabled
+_LEVEL_CHUNK = struct.Struct("<BiiB?")
+
 
 @dataclass
 class LevelChunk(BaseBytesPacket):
@@ -26,8 +28,10 @@ class LevelChunk(BaseBytesPacket):
         raise NotImplementedError("Encode packet.LevelChunk is not support")
 
     def decode(self, bs: bytes):
-        reader = BytesIO(bs)
-        self.Dimension = reader.read(1)[0]
-        self.ChunkPosX, self.ChunkPosZ = struct.unpack("<ii", reader.read(8))
-        self.HighestSubChunkIndex = reader.read(1)[0]
-        self.CacheEnabled = bool(reader.read(1)[0])
+        (
+            self.Dimension,
+            self.ChunkPosX,
+            self.ChunkPosZ,
+            self.HighestSubChunkIndex,
+            self.CacheEnabled,
+        ) = _LEVEL_CHUNK.unpack_from(bs, 0)
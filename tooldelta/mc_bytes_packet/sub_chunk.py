@@ -13,6 +13,23 @@ SUB_CHUNK_RESULT_PLAYER_NOT_FOUND = 4
 SUB_CHUNK_RESULT_INDEX_OUT_OF_BOUNDS = 5
 SUB_CHUNK_RESULT_SUCCESS_ALL_AIR = 6
 
+# Result, SubChunkPosX, SubChunkPosY, SubChunkPosZ, len(NBTData)
+_ENTRY_HEAD = struct.Struct("<BihiI")
+_ENTRY_BLOB_HASH = struct.Struct("<Q")
+_ENTRIES_COUNT = struct.Struct("<BH")
+# 全空气等没有 NBT 数据的条目共享同一个只读空数组
+_EMPTY_NBT = numpy.frombuffer(b"", dtype=numpy.uint8)
+_ENTRY_NBT_LENGTH = struct.Struct("<I")
+_ENTRY_HEAD_DTYPE = numpy.dtype(
+    [
+        ("Result", "u1"),
+        ("SubChunkPosX", "<i4"),
+        ("SubChunkPosY", "<i2"),
+        ("SubChunkPosZ", "<i4"),
+        ("NBTLength", "<u4"),
+    ]
+)
+
 
 @dataclass
 class SubChunkEntry:
@@ -26,14 +43,81 @@ class SubChunkEntry:
     BlobHash: int = 0
 
     def decode(self, reader: BytesIO):
-        self.Result = reader.read(1)[0]
-        self.SubChunkPosX, self.SubChunkPosY, self.SubChunkPosZ = struct.unpack(
-            "<ihi", reader.read(10)
-        )
-        self.NBTData = numpy.frombuffer(
-            reader.read(struct.unpack("<I", reader.read(4))[0]), dtype=numpy.uint8
+        with reader.getbuffer() as bs:
+            offset = self.decode_from(bs, reader.tell())
+            # BytesIO 的缓冲区之后可能被改写, 这里保留一份副本
+            self.NBTData = self.NBTData.copy()
+        reader.seek(offset)
+
+    def decode_from(self, bs: bytes | memoryview, offset: int) -> int:
+        """
+        从 bs 的 offset 处解码一个条目, NBTData 为指向 bs 的只读视图 (不复制)
+
+        Args:
+            bs (bytes | memoryview): 原始数据
+            offset (int): 起始偏移
+
+        Returns:
+            int: 条目结束后的偏移
+        """
+        (
+            self.Result,
+            self.SubChunkPosX,
+            self.SubChunkPosY,
+            self.SubChunkPosZ,
+            nbt_length,
+        ) = _ENTRY_HEAD.unpack_from(bs, offset)
+        offset += _ENTRY_HEAD.size
+        if nbt_length:
+            self.NBTData = numpy.frombuffer(
+                bs, dtype=numpy.uint8, count=nbt_length, offset=offset
+            )
+        else:
+            self.NBTData = _EMPTY_NBT
+        offset += nbt_length
+        self.BlobHash = _ENTRY_BLOB_HASH.unpack_from(bs, offset)[0]
+        return offset + _ENTRY_BLOB_HASH.size
+
+
+@dataclass
+class SubChunkColumns:
+    """
+    列式 (struct-of-arrays) 的 SubChunk 数据包,
+    第 i 个条目的各字段分别位于各数组的第 i 项。
+
+    NBTOffsets 的形状为 (条目数, 2), 每行为该条目 NBT 数据在 Payload 中的 [起始, 结束) 偏移。
+    """
+
+    Dimension: int = 0
+    CacheEnabled: bool = False
+    Result: numpy.ndarray = field(default_factory=lambda: numpy.array([], "u1"))
+    SubChunkPosX: numpy.ndarray = field(default_factory=lambda: numpy.array([], "<i4"))
+    SubChunkPosY: numpy.ndarray = field(default_factory=lambda: numpy.array([], "<i2"))
+    SubChunkPosZ: numpy.ndarray = field(default_factory=lambda: numpy.array([], "<i4"))
+    BlobHash: numpy.ndarray = field(default_factory=lambda: numpy.array([], "<u8"))
+    NBTOffsets: numpy.ndarray = field(
+        default_factory=lambda: numpy.zeros((0, 2), numpy.int64)
+    )
+    Payload: numpy.ndarray = field(default_factory=lambda: _EMPTY_NBT)
+
+    def __len__(self) -> int:
+        return len(self.Result)
+
+    def nbt_data(self, index: int) -> numpy.ndarray:
+        """返回第 index 个条目的 NBT 数据 (指向 Payload 的视图, 不复制)"""
+        start, end = self.NBTOffsets[index]
+        return self.Payload[start:end]
+
+    def entry(self, index: int) -> SubChunkEntry:
+        """将第 index 个条目还原为 SubChunkEntry"""
+        return SubChunkEntry(
+            int(self.Result[index]),
+            int(self.SubChunkPosX[index]),
+            int(self.SubChunkPosY[index]),
+            int(self.SubChunkPosZ[index]),
+            self.nbt_data(index),
+            int(self.BlobHash[index]),
         )
-        self.BlobHash = struct.unpack("<Q", reader.read(8))[0]
 
 
 @dataclass
@@ -55,10 +139,60 @@ class SubChunk(BaseBytesPacket):
         raise NotImplementedError("Encode packet.SubChunk is not support")
 
     def decode(self, bs: bytes):
-        reader = BytesIO(bs)
-        self.Dimension = reader.read(1)[0]
-        for _ in range(struct.unpack("<H", reader.read(2))[0]):
-            s = SubChunkEntry()
-            s.decode(reader)
-            self.Entries.append(s)
-        self.CacheEnabled = bool(reader.read(1)[0])
+        # 所有条目的 NBTData 都是 bs 的视图, 整个过程不会复制 NBT 数据
+        self.Dimension, entries_count = _ENTRIES_COUNT.unpack_from(bs, 0)
+        offset = _ENTRIES_COUNT.size
+        entries = self.Entries
+        new_entry = SubChunkEntry.__new__
+        for _ in range(entries_count):
+            # 所有字段都会被 decode_from 赋值, 跳过 __init__ 中创建默认空数组的开销
+            s = new_entry(SubChunkEntry)
+            offset = s.decode_from(bs, offset)
+            entries.append(s)
+        self.CacheEnabled = bool(bs[offset])
+
+    @staticmethod
+    def decode_columns(bs: bytes) -> SubChunkColumns:
+        """
+        以列式结构解码 SubChunk 数据包。
+        各字段解码为 NumPy 数组, 可直接用向量化的掩码筛选条目,
+        NBT 数据不会被复制, 均以偏移的形式指向原始数据。
+
+        Args:
+            bs (bytes): 数据包原始数据
+
+        Returns:
+            SubChunkColumns: 列式的 SubChunk 数据包
+        """
+        dimension, entries_count = _ENTRIES_COUNT.unpack_from(bs, 0)
+        # 条目长度不定, 只需逐个读出 NBT 长度来确定每个条目的起始偏移
+        starts = numpy.empty(entries_count, dtype=numpy.int64)
+        unpack_nbt_length = _ENTRY_NBT_LENGTH.unpack_from
+        nbt_length_offset = _ENTRY_HEAD.size - _ENTRY_NBT_LENGTH.size
+        entry_fixed_size = _ENTRY_HEAD.size + _ENTRY_BLOB_HASH.size
+        offset = _ENTRIES_COUNT.size
+        for i in range(entries_count):
+            starts[i] = offset
+            offset += (
+                entry_fixed_size + unpack_nbt_length(bs, offset + nbt_length_offset)[0]
+            )
+        payload = numpy.frombuffer(bs, dtype=numpy.uint8)
+        heads = payload[starts[:, None] + numpy.arange(_ENTRY_HEAD.size)].view(
+            _ENTRY_HEAD_DTYPE
+        )[:, 0]
+        nbt_starts = starts + _ENTRY_HEAD.size
+        nbt_ends = nbt_starts + heads["NBTLength"]
+        blob_hashes = payload[
+            nbt_ends[:, None] + numpy.arange(_ENTRY_BLOB_HASH.size)
+        ].view("<u8")[:, 0]
+        return SubChunkColumns(
+            Dimension=dimension,
+            CacheEnabled=bool(bs[offset]),
+            Result=heads["Result"].copy(),
+            SubChunkPosX=heads["SubChunkPosX"].copy(),
+            SubChunkPosY=heads["SubChunkPosY"].copy(),
+            SubChunkPosZ=heads["SubChunkPosZ"].copy(),
+            BlobHash=blob_hashes,
+            NBTOffsets=numpy.stack((nbt_starts, nbt_ends), axis=1),
+            Payload=payload,
+        )
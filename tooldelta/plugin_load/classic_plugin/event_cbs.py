@@ -1,5 +1,6 @@
+import time
 from typing import TYPE_CHECKING, TypeVar, Any
-from collections.abc import Callable
+from collections.abc import Callable, Collection
 
 from ...mc_bytes_packet.base_bytes_packet import BaseBytesPacket
 from ...utils import fmts
@@ -10,6 +11,7 @@ from ..exceptions import (
     PluginAPINotFoundError,
     PluginAPIVersionError,
 )
+from . import listener_stats, load_scheduler
 
 if TYPE_CHECKING:
     from .plugin_cls import Plugin
@@ -20,6 +22,8 @@ if TYPE_CHECKING:
 T = TypeVar("T")
 PluginEvents_P = dict[int, list[tuple["Plugin", T]]]
 "具有优先级的回调表"
+# 数据包 ID -> 统计监听器耗时所用的事件名
+_packet_event_names: dict[int, str] = {}
 
 
 on_preload_cbs: PluginEvents_P[Callable[[], None]] = {}
@@ -34,8 +38,16 @@ bytes_packet_funcs: dict[PacketIDS, PluginEvents_P["BytesPacketListener"]] = {}
 broadcast_listener: dict[str, PluginEvents_P[Callable[[InternalBroadcast], Any]]] = {}
 
 
-def reload():
-    """系统调用, 重置所有处理函数"""
+def reload(keep_plugins: "Collection[Plugin]" = ()):
+    """
+    系统调用, 重置所有处理函数
+
+    Args:
+        keep_plugins (Collection[Plugin], optional): 保留这些插件注册的处理函数
+    """
+    if keep_plugins:
+        _remove_listeners_except(keep_plugins)
+        return
     on_preload_cbs.clear()
     on_active_cbs.clear()
     on_player_join_cbs.clear()
@@ -48,11 +60,50 @@ def reload():
     broadcast_listener.clear()
 
 
-def run_by_priority(listeners: PluginEvents_P[Callable], args: tuple, onerr: ON_ERROR_CB,):
+def _remove_listeners_except(keep_plugins: "Collection[Plugin]"):
+    keep_ids = {id(plugin) for plugin in keep_plugins}
+    tables: list[PluginEvents_P[Any]] = [
+        on_preload_cbs,
+        on_active_cbs,
+        on_player_join_cbs,
+        on_player_leave_cbs,
+        on_chat_cbs,
+        on_frame_exit_cbs,
+        on_reloaded_cbs,
+    ]
+    for grouped in (dict_packet_funcs, bytes_packet_funcs, broadcast_listener):
+        tables.extend(grouped.values())
+    for table in tables:
+        for priority, listeners in list(table.items()):
+            listeners[:] = [x for x in listeners if id(x[0]) in keep_ids]
+            if not listeners:
+                del table[priority]
+    for grouped in (dict_packet_funcs, bytes_packet_funcs, broadcast_listener):
+        for key in [k for k, table in grouped.items() if not table]:
+            del grouped[key]
+
+
+def run_by_priority(
+    listeners: PluginEvents_P[Callable],
+    args: tuple,
+    onerr: ON_ERROR_CB,
+    event: str | None = None,
+):
+    """
+    按优先级执行监听器, 监听器返回 True 时不再执行之后的监听器
+
+    Args:
+        event (str, optional): 事件名, 传入时记录各插件监听器的耗时并检测慢回调
+    """
     for _, sub_listeners in sorted(listeners.items(), reverse=True):
         for plugin, listener in sub_listeners:
             try:
-                is_blocking = listener(*args)
+                if event is None:
+                    is_blocking = listener(*args)
+                else:
+                    is_blocking = listener_stats.call_listener(
+                        plugin.name, event, listener, args
+                    )
                 if is_blocking is True:
                     return True
             except Exception as e:
@@ -60,6 +111,24 @@ def run_by_priority(listeners: PluginEvents_P[Callable], args: tuple, onerr: ON_
     return False
 
 
+def run_timed_by_priority(
+    listeners: PluginEvents_P[Callable[[], Any]], onerr: ON_ERROR_CB, stage: str
+):
+    """与 run_by_priority 相同, 但记录每个插件的耗时, 用于加载阶段的事件"""
+    for _, sub_listeners in sorted(listeners.items(), reverse=True):
+        for plugin, listener in sub_listeners:
+            start = time.perf_counter()
+            try:
+                if listener() is True:
+                    return
+            except Exception as e:
+                onerr(plugin.name, e)
+            finally:
+                load_scheduler.record_timing(
+                    plugin.name, stage, start, time.perf_counter()
+                )
+
+
 def execute_preload(onerr: ON_ERROR_CB) -> None:
     """执行插件的二次初始化方法
 
@@ -82,16 +151,45 @@ def execute_preload(onerr: ON_ERROR_CB) -> None:
         else:
             onerr(plugin_name, err)
             raise SystemExit
-    run_by_priority(on_preload_cbs, (), error_handler)
+    run_timed_by_priority(on_preload_cbs, error_handler, "预加载")
 
 
-def execute_active(onerr: ON_ERROR_CB) -> None:
+def execute_active(
+    onerr: ON_ERROR_CB, dependencies: "dict[Plugin, set[Plugin]] | None" = None
+) -> None:
     """执行插件的连接游戏后初始化方法
 
+    并行加载时, 同一优先级的回调按插件依赖关系分批并行执行,
+    依赖的插件的回调执行完毕后才会执行该插件的回调;
+    此时回调返回 True 不会阻止同一优先级的其他插件的回调。
+
     Args:
         onerr (Callable[[str, Exception, str], None], optional): 插件出错时的处理方法
+        dependencies (dict[Plugin, set[Plugin]], optional): 插件 -> 其依赖的插件, 不传入时串行执行
     """
-    run_by_priority(on_active_cbs, (), onerr)
+    if not load_scheduler.PARALLEL_LOAD or dependencies is None:
+        run_timed_by_priority(on_active_cbs, onerr, "连接建立")
+        return
+    for _, sub_listeners in sorted(on_active_cbs.items(), reverse=True):
+        plugin_listeners: dict["Plugin", list[Callable[[], Any]]] = {}
+        for plugin, listener in sub_listeners:
+            plugin_listeners.setdefault(plugin, []).append(listener)
+
+        def run_plugin_listeners(plugin: "Plugin"):
+            for listener in plugin_listeners[plugin]:
+                start = time.perf_counter()
+                try:
+                    listener()
+                except Exception as e:
+                    onerr(plugin.name, e)
+                finally:
+                    load_scheduler.record_timing(
+                        plugin.name, "连接建立", start, time.perf_counter()
+                    )
+
+        load_scheduler.run_dag(
+            plugin_listeners, dependencies, run_plugin_listeners, "并行执行连接建立回调"
+        )
 
 
 def execute_player_join(player: Player, onerr: ON_ERROR_CB) -> None:
@@ -101,7 +199,7 @@ def execute_player_join(player: Player, onerr: ON_ERROR_CB) -> None:
         player (str): 玩家
         onerr (Callable[[str, Exception, str], None], optional): q 插件出错时的处理方法
     """
-    run_by_priority(on_player_join_cbs, (player,), onerr)
+    run_by_priority(on_player_join_cbs, (player,), onerr, "玩家进入")
 
 
 def execute_chat(
@@ -115,7 +213,7 @@ def execute_chat(
         msg (str): 消息
         onerr (Callable[[str, Exception, str], None], optional): 插件出错时的处理方法
     """
-    run_by_priority(on_chat_cbs, (chat,), onerr)
+    run_by_priority(on_chat_cbs, (chat,), onerr, "玩家消息")
 
 
 def execute_player_leave(player: Player, onerr: ON_ERROR_CB) -> None:
@@ -125,7 +223,7 @@ def execute_player_leave(player: Player, onerr: ON_ERROR_CB) -> None:
         player (str): 玩家
         onerr (Callable[[str, Exception, str], None], optional): 插件出错时的处理方法
     """
-    run_by_priority(on_player_leave_cbs, (player,), onerr)
+    run_by_priority(on_player_leave_cbs, (player,), onerr, "玩家退出")
 
 
 def execute_frame_exit(evt: FrameExit, onerr: ON_ERROR_CB):
@@ -158,7 +256,7 @@ def execute_dict_packet_funcs(pktID: PacketIDS, pkt: dict, onerr: ON_ERROR_CB) -
     """
     d = dict_packet_funcs.get(pktID)
     if d:
-        return run_by_priority(d, (pkt,), onerr)
+        return run_by_priority(d, (pkt,), onerr, _packet_event_name(pktID))
     return False
 
 
@@ -176,5 +274,16 @@ def execute_bytes_packet_funcs(
     """
     d = bytes_packet_funcs.get(pktID)
     if d:
-        return run_by_priority(d, (pkt,), onerr)
+        return run_by_priority(d, (pkt,), onerr, _packet_event_name(pktID))
     return False
+
+
+def _packet_event_name(pktID: PacketIDS) -> str:
+    name = _packet_event_names.get(pktID)
+    if name is None:
+        try:
+            name = f"数据包 {PacketIDS(pktID).name}"
+        except ValueError:
+            name = f"数据包 {pktID}"
+        _packet_event_names[pktID] = name
+    return name
@@ -0,0 +1,179 @@
+"""
+类式插件的增量重载
+
+记录每个插件源码文件的修改时间与内容哈希, 重载时只重新导入发生变化的插件
+及依赖了它们的插件, 未变化的插件保留原有的插件实例和已注册的监听器。
+重新导入的插件和已移除的插件的模块会从 sys.modules 和 sys.path 中彻底清除。
+
+增量重载默认关闭, 需要通过启动参数 -selective-plugin-reload 开启。
+开启后, 保留的插件需要遵守以下约定:
+    保留的插件不会重新执行模块代码和 __init__,
+    但重载过程仍会向所有插件发送框架退出事件, 并清理所有插件的
+    tempjson 缓存、ToolDeltaThread 线程和定时任务。
+    因此插件需要在预加载或连接建立事件中 (而不是 __init__ 中)
+    载入 tempjson 文件、启动线程与定时任务,
+    并在框架退出事件中关闭的资源需要在这些事件中重新打开。
+不遵守该约定的插件请不要开启增量重载。
+"""
+
+import hashlib
+import importlib
+import os
+import sys
+from collections.abc import Collection
+from pathlib import Path
+
+from ...constants import TOOLDELTA_CLASSIC_PLUGIN_PATH, TOOLDELTA_PLUGIN_CFG_DIR
+from ...utils import sys_args
+from .plugin_cls import Plugin
+
+# 是否只重载发生变化的插件, 可通过启动参数 -selective-plugin-reload 开启
+SELECTIVE_RELOAD = "selective-plugin-reload" in sys_args.sys_args_to_dict()
+# 会被计入插件指纹的源码文件后缀
+SOURCE_SUFFIXES = (".py", ".pyd", ".so")
+
+# 文件路径 -> (修改时间 ns, 文件大小, 内容哈希)
+FILE_STATES = dict[str, tuple[int, int, str]]
+
+# 插件目录 -> (插件实例, 上次成功加载时的文件指纹)
+_records: dict[Path, tuple[Plugin, FILE_STATES]] = {}
+
+
+def is_loaded(plugin_dir: Path) -> bool:
+    "插件目录中的插件是否已被成功加载过"
+    return plugin_dir in _records
+
+
+def plan_reload(
+    plugin_dirs: list[Path], deps: dict[Path, set[Path]]
+) -> dict[Path, Plugin]:
+    """
+    获取本次重载可以保留的插件: 插件的文件未发生变化, 且其依赖的插件都被保留。
+
+    Args:
+        plugin_dirs (list[Path]): 本次需要加载的插件目录
+        deps (dict[Path, set[Path]]): 插件目录 -> 其依赖的插件目录
+
+    Returns:
+        dict[Path, Plugin]: 插件目录 -> 可保留的插件实例
+    """
+    if not SELECTIVE_RELOAD:
+        return {}
+    changed = {plugin_dir for plugin_dir in plugin_dirs if _is_changed(plugin_dir)}
+    # 依赖了需要重载的插件的插件也需要重载, 以更新其获取到的插件 API
+    while True:
+        affected = {
+            plugin_dir
+            for plugin_dir in plugin_dirs
+            if plugin_dir not in changed and deps.get(plugin_dir, set()) & changed
+        }
+        if not affected:
+            break
+        changed |= affected
+    return {
+        plugin_dir: _records[plugin_dir][0]
+        for plugin_dir in plugin_dirs
+        if plugin_dir not in changed
+    }
+
+
+def purge_plugin_modules(keep_dirs: Collection[Path]):
+    """
+    从 sys.modules 和 sys.path 中清除除 keep_dirs 以外的所有插件的模块,
+    使之后的导入重新执行插件代码。
+
+    Args:
+        keep_dirs (Collection[Path]): 需要保留的插件目录
+    """
+    plugin_root = os.path.abspath(TOOLDELTA_CLASSIC_PLUGIN_PATH) + os.sep
+    keep_prefixes = _dir_prefixes(keep_dirs)
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if not isinstance(file, str):
+            continue
+        file = os.path.abspath(file)
+        if file.startswith(plugin_root) and not file.startswith(keep_prefixes):
+            del sys.modules[name]
+    keep_paths = {os.path.abspath(d) for d in keep_dirs}
+    sys.path[:] = [
+        p
+        for p in sys.path
+        if not os.path.abspath(p).startswith(plugin_root)
+        or os.path.abspath(p) in keep_paths
+    ]
+    importlib.invalidate_caches()
+
+
+def is_defined_in(func: object, plugin_dirs: Collection[Path]) -> bool:
+    "回调函数是否在这些插件目录下的模块中定义"
+    module = sys.modules.get(getattr(func, "__module__", None) or "")
+    file = getattr(module, "__file__", None)
+    return isinstance(file, str) and os.path.abspath(file).startswith(
+        _dir_prefixes(plugin_dirs)
+    )
+
+
+def record_loaded(plugins: dict[Path, Plugin]):
+    """
+    记录成功加载的插件及其文件指纹, 作为下次重载时比较的基准。
+
+    Args:
+        plugins (dict[Path, Plugin]): 插件目录 -> 插件实例
+    """
+    old_records = _records.copy()
+    _records.clear()
+    for plugin_dir, plugin in plugins.items():
+        old_states = old_records[plugin_dir][1] if plugin_dir in old_records else {}
+        _records[plugin_dir] = (
+            plugin,
+            _fingerprint(plugin_dir, plugin.name, old_states),
+        )
+
+
+def _dir_prefixes(plugin_dirs: Collection[Path]) -> tuple[str, ...]:
+    return tuple(os.path.abspath(d) + os.sep for d in plugin_dirs)
+
+
+def _is_changed(plugin_dir: Path) -> bool:
+    record = _records.get(plugin_dir)
+    if record is None:
+        return True
+    plugin, old_states = record
+    new_states = _fingerprint(plugin_dir, plugin.name, old_states)
+    # 只比较内容哈希, 仅修改时间变化的文件不算作修改
+    return {p: s[2] for p, s in new_states.items()} != {
+        p: s[2] for p, s in old_states.items()
+    }
+
+
+def _tracked_files(plugin_dir: Path, plugin_name: str):
+    for root, dirs, files in os.walk(plugin_dir):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for file in files:
+            if file.endswith(SOURCE_SUFFIXES) or file == "datas.json":
+                yield os.path.join(root, file)
+    # 插件配置文件在 __init__ 中读取, 修改后同样需要重新导入
+    yield str(TOOLDELTA_PLUGIN_CFG_DIR / f"{plugin_name}.json")
+
+
+def _fingerprint(
+    plugin_dir: Path, plugin_name: str, old_states: FILE_STATES
+) -> FILE_STATES:
+    "获取插件文件的指纹, 修改时间和大小未变化的文件直接沿用上次的哈希"
+    states: FILE_STATES = {}
+    for path in _tracked_files(plugin_dir, plugin_name):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        old = old_states.get(path)
+        if old is not None and old[:2] == (st.st_mtime_ns, st.st_size):
+            states[path] = old
+            continue
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except OSError:
+            continue
+        states[path] = (st.st_mtime_ns, st.st_size, digest)
+    return states
@@ -0,0 +1,263 @@
+"""
+类式插件监听器的耗时统计与慢回调检测
+
+记录每个插件在每种事件 (聊天、玩家进出、数据包等) 上的监听器耗时直方图。
+监听器执行时间超过阈值时, 后台线程会输出该插件和监听器当前的调用栈,
+以便找出阻塞了其他插件的监听器。
+统计不加锁, 多个线程同时执行同一监听器时计数可能有极少量误差。
+"""
+
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from typing import Any
+
+from ...utils import fmts, sys_args, try_int
+from ...utils.tooldelta_thread import ToolDeltaThread
+
+# 直方图各桶的上界 (纳秒), 最后一个桶存放超过最大上界的耗时
+BUCKET_BOUNDS_NS = (
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+    1_000_000,
+    2_500_000,
+    5_000_000,
+    10_000_000,
+    25_000_000,
+    50_000_000,
+    100_000_000,
+    250_000_000,
+    500_000_000,
+    1_000_000_000,
+)
+_ms = try_int(sys_args.sys_args_to_dict().get("slow-callback-ms"))
+# 慢回调阈值 (纳秒), 可通过启动参数 -slow-callback-ms <毫秒> 设置, 为 0 时不检测
+SLOW_CALLBACK_THRESHOLD_NS = (100 if _ms is None else _ms) * 1_000_000
+
+
+class ListenerStats:
+    "一个插件在一种事件上的监听器耗时统计"
+
+    __slots__ = ("buckets", "count", "max_ns", "slow", "total_ns")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.slow = 0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+
+    def add(self, elapsed_ns: int):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+
+    def percentile_ns(self, percent: float) -> int:
+        "由直方图估算的百分位耗时 (所在桶的上界)"
+        target = self.count * percent / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target and n:
+                if i < len(BUCKET_BOUNDS_NS):
+                    return min(BUCKET_BOUNDS_NS[i], self.max_ns)
+                break
+        return self.max_ns
+
+
+class _RunningCall:
+    __slots__ = ("event", "listener", "plugin_name", "reported", "start_ns")
+
+    def __init__(self, plugin_name: str, event: str, listener: Callable, start_ns: int):
+        self.plugin_name = plugin_name
+        self.event = event
+        self.listener = listener
+        self.start_ns = start_ns
+        self.reported = False
+
+
+# (插件名, 事件名) -> 统计
+listener_timings: dict[tuple[str, str], ListenerStats] = {}
+# 线程 ID -> 该线程正在执行的监听器
+_running_calls: dict[int, _RunningCall] = {}
+_watchdog: ToolDeltaThread | None = None
+_watchdog_lock = threading.Lock()
+
+
+def call_listener(
+    plugin_name: str, event: str, listener: Callable[..., Any], args: tuple
+) -> Any:
+    """
+    执行监听器并记录耗时
+
+    Args:
+        plugin_name (str): 插件名
+        event (str): 事件名
+        listener (Callable[..., Any]): 监听器
+        args (tuple): 监听器参数
+
+    Returns:
+        Any: 监听器的返回值
+    """
+    if _watchdog is None and SLOW_CALLBACK_THRESHOLD_NS:
+        _start_watchdog()
+    tid = threading.get_ident()
+    outer = _running_calls.get(tid)
+    call = _RunningCall(plugin_name, event, listener, time.perf_counter_ns())
+    _running_calls[tid] = call
+    try:
+        return listener(*args)
+    finally:
+        elapsed_ns = time.perf_counter_ns() - call.start_ns
+        # 监听器中可能再次触发事件, 恢复外层正在执行的监听器
+        if outer is None:
+            del _running_calls[tid]
+        else:
+            _running_calls[tid] = outer
+        key = (plugin_name, event)
+        stats = listener_timings.get(key)
+        if stats is None:
+            stats = listener_timings[key] = ListenerStats()
+        stats.add(elapsed_ns)
+        if SLOW_CALLBACK_THRESHOLD_NS and elapsed_ns >= SLOW_CALLBACK_THRESHOLD_NS:
+            stats.slow += 1
+            _report_finished(call, elapsed_ns)
+
+
+def get_top_listeners(limit: int = 10) -> list[tuple[str, str, ListenerStats]]:
+    """
+    获取总耗时最多的监听器统计
+
+    Args:
+        limit (int, optional): 数量上限
+
+    Returns:
+        list[tuple[str, str, ListenerStats]]: (插件名, 事件名, 统计) 列表
+    """
+    items = sorted(listener_timings.items(), key=lambda x: x[1].total_ns, reverse=True)[
+        :limit
+    ]
+    return [(plugin_name, event, stats) for (plugin_name, event), stats in items]
+
+
+def print_top_listeners(limit: int = 10):
+    "输出总耗时最多的监听器统计"
+    top = get_top_listeners(limit)
+    if not top:
+        fmts.print_inf("还没有记录到插件监听器的执行")
+        return
+    threshold = (
+        f"{SLOW_CALLBACK_THRESHOLD_NS / 1e6:g}ms"
+        if SLOW_CALLBACK_THRESHOLD_NS
+        else "未开启"
+    )
+    fmts.print_inf(f"插件监听器耗时排行 (慢回调阈值 {threshold}):")
+    fmts.print_inf(
+        f" {fmts.align('插件', 20)} {fmts.align('事件', 16)}"
+        "     次数     总计     平均      p99     最大  慢回调"
+    )
+    for plugin_name, event, stats in top:
+        fmts.print_inf(
+            f" §b{fmts.align(plugin_name, 20)}§f {fmts.align(event, 16)}"
+            f" {stats.count:>8} {_fmt_ns(stats.total_ns)}"
+            f" {_fmt_ns(stats.total_ns // stats.count)}"
+            f" {_fmt_ns(stats.percentile_ns(99))} {_fmt_ns(stats.max_ns)}"
+            f" {stats.slow:>7}"
+        )
+
+
+def set_slow_callback_threshold(seconds: float):
+    """
+    设置慢回调阈值
+
+    Args:
+        seconds (float): 阈值秒数, 为 0 时不检测慢回调
+    """
+    global SLOW_CALLBACK_THRESHOLD_NS
+    SLOW_CALLBACK_THRESHOLD_NS = int(seconds * 1e9)
+
+
+def reset_stats():
+    "清空监听器耗时统计"
+    listener_timings.clear()
+
+
+def _fmt_ns(ns: int) -> str:
+    if ns >= 1_000_000_000:
+        return f"{ns / 1e9:>7.2f}s"
+    return f"{ns / 1e6:>6.1f}ms"
+
+
+def _listener_location(listener: Callable) -> str:
+    func = getattr(listener, "__func__", listener)
+    code = getattr(func, "__code__", None)
+    name = getattr(func, "__qualname__", repr(func))
+    if code is None:
+        return name
+    return f"{name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _report_finished(call: _RunningCall, elapsed_ns: int):
+    if call.reported:
+        fmts.print_war(
+            f"插件 {call.plugin_name} 的 {call.event} 监听器已返回, 共耗时 {elapsed_ns / 1e6:.1f}ms"
+        )
+    else:
+        fmts.print_war(
+            f"插件 {call.plugin_name} 的 {call.event} 监听器"
+            f" {_listener_location(call.listener)} 耗时 {elapsed_ns / 1e6:.1f}ms,"
+            " 阻塞了其他插件的监听器"
+        )
+
+
+def _listener_stack(frame) -> traceback.StackSummary:
+    "获取调用栈中监听器内部的部分"
+    stack = traceback.extract_stack(frame)
+    for i in range(len(stack) - 1, -1, -1):
+        if stack[i].filename == __file__ and stack[i].name == call_listener.__name__:
+            return traceback.StackSummary.from_list(stack[i + 1 :])
+    return stack
+
+
+def _start_watchdog():
+    global _watchdog
+    with _watchdog_lock:
+        if _watchdog is None:
+            _watchdog = ToolDeltaThread(
+                _watch_slow_calls,
+                usage="插件慢回调检测",
+                thread_level=ToolDeltaThread.SYSTEM,
+            )
+
+
+def _watch_slow_calls():
+    while True:
+        threshold = SLOW_CALLBACK_THRESHOLD_NS
+        # 阈值为 0 时暂停检测, 等待重新设置
+        time.sleep(threshold / 2e9 if threshold else 1)
+        if not threshold:
+            continue
+        now = time.perf_counter_ns()
+        frames = None
+        for tid, call in list(_running_calls.items()):
+            if call.reported or now - call.start_ns < threshold:
+                continue
+            if frames is None:
+                frames = sys._current_frames()
+            frame = frames.get(tid)
+            if frame is None:
+                continue
+            call.reported = True
+            stack = "".join(traceback.format_list(_listener_stack(frame)))
+            fmts.print_war(
+                f"插件 {call.plugin_name} 的 {call.event} 监听器"
+                f" {_listener_location(call.listener)}"
+                f" 已执行 {(now - call.start_ns) / 1e6:.1f}ms 仍未返回, 当前调用栈:\n{stack}"
+            )
@@ -0,0 +1,197 @@
+"""
+类式插件的并行加载调度
+
+根据插件间的依赖关系 (datas.json 的 pre-plugins 与 GetPluginAPI 所需的 API)
+构建有向无环图, 在前置插件完成后立即在工作线程中执行后续插件的任务,
+互不依赖的插件并行导入和执行连接建立回调。
+
+并行加载默认关闭, 需要通过启动参数 -parallel-plugin-load 开启。
+开启后, 插件的 API 在其导入完成后立即可用, 依赖它的插件会在它之后导入;
+但只有在 datas.json 的 pre-plugins 中声明, 或以字符串字面量调用 GetPluginAPI 的依赖
+才能被识别, 插件注册控制台命令的顺序在每次启动时也可能不同。
+"""
+
+import re
+import threading
+from collections.abc import Callable, Hashable, Iterable
+from pathlib import Path
+from typing import TypeVar
+
+from ...utils import fmts, startup_profiler, sys_args
+from ...utils.tooldelta_thread import ToolDeltaThread
+
+T = TypeVar("T", bound=Hashable)
+
+# 是否并行导入插件和执行连接建立回调, 可通过启动参数 -parallel-plugin-load 开启
+PARALLEL_LOAD = "parallel-plugin-load" in sys_args.sys_args_to_dict()
+# 并行加载使用的工作线程数
+LOAD_WORKERS = 8
+
+_get_api_rule = re.compile(
+    r"""(?:GetPluginAPI|get_plugin_api)\(\s*(?:api_name\s*=\s*|apiName\s*=\s*)?["']([^"']+)["']"""
+)
+_api_entry_rule = re.compile(
+    r"""plugin_entry\(\s*[\w.]+\s*,\s*(?:api_name\s*=\s*)?(\[[^\]]*\]|["'][^"']+["'])"""
+)
+_quoted_rule = re.compile(r"""["']([^"']+)["']""")
+
+# 插件名 -> 阶段名 -> 耗时 (秒)
+timings: dict[str, dict[str, float]] = {}
+# 阶段名 -> 该阶段实际经过的时间 (秒)
+wall_times: dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+def scan_plugin_apis(plugin_dir: Path) -> tuple[set[str], set[str]]:
+    """
+    静态扫描插件源码, 获取插件提供的 API 名和通过 GetPluginAPI 获取的 API 名。
+    只能识别以字符串字面量传入的 API 名, 仅用于确定加载顺序。
+
+    Args:
+        plugin_dir (Path): 插件目录
+
+    Returns:
+        tuple[set[str], set[str]]: 提供的 API 名, 需要的 API 名
+    """
+    provides: set[str] = set()
+    requires: set[str] = set()
+    for file in plugin_dir.rglob("*.py"):
+        try:
+            content = file.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        requires.update(_get_api_rule.findall(content))
+        for names in _api_entry_rule.findall(content):
+            provides.update(_quoted_rule.findall(names))
+    return provides, requires - provides
+
+
+def record_timing(plugin_name: str, stage: str, start: float, end: float):
+    "累加插件在某一加载阶段的耗时, start 与 end 为 time.perf_counter 的值"
+    with _timings_lock:
+        stages = timings.setdefault(plugin_name, {})
+        stages[stage] = stages.get(stage, 0.0) + end - start
+    startup_profiler.record(f"{stage} {plugin_name}", start, end, "plugin")
+
+
+def record_wall_time(stage: str, start: float, end: float):
+    "记录某一加载阶段实际经过的时间"
+    wall_times[stage] = end - start
+    startup_profiler.record(stage, start, end)
+
+
+def reset_timings():
+    "清空上一次加载的耗时记录"
+    with _timings_lock:
+        timings.clear()
+        wall_times.clear()
+
+
+def print_timing_report():
+    "输出各插件在各加载阶段的耗时"
+    if not timings:
+        return
+    stages = ("导入", "预加载", "连接建立")
+    mode = f"并行, {LOAD_WORKERS} 线程" if PARALLEL_LOAD else "串行"
+    fmts.print_inf(f"插件加载耗时 ({mode}):")
+    rows = sorted(timings.items(), key=lambda x: sum(x[1].values()), reverse=True)
+    for name, stage_times in rows:
+        detail = "  ".join(
+            f"{stage} {stage_times[stage] * 1000:>7.1f}ms"
+            for stage in stages
+            if stage in stage_times
+        )
+        fmts.print_inf(f" §b{fmts.align(name, 24)}§f {detail}")
+    summary = "  ".join(
+        f"{stage} {wall_times[stage]:.2f}s" for stage in stages if stage in wall_times
+    )
+    fmts.print_inf(f" 实际耗时: {summary}")
+
+
+def run_dag(
+    nodes: Iterable[T],
+    deps: dict[T, set[T]],
+    func: Callable[[T], object],
+    usage: str,
+    workers: int | None = None,
+):
+    """
+    按依赖顺序执行任务: 一个节点的所有依赖完成后, 该节点才会在工作线程中执行。
+    出现异常时不再开始新的任务, 等待正在执行的任务结束后在调用线程重新抛出第一个异常。
+    出现循环依赖时, 按传入顺序忽略循环中第一个节点的依赖。
+
+    Args:
+        nodes (Iterable[T]): 节点, 顺序即为同时就绪时的执行顺序
+        deps (dict[T, set[T]]): 节点 -> 依赖的节点, 不在 nodes 中的依赖会被忽略
+        func (Callable[[T], object]): 对每个节点执行的任务
+        usage (str): 工作线程的用途说明
+        workers (int, optional): 工作线程数, 默认为 LOAD_WORKERS
+    """
+    order = list(nodes)
+    if not order:
+        return
+    node_set = set(order)
+    waiting = {
+        n: {d for d in deps.get(n, ()) if d in node_set and d != n} for n in order
+    }
+    dependents: dict[T, list[T]] = {n: [] for n in order}
+    for n, ds in waiting.items():
+        for d in ds:
+            dependents[d].append(n)
+    ready = [n for n in order if not waiting[n]]
+    pending = [n for n in order if waiting[n]]
+    cond = threading.Condition()
+    running = 0
+    errors: list[BaseException] = []
+
+    def next_task() -> T | None:
+        nonlocal running
+        with cond:
+            while True:
+                if errors:
+                    return None
+                if ready:
+                    running += 1
+                    return ready.pop(0)
+                if not pending:
+                    return None
+                if running == 0:
+                    # 剩余的节点都在等待彼此, 说明存在循环依赖
+                    node = pending[0]
+                    fmts.print_war(f"检测到循环依赖, 将忽略 {node} 的依赖直接加载")
+                    waiting[node].clear()
+                    pending.remove(node)
+                    running += 1
+                    return node
+                cond.wait()
+
+    def worker():
+        nonlocal running
+        while (node := next_task()) is not None:
+            try:
+                func(node)
+            except BaseException as err:
+                with cond:
+                    errors.append(err)
+            finally:
+                with cond:
+                    running -= 1
+                    for child in dependents[node]:
+                        waiting[child].discard(node)
+                        if not waiting[child] and child in pending:
+                            pending.remove(child)
+                            ready.append(child)
+                    cond.notify_all()
+
+    threads = [
+        ToolDeltaThread(
+            worker,
+            usage=f"{usage} #{i}",
+            thread_level=ToolDeltaThread.PLUGIN_LOADER,
+        )
+        for i in range(min(workers or LOAD_WORKERS, len(order)))
+    ]
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
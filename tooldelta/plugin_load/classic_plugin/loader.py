@@ -1,5 +1,7 @@
 import importlib
 import sys
+import threading
+import time
 import traceback
 from pathlib import Path
 from typing import TYPE_CHECKING, TypeVar
@@ -10,7 +12,7 @@ from ...constants import TOOLDELTA_CLASSIC_PLUGIN_PATH
 from ...version import SystemVersionException
 from ..basic import plugin_is_enabled
 from ..exceptions import NotValidPluginError
-from . import event_cbs
+from . import event_cbs, hot_reload, load_scheduler
 from .plugin_cls import Plugin
 
 if TYPE_CHECKING:
@@ -19,11 +21,13 @@ if TYPE_CHECKING:
 
 loaded_plugin_modules = []
 __cached_frame: "ToolDelta | None" = None
+_modules_lock = threading.Lock()
+# 插件 -> 其依赖的插件, 由 read_plugins 生成, 用于并行执行连接建立回调
+plugin_dependencies: dict[Plugin, set[Plugin]] = {}
 
 PLUGIN_CLS = TypeVar("PLUGIN_CLS", bound=Plugin)
 
 
-# TODO: 会存储已删除的插件模块, 可能导致内存泄漏
 def plugin_entry(
     plugin_cls: type[PLUGIN_CLS],
     api_name: str | list[str] = [],
@@ -81,28 +85,147 @@ def help(plugin: type[Plugin]) -> None:
     fmts.clean_print(plugin_docs)
 
 
-def read_plugins(plugin_grp: "PluginGroup") -> None:
+def read_plugins(plugin_grp: "PluginGroup", reload: bool = False) -> None:
     """
     读取插件
 
     Args:
         plugin_grp (PluginGroup): 插件组
+        reload (bool, optional): 是否为重载, 重载时只重新导入发生变化的插件
     """
     plugin_path_str = str(TOOLDELTA_CLASSIC_PLUGIN_PATH)
     if plugin_path_str not in sys.path:
         sys.path.append(plugin_path_str)
-    event_cbs.broadcast_listener.clear()
-    event_cbs.dict_packet_funcs.clear()
-    event_cbs.bytes_packet_funcs.clear()
-    for plugin_dir in TOOLDELTA_CLASSIC_PLUGIN_PATH.iterdir():
-        if not plugin_is_enabled(str(plugin_dir)):
-            continue
-        if plugin_dir.is_dir():
+    plugin_dependencies.clear()
+    load_scheduler.reset_timings()
+    plugin_dirs = [
+        plugin_dir
+        for plugin_dir in TOOLDELTA_CLASSIC_PLUGIN_PATH.iterdir()
+        if plugin_is_enabled(str(plugin_dir)) and plugin_dir.is_dir()
+    ]
+    plugin_datas: dict[Path, dict] = {}
+    for plugin_dir in plugin_dirs:
+        if (data_path := plugin_dir / "datas.json").is_file():
+            plugin_datas[plugin_dir] = utils.safe_json.safe_json_load(str(data_path))
+    deps = _get_plugin_dir_dependencies(plugin_dirs, plugin_datas)
+    reused = hot_reload.plan_reload(plugin_dirs, deps) if reload else {}
+    _reset_plugin_states(plugin_grp, reused, reload)
+    for plugin_dir in plugin_dirs:
+        if str(plugin_dir) not in sys.path:
             sys.path.append(str(plugin_dir))
-            load_plugin(plugin_grp, plugin_dir)
-            if (data_path := plugin_dir / "datas.json").is_file():
-                plugin_data = utils.safe_json.safe_json_load(str(data_path))
-                plugin_grp.loaded_plugin_ids.append(plugin_data["plugin-id"])
+    to_import = [d for d in plugin_dirs if d not in reused]
+    if reused:
+        fmts.print_inf(
+            f"{len(reused)} 个插件未发生变化, 将保留; 重新导入 {len(to_import)} 个插件"
+        )
+    start = time.perf_counter()
+    if load_scheduler.PARALLEL_LOAD:
+        imported: dict[Path, tuple[Plugin | None, str]] = {}
+
+        def import_one(plugin_dir: Path):
+            t = time.perf_counter()
+            imported[plugin_dir] = res = _import_plugin(plugin_grp, plugin_dir)
+            _record_import_timing(plugin_dir, res[0], t)
+            # 在依赖此插件的插件开始导入前公开其 API
+            if res[0] is not None:
+                _publish_plugin(plugin_grp, res[0])
+
+        load_scheduler.run_dag(to_import, deps, import_one, "并行导入插件")
+    plugins: dict[Path, Plugin] = {}
+    for plugin_dir in plugin_dirs:
+        if plugin_dir in reused:
+            plugin = _register_plugin(
+                plugin_grp, plugin_dir, reused[plugin_dir], "保留"
+            )
+        elif load_scheduler.PARALLEL_LOAD:
+            plugin = _register_plugin(plugin_grp, plugin_dir, *imported[plugin_dir])
+        else:
+            t = time.perf_counter()
+            plugin = load_plugin(plugin_grp, plugin_dir)
+            _record_import_timing(plugin_dir, plugin, t)
+        if plugin is not None:
+            plugins[plugin_dir] = plugin
+        if plugin_dir in plugin_datas:
+            plugin_grp.loaded_plugin_ids.append(plugin_datas[plugin_dir]["plugin-id"])
+    load_scheduler.record_wall_time("导入", start, time.perf_counter())
+    # 并行导入和保留插件时监听器的注册顺序不确定, 按插件目录顺序重新排列以保持执行顺序稳定
+    _sort_listeners_by_plugin_order(list(plugins.values()))
+    for plugin_dir, plugin in plugins.items():
+        plugin_dependencies[plugin] = {
+            plugins[d] for d in deps.get(plugin_dir, ()) if d in plugins
+        }
+    hot_reload.record_loaded(plugins)
+
+
+def _reset_plugin_states(
+    plugin_grp: "PluginGroup", reused: dict[Path, Plugin], reload: bool
+):
+    "清除除保留的插件以外的插件注册的监听器、控制台命令与模块"
+    event_cbs.reload(reused.values())
+    hot_reload.purge_plugin_modules(reused)
+    # 已编译的加载器会引用插件的模版类, 不清空会使被清除的插件模块无法被回收
+    cfg_meta.clear_schema_cache()
+    with _modules_lock:
+        loaded_plugin_modules[:] = [
+            m for m in loaded_plugin_modules if sys.modules.get(m.__name__) is m
+        ]
+    if reload:
+        plugin_grp.linked_frame.cmd_manager.reset_cmds(
+            lambda trigger: hot_reload.is_defined_in(trigger.cb, reused)
+        )
+
+
+def _record_import_timing(plugin_dir: Path, plugin: Plugin | None, start: float):
+    name = plugin.name if plugin is not None else plugin_dir.name
+    load_scheduler.record_timing(name, "导入", start, time.perf_counter())
+
+
+def _get_plugin_dir_dependencies(
+    plugin_dirs: list[Path], plugin_datas: dict[Path, dict]
+) -> dict[Path, set[Path]]:
+    "根据 datas.json 的前置插件与静态扫描到的 API 获取插件间的依赖关系"
+    id_to_dir = {
+        data["plugin-id"]: plugin_dir
+        for plugin_dir, data in plugin_datas.items()
+        if "plugin-id" in data
+    }
+    api_providers: dict[str, Path] = {}
+    api_requires: dict[Path, set[str]] = {}
+    for plugin_dir in plugin_dirs:
+        provides, requires = load_scheduler.scan_plugin_apis(plugin_dir)
+        for api_name in provides:
+            api_providers.setdefault(api_name, plugin_dir)
+        api_requires[plugin_dir] = requires
+    deps: dict[Path, set[Path]] = {}
+    for plugin_dir in plugin_dirs:
+        pre_plugins = plugin_datas.get(plugin_dir, {}).get("pre-plugins", {})
+        plugin_deps = {id_to_dir[i] for i in pre_plugins if i in id_to_dir}
+        plugin_deps.update(
+            api_providers[a] for a in api_requires[plugin_dir] if a in api_providers
+        )
+        plugin_deps.discard(plugin_dir)
+        deps[plugin_dir] = plugin_deps
+    return deps
+
+
+def _sort_listeners_by_plugin_order(plugins: list[Plugin]):
+    order = {id(plugin): i for i, plugin in enumerate(plugins)}
+    tables = [
+        event_cbs.on_preload_cbs,
+        event_cbs.on_active_cbs,
+        event_cbs.on_player_join_cbs,
+        event_cbs.on_player_leave_cbs,
+        event_cbs.on_chat_cbs,
+        event_cbs.on_frame_exit_cbs,
+        event_cbs.on_reloaded_cbs,
+        *event_cbs.dict_packet_funcs.values(),
+        *event_cbs.bytes_packet_funcs.values(),
+        *event_cbs.broadcast_listener.values(),
+    ]
+    for table in tables:
+        for listeners in table.values():
+            # 稳定排序, 同一插件的监听器保持注册时的顺序
+            listeners.sort(key=lambda x: order.get(id(x[0]), len(order)))
 
 
 def load_plugin(plugin_group: "PluginGroup", plugin_dir: Path) -> None | Plugin:
@@ -126,6 +249,19 @@ def load_plugin(plugin_group: "PluginGroup", plugin_dir: Path) -> None | Plugin:
     Returns:
         Union[None, Plugin]: 插件实例
     """
+    plugin, mode_str = _import_plugin(plugin_group, plugin_dir)
+    return _register_plugin(plugin_group, plugin_dir, plugin, mode_str)
+
+
+def _import_plugin(
+    plugin_group: "PluginGroup", plugin_dir: Path
+) -> tuple[Plugin | None, str]:
+    """
+    导入插件模块并检查插件主类, 可以在多个线程中同时调用
+
+    Returns:
+        tuple[Plugin | None, str]: 插件实例 (跳过加载时为 None), 载入方式
+    """
     global __cached_frame
     if isinstance(plugin_group, type(None)):
         raise ValueError("插件组未初始化读取")
@@ -134,16 +270,15 @@ def load_plugin(plugin_group: "PluginGroup", plugin_dir: Path) -> None | Plugin:
     __cached_frame = plugin_group.linked_frame
     try:
         if (plugin_dir / "__init__.py").is_file():
+            # 重载前插件的模块已从 sys.modules 中清除, 这里总是重新执行插件代码
             plugin_module = importlib.import_module(plugin_dir.name)
-            if plugin_module in loaded_plugin_modules:
-                importlib.reload(plugin_module)
-                mode_str = "重载"
-            else:
-                loaded_plugin_modules.append(plugin_module)
-                mode_str = "载入"
+            with _modules_lock:
+                if plugin_module not in loaded_plugin_modules:
+                    loaded_plugin_modules.append(plugin_module)
+            mode_str = "重载" if hot_reload.is_loaded(plugin_dir) else "载入"
         else:
             fmts.print_war(f"{plugin_dir.name} 文件夹 未发现插件文件，跳过加载")
-            return None
+            return None, ""
         plugin: Plugin | None = plugin_module.__dict__.get("entry")
         if not isinstance(plugin, Plugin):
             raise NotValidPluginError(
@@ -155,17 +290,7 @@ def load_plugin(plugin_group: "PluginGroup", plugin_dir: Path) -> None | Plugin:
             raise NotValidPluginError(
                 f"插件主类 {plugin.__class__.__name__} 的 version 属性需要是长度为 3 的元组, 如 (0, 0, 1)"
             )
-        if plugin._api_names:
-            # 此插件应该作为 API 插件
-            for api_name in plugin._api_names:
-                plugin_group.plugins_api[api_name] = plugin
-        version_str = ".".join(map(str, plugin.version))
-        plugin._plugin_group = plugin_group
-        fmts.print_suc(
-            f"已{mode_str}插件 §f{plugin.name}§b@{version_str} §a作者: §r{plugin.author}"
-        )
-        plugin_group.normal_plugin_loaded_num += 1
-        return plugin
+        return plugin, mode_str
     except NotValidPluginError as err:
         fmts.print_err(f"插件 {plugin_dir.name} 不合法：{err.args[0]}")
         raise SystemExit from err
@@ -184,4 +309,31 @@ def load_plugin(plugin_group: "PluginGroup", plugin_dir: Path) -> None | Plugin:
         fmts.print_err(f"加载插件 {plugin_dir.name} 出现问题，报错如下：")
         fmts.print_err("§c" + traceback.format_exc())
         raise SystemExit from err
-    return None
+    return None, ""
+
+
+def _register_plugin(
+    plugin_group: "PluginGroup",
+    plugin_dir: Path,
+    plugin: Plugin | None,
+    mode_str: str,
+) -> Plugin | None:
+    "将已导入的插件注册到插件组, 需要按插件顺序在同一线程中调用"
+    if plugin is None:
+        return None
+    _publish_plugin(plugin_group, plugin)
+    version_str = ".".join(map(str, plugin.version))
+    fmts.print_suc(
+        f"已{mode_str}插件 §f{plugin.name}§b@{version_str} §a作者: §r{plugin.author}"
+    )
+    plugin_group.normal_plugin_loaded_num += 1
+    return plugin
+
+
+def _publish_plugin(plugin_group: "PluginGroup", plugin: Plugin):
+    "绑定插件组并公开插件的 API, 使之后导入的插件可以通过 GetPluginAPI 获取"
+    if plugin._api_names:
+        # 此插件应该作为 API 插件
+        for api_name in plugin._api_names:
+            plugin_group.plugins_api[api_name] = plugin
+    plugin._plugin_group = plugin_group
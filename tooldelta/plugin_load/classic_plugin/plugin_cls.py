@@ -1,3 +1,4 @@
+import asyncio
 import os
 from pathlib import Path
 from typing import TYPE_CHECKING, TypeVar, Any
@@ -5,7 +6,7 @@ from collections.abc import Callable
 
 from ...mc_bytes_packet.pool import is_bytes_packet
 from ...constants import TOOLDELTA_PLUGIN_DATA_DIR, PacketIDS
-from ...utils import cfg, fmts
+from ...utils import async_loop, cfg, fmts
 from ...internal.types import Player, Chat, InternalBroadcast, FrameExit
 from . import event_cbs
 
@@ -99,6 +100,22 @@ class Plugin:
             self.name, template, default_cfg, self.version
         )
 
+    def _wrap_async_cb(self, cb: Callable[..., Any]) -> Callable[..., Any]:
+        # 协程函数回调: 提交到框架的异步事件循环后立即返回, 不阻塞事件线程
+        if not asyncio.iscoroutinefunction(cb):
+            return cb
+
+        def run_async(*args):
+            async def runner():
+                try:
+                    await cb(*args)
+                except Exception as err:
+                    self.frame.on_plugin_err(self.name, err)
+
+            async_loop.run_coroutine(runner(), usage=f"插件 {self.name} 的异步监听回调")
+
+        return run_async
+
     def ListenPreload(self, cb: Callable[[], Any], priority: int = 0):
         """
         监听预加载事件
@@ -126,9 +143,12 @@ class Plugin:
         玩家加入事件: 在有玩家加入游戏时触发一次
 
         Args:
-            cb (Callable[[Player], None]): 监听回调, 传参: 玩家 (Player)
+            cb (Callable[[Player], None]): 监听回调, 传参: 玩家 (Player);
+                可以是协程函数, 此时会在框架的异步事件循环中执行
         """
-        event_cbs.on_player_join_cbs.setdefault(priority, []).append((self, cb))
+        event_cbs.on_player_join_cbs.setdefault(priority, []).append(
+            (self, self._wrap_async_cb(cb))
+        )
 
     def ListenPlayerLeave(self, cb: Callable[[Player], Any], priority: int = 0):
         """
@@ -136,9 +156,12 @@ class Plugin:
         玩家退出事件: 在有玩家退出游戏时触发一次
 
         Args:
-            cb (Callable[[Player], None]): 监听回调, 传参: 玩家 (Player)
+            cb (Callable[[Player], None]): 监听回调, 传参: 玩家 (Player);
+                可以是协程函数, 此时会在框架的异步事件循环中执行
         """
-        event_cbs.on_player_leave_cbs.setdefault(priority, []).append((self, cb))
+        event_cbs.on_player_leave_cbs.setdefault(priority, []).append(
+            (self, self._wrap_async_cb(cb))
+        )
 
     def ListenChat(self, cb: Callable[[Chat], Any], priority: int = 0):
         """
@@ -146,9 +169,13 @@ class Plugin:
         玩家聊天事件: 在有玩家在聊天栏发言时触发一次
 
         Args:
-            cb (Callable[[Player], None]): 监听回调, 传参: 聊天事件 (Chat)
+            cb (Callable[[Player], None]): 监听回调, 传参: 聊天事件 (Chat);
+                可以是协程函数, 此时会在框架的异步事件循环中执行,
+                但无法通过返回 True 拦截之后的监听回调
         """
-        event_cbs.on_chat_cbs.setdefault(priority, []).append((self, cb))
+        event_cbs.on_chat_cbs.setdefault(priority, []).append(
+            (self, self._wrap_async_cb(cb))
+        )
 
     def ListenFrameExit(self, cb: Callable[[FrameExit], Any], priority: int = 0):
         """
@@ -1,5 +1,6 @@
 "插件加载器框架"
 
+import time
 import traceback
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, TypeVar
@@ -20,6 +21,7 @@ from ..game_utils import _set_frame
 from .classic_plugin.loader import Plugin
 from .classic_plugin import event_cbs as classic_plugin
 from .classic_plugin import loader as classic_plugin_loader
+from .classic_plugin import load_scheduler
 from .basic import ON_ERROR_CB
 
 if TYPE_CHECKING:
@@ -37,6 +39,7 @@ class PluginGroup:
             str, classic_plugin.PluginEvents_P[Callable[[InternalBroadcast], Any]]
         ] = {}
         self.plugin_listen_packets: set[PacketIDS] = set()
+        self._hooked_packet_listeners: list[tuple[PacketIDS, Callable, bool]] = []
         self.plugins_api: dict[str, Plugin] = {}
         self.normal_plugin_loaded_num = 0
         self.loaded_plugin_ids = []
@@ -65,15 +68,17 @@ class PluginGroup:
         """
         self.plugins_api = {}
         self.global_broadcast_listeners = {}
-        classic_plugin.reload()
         fmts.print_inf("正在重新读取所有插件")
-        self.load_plugins()
+        self.load_plugins(reload=True)
+        self.hook_packet_handler(self.linked_frame.packet_handler)
         self.execute_reloaded(self.linked_frame.on_plugin_err)
         fmts.print_inf("开始执行插件游戏初始化方法")
         self.execute_init(self.linked_frame.on_plugin_err)
         fmts.print_suc("重载插件已完成")
 
     def hook_packet_handler(self, hdl: "PacketHandler"):
+        # 先移除上一次挂载的监听器, 避免重载后残留失效的监听器
+        self.unhook_packet_handler(hdl)
         self.plugin_listen_packets = set(classic_plugin.dict_packet_funcs.keys()) | set(
             classic_plugin.bytes_packet_funcs.keys()
         )
@@ -91,11 +96,22 @@ class PluginGroup:
 
             if is_bytes_packet(pkID):
                 hdl.add_bytes_packet_listener(pkID, any_bytes_pk_handler, 0)
+                self._hooked_packet_listeners.append((pkID, any_bytes_pk_handler, True))
             else:
                 hdl.add_dict_packet_listener(pkID, any_dict_pk_handler, 0)
+                self._hooked_packet_listeners.append((pkID, any_dict_pk_handler, False))
 
         hdl.add_dict_packet_listener(PacketIDS.Text, self.handle_text_packet)
 
+    def unhook_packet_handler(self, hdl: "PacketHandler"):
+        """移除由插件组挂载到数据包处理器上的插件数据包监听器"""
+        for pkID, cb, is_bytes in self._hooked_packet_listeners:
+            if is_bytes:
+                hdl.remove_bytes_packet_listener(pkID, cb)
+            else:
+                hdl.remove_dict_packet_listener(pkID, cb)
+        self._hooked_packet_listeners.clear()
+
     def brocast_event(self, evt: InternalBroadcast) -> list[Any]:
         callback_list = []
         res = self.global_broadcast_listeners.get(evt.evt_name)
@@ -125,10 +141,13 @@ class PluginGroup:
         self.linked_frame = frame
         _set_frame(frame)
 
-    def load_plugins(self) -> None:
+    def load_plugins(self, reload: bool = False) -> None:
         """
         读取所有插件/重载所有插件 并对插件进行预初始化
 
+        Args:
+            reload (bool, optional): 是否为重载, 重载时只重新导入发生变化的插件
+
         Raises:
             SystemExit: 读取插件出现问题
         """
@@ -138,9 +157,11 @@ class PluginGroup:
         self.normal_plugin_loaded_num = 0
         try:
             fmts.print_inf("§a正在使用 §bHiQuality §dDX§r§a 模式读取插件")
-            classic_plugin_loader.read_plugins(self)
+            classic_plugin_loader.read_plugins(self, reload)
             fmts.print_suc("所有插件读取完毕, 将进行插件初始化")
+            start = time.perf_counter()
             self.execute_preload(self.linked_frame.on_plugin_err)
+            load_scheduler.record_wall_time("预加载", start, time.perf_counter())
             # 主动读取类式插件监听的数据包
             for i in classic_plugin.dict_packet_funcs.keys():
                 self.__add_listen_packet_id(i)
@@ -174,7 +195,10 @@ class PluginGroup:
         Args:
             onerr (Callable[[str, Exception, str], None], optional): 插件出错时的处理方法
         """
-        classic_plugin.execute_active(onerr)
+        start = time.perf_counter()
+        classic_plugin.execute_active(onerr, classic_plugin_loader.plugin_dependencies)
+        load_scheduler.record_wall_time("连接建立", start, time.perf_counter())
+        load_scheduler.print_timing_report()
 
     def execute_player_join(self, player: Player, onerr: ON_ERROR_CB) -> None:
         """执行玩家加入的方法
@@ -10,10 +10,18 @@ from .safe_json import (
     write_to_plugin,
 )
 from .system_safe_close import safe_close
-from .timer_events import timer_event, timer_event_boostrap
+from .timer_events import (
+    timer_event,
+    cron_event,
+    get_timer_stats,
+    timer_event_boostrap,
+)
 from .tooldelta_thread import (
     ToolDeltaThread,
+    CancellationToken,
     createThread,
+    current_cancel_token,
+    get_thread_usage_counts,
     thread_func,
     thread_gather,
     set_timeout,
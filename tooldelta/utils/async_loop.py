@@ -0,0 +1,233 @@
+"""
+ToolDelta 异步事件循环
+
+由框架持有的一个 asyncio 事件循环, 运行在一个系统级 ToolDeltaThread 中,
+插件可以在其中运行协程, 使大量的并发等待 (玩家输入、冷却计时等) 共用一个线程。
+事件循环在第一次被使用时才会启动。
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import traceback
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from . import fmts
+from .tooldelta_thread import ToolDeltaThread
+
+RT = TypeVar("RT")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+# 插件级协程任务, 重载时会被取消
+_plugin_tasks: set[asyncio.Task] = set()
+# 插件级延时回调, 重载时会被取消
+_plugin_timer_handles: set[asyncio.TimerHandle] = set()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取框架的异步事件循环, 如果尚未启动则启动它
+
+    Returns:
+        asyncio.AbstractEventLoop: 事件循环
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            ToolDeltaThread(
+                run_loop,
+                usage="ToolDelta 异步事件循环",
+                thread_level=ToolDeltaThread.SYSTEM,
+            )
+            started.wait()
+            _loop = loop
+        return _loop
+
+
+def in_event_loop() -> bool:
+    "当前是否处于框架的异步事件循环线程中"
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def run_coroutine(
+    coro: Coroutine[Any, Any, RT], usage: str = "", system: bool = False
+) -> "concurrent.futures.Future[RT]":
+    """
+    在框架的异步事件循环中运行协程, 可以在任意线程中调用。
+    协程抛出的异常 (取消除外) 会被输出到控制台。
+
+    Args:
+        coro (Coroutine): 协程
+        usage (str, optional): 协程的用途说明, 用于出错时输出
+        system (bool, optional): 是否为系统级协程; 非系统级协程会在插件重载时被取消
+
+    Returns:
+        concurrent.futures.Future: 协程的结果, 可以通过 `.result(timeout)` 阻塞获取
+    """
+    loop = get_event_loop()
+    name = usage or getattr(coro, "__qualname__", repr(coro))
+
+    async def runner():
+        task = asyncio.current_task()
+        if not system and task is not None:
+            _plugin_tasks.add(task)
+        try:
+            return await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            fmts.print_err(f"协程 {name} 出错:\n" + traceback.format_exc())
+            raise
+        finally:
+            if task is not None:
+                _plugin_tasks.discard(task)
+
+    return asyncio.run_coroutine_threadsafe(runner(), loop)
+
+
+def call_later(
+    delay: float,
+    func: Callable[..., Any],
+    *args,
+    usage: str = "",
+    system: bool = False,
+) -> asyncio.TimerHandle:
+    """
+    在 delay 秒后于异步事件循环中调用 func, 不占用额外线程。
+    func 应当很快返回, 耗时较长的操作请使用 `run_in_thread`。
+    可以在任意线程中调用。
+
+    Args:
+        delay (float): 延迟秒数
+        func (Callable): 回调, 可以是普通函数或协程函数
+        usage (str, optional): 回调的用途说明, 用于出错时输出
+        system (bool, optional): 是否为系统级回调; 非系统级回调会在插件重载时被取消
+
+    Returns:
+        asyncio.TimerHandle: 可以通过 `.cancel()` 取消
+    """
+    loop = get_event_loop()
+    handle_box: list[asyncio.TimerHandle] = []
+    ready = threading.Event()
+
+    def callback():
+        _plugin_timer_handles.discard(handle_box[0])
+        try:
+            if asyncio.iscoroutinefunction(func):
+                run_coroutine(func(*args), usage=usage or func.__name__, system=system)
+            else:
+                func(*args)
+        except Exception:
+            fmts.print_err(
+                f"延时回调 {usage or func.__name__} 出错:\n" + traceback.format_exc()
+            )
+
+    def schedule():
+        handle = loop.call_later(delay, callback)
+        if not system:
+            # 被插件自行取消的回调不会触发, 在集合变大时顺带清理
+            if len(_plugin_timer_handles) >= 1024:
+                _plugin_timer_handles.difference_update(
+                    [h for h in _plugin_timer_handles if h.cancelled()]
+                )
+            _plugin_timer_handles.add(handle)
+        handle_box.append(handle)
+        ready.set()
+
+    if in_event_loop():
+        schedule()
+    else:
+        loop.call_soon_threadsafe(schedule)
+        ready.wait()
+    return handle_box[0]
+
+
+async def run_in_thread(func: Callable[..., RT], *args) -> RT:
+    """
+    在线程池中运行阻塞方法并等待其结果, 用于在协程中调用同步的阻塞 API
+
+    Args:
+        func (Callable): 阻塞方法
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def async_timer_event(t: float, name: str | None = None):
+    """
+    将修饰器下的协程函数作为一个在异步事件循环中执行的定时任务, 每隔 t 秒被执行一次,
+    按固定频率执行而不会因单次执行耗时而漂移; 上一次执行未结束时不会开始下一次。
+    插件重载时定时任务会被自动取消。
+    注意: 当方法被 async_timer_event 修饰后, 需要调用一次该方法才能开始定时任务!
+
+    Args:
+        t (float): 周期秒数
+        name (str, optional): 名字, 默认为自动生成的
+
+    ```python
+        @async_timer_event(0.5, "刷新计分板")
+        async def refresh():
+            ...
+        refresh()
+    ```
+    """
+    if t <= 0:
+        raise ValueError("定时任务周期必须大于 0")
+
+    def receiver(
+        func: Callable[..., Coroutine[Any, Any, Any]],
+    ) -> "Callable[..., concurrent.futures.Future[None]]":
+        task_name = name or f"异步定时任务:{func.__name__}"
+
+        async def timer_loop(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            next_run = loop.time()
+            while True:
+                try:
+                    await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    fmts.print_err(
+                        f"定时任务 {task_name} 出错:\n" + traceback.format_exc()
+                    )
+                next_run += t
+                now = loop.time()
+                if next_run <= now:
+                    # 落后于计划时跳到下一个时间点, 而不是连续补跑
+                    next_run += ((now - next_run) // t + 1) * t
+                await asyncio.sleep(next_run - now)
+
+        def caller(*args, **kwargs):
+            return run_coroutine(timer_loop(*args, **kwargs), usage=task_name)
+
+        return caller
+
+    return receiver
+
+
+def cancel_plugin_tasks():
+    "取消所有插件级协程任务和延时回调, 仅系统内部调用"
+    if _loop is None or _loop.is_closed():
+        return
+
+    def cancel_all():
+        for task in list(_plugin_tasks):
+            task.cancel()
+        for handle in _plugin_timer_handles:
+            handle.cancel()
+        _plugin_timer_handles.clear()
+
+    _loop.call_soon_threadsafe(cancel_all)
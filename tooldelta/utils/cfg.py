@@ -2,6 +2,9 @@
 
 import os
 import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 from ..constants import TOOLDELTA_PLUGIN_CFG_DIR
@@ -9,6 +12,10 @@ from ..constants import TOOLDELTA_PLUGIN_CFG_DIR
 
 NoneType = type(None)
 VERSION = tuple[int, int, int]
+# 编译后的检测器, 参数为 (待检测的值, 来源键名)
+VALIDATOR = Callable[[Any, Any], None]
+# 缓存的已编译检测模版数量上限
+SCHEMA_CACHE_SIZE = 512
 
 PLUGINCFG_DEFAULT = {"配置版本": "0.0.1", "配置项": None}
 PLUGINCFG_STANDARD_TYPE = {"配置版本": str, "配置项": [type(None), dict]}
@@ -209,9 +216,9 @@ def get_plugin_config_and_version(
         defaultCfg["配置版本"] = ".".join([str(n) for n in default_vers])
         check_auto(schema, default)
         default_cfg(f"{p}.json", defaultCfg, force=True)
-    cfg_stdtyp = PLUGINCFG_STANDARD_TYPE.copy()
-    cfg_stdtyp["配置项"] = schema
-    cfgGet = get_cfg(p, cfg_stdtyp)
+    # 与将 schema 嵌入 PLUGINCFG_STANDARD_TYPE 检测等价, 但不必每次为新模版重新编译
+    cfgGet = get_cfg(p, PLUGINCFG_STANDARD_TYPE)
+    check_auto(schema, cfgGet["配置项"], "配置项")
     cfgVers = tuple(int(c) for c in cfgGet["配置版本"].split("."))
     VERSION_LENGTH = 3  # 版本长度
     if len(cfgVers) != VERSION_LENGTH:
@@ -258,47 +265,204 @@ def check_auto(
     """
     if fromkey == FindNone:
         raise ValueError("不允许传入 FindNone")
+    compile_schema(standard)(val, fromkey)
+
+
+_schema_cache: OrderedDict[Any, tuple[Any, VALIDATOR]] = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+
+def compile_schema(standard: Any) -> VALIDATOR:
+    """
+    将检测模版编译为检测器, 检测结果及报错与 check_auto 相同。
+    模版只在第一次使用时被解释一次, 之后的检测直接调用编译好的闭包;
+    编译结果以模版的结构为键缓存, 模版被修改后会重新编译。
+
+    Args:
+        standard (type, dict, list): 标准模版
+
+    Returns:
+        Callable[[Any, Any], None]: 检测器, 参数为 (待检测的值, 来源键名)
+
+    >>> validate = compile_schema({"名称": str, "数量": PInt})
+    >>> validate({"名称": "钻石", "数量": 3}, "?")
+    """
+    key = _schema_key(standard)
+    with _schema_cache_lock:
+        cached = _schema_cache.get(key)
+        if cached is not None:
+            _schema_cache.move_to_end(key)
+            return cached[1]
+    validator = _compile(standard)
+    with _schema_cache_lock:
+        # 同时保存模版本身的引用, 使以 id 为键的未知模版的 id 在缓存期间不会被复用
+        _schema_cache[key] = (standard, validator)
+        while len(_schema_cache) > SCHEMA_CACHE_SIZE:
+            _schema_cache.popitem(last=False)
+    return validator
+
+
+def _schema_key(standard: Any) -> Any:
+    "将模版转换为可哈希的结构键, 结构相同的模版得到相同的键"
+    if isinstance(standard, type):
+        return standard
+    elif isinstance(standard, JsonList):
+        return (JsonList, _schema_key(standard.patt), standard.len_limit)
+    elif isinstance(standard, AnyKeyValue):
+        return (AnyKeyValue, _schema_key(standard.type))
+    elif isinstance(standard, dict):
+        return (dict, tuple((k, _schema_key(v)) for k, v in standard.items()))
+    elif isinstance(standard, IntRange | FloatRange):
+        return (type(standard), standard.min, standard.max)
+    elif isinstance(standard, tuple | list):
+        return (type(standard), tuple(_schema_key(i) for i in standard))
+    return (object, id(standard))
+
+
+def _compile(standard: Any) -> VALIDATOR:
     if isinstance(standard, type):
-        if not _cfg_isinstance(val, standard):
+        return _compile_type(standard)
+    elif isinstance(standard, JsonList):
+        return _compile_list(standard)
+    elif isinstance(standard, dict | AnyKeyValue):
+        return _compile_dict(standard)
+    elif isinstance(standard, IntRange | FloatRange):
+        return _compile_range(standard)
+    elif isinstance(standard, tuple | list):
+        return _compile_union(standard)
+
+    def invalid(val, fromkey):
+        raise ValueError(f'JSON 键 "{fromkey}" 自动检测的标准类型传入异常：{standard}')
+
+    return invalid
+
+
+_SPECIAL_TYPE_CHECKERS: dict[type, Callable[[Any], bool]] = {
+    PInt: lambda obj: isinstance(obj, int) and obj > 0,
+    NNInt: lambda obj: isinstance(obj, int) and obj >= 0,
+    PFloat: lambda obj: isinstance(obj, float) and obj > 0,
+    NNFloat: lambda obj: (isinstance(obj, float) or obj == 0) and obj >= 0,
+    PNumber: lambda obj: isinstance(obj, int | float) and obj > 0,
+    NNNumber: lambda obj: isinstance(obj, int | float) and obj >= 0,
+}
+
+
+def _compile_type(standard: type) -> VALIDATOR:
+    check = _SPECIAL_TYPE_CHECKERS.get(standard)
+    if check is None:
+
+        def check(obj):
+            return isinstance(obj, standard)
+
+    type_name = _get_cfg_type_name(standard)
+
+    def validate(val, fromkey):
+        if not check(val):
             if isinstance(val, dict):
                 raise ConfigValueError(
-                    f'JSON 键"{fromkey}" 对应值的类型不正确：需要 {_get_cfg_type_name(standard)}, '
+                    f'JSON 键"{fromkey}" 对应值的类型不正确：需要 {type_name}, '
                     f"实际上为 json 对象：{json.dumps(val, ensure_ascii=False)}"
                 )
             raise ConfigValueError(
-                f'JSON 键"{fromkey}" 对应值的类型不正确：需要 {_get_cfg_type_name(standard)}, 实际上为 {_get_cfg_type_name(val)}'
+                f'JSON 键"{fromkey}" 对应值的类型不正确：需要 {type_name}, 实际上为 {_get_cfg_type_name(val)}'
             )
-    elif isinstance(standard, JsonList):
-        check_list(standard, val, fromkey)
-    elif isinstance(standard, dict | AnyKeyValue):
-        check_dict(standard, val, fromkey)
-    elif isinstance(standard, IntRange):
-        check_auto(int, val, fromkey)
-        if not standard.min <= val <= standard.max:
-            raise ConfigValueError(
-                f'JSON 键"{fromkey}" 对应值的范围不正确：需要 {standard.min} ~ {standard.max}, 实际上为 {val}'
-            )
-    elif isinstance(standard, FloatRange):
-        check_auto(float, val, fromkey)
-        if not standard.min <= val <= standard.max:
+
+    return validate
+
+
+def _compile_range(standard: "IntRange | FloatRange") -> VALIDATOR:
+    check_type = _compile_type(int if isinstance(standard, IntRange) else float)
+    lo, hi = standard.min, standard.max
+
+    def validate(val, fromkey):
+        check_type(val, fromkey)
+        if not lo <= val <= hi:
             raise ConfigValueError(
-                f'JSON 键"{fromkey}" 对应值的范围不正确：需要 {standard.min} ~ {standard.max}, 实际上为 {val}'
+                f'JSON 键"{fromkey}" 对应值的范围不正确：需要 {lo} ~ {hi}, 实际上为 {val}'
             )
-    elif isinstance(standard, tuple | list):
+
+    return validate
+
+
+def _compile_union(standard: tuple | list) -> VALIDATOR:
+    validators = [_compile(single_type) for single_type in standard]
+
+    def validate(val, fromkey):
         errs = []
-        for single_type in standard:
+        for single_validator in validators:
             try:
-                check_auto(single_type, val, fromkey)
-                break
+                single_validator(val, fromkey)
+                return
             except Exception as err:
                 errs.append(err)
-        else:
-            reason = "\n".join(str(err) for err in errs)
+        reason = "\n".join(str(err) for err in errs)
+        raise ConfigValueError(
+            f'JSON 键 对应的键"{fromkey}" 类型不正确，以下为可能的原因：\n{reason}'
+        )
+
+    return validate
+
+
+def _compile_list(pattern: "JsonList") -> VALIDATOR:
+    validate_item = _compile(pattern.patt)
+    len_limit = pattern.len_limit
+
+    def validate(value, fromkey):
+        if not isinstance(value, list):
             raise ConfigValueError(
-                f'JSON 键 对应的键"{fromkey}" 类型不正确，以下为可能的原因：\n{reason}'
+                f'JSON 键 "{fromkey}" 需要列表 而不是 {_get_cfg_type_name(value)}'
             )
-    else:
-        raise ValueError(f'JSON 键 "{fromkey}" 自动检测的标准类型传入异常：{standard}')
+        if len_limit != -1 and len(value) != len_limit:
+            raise ConfigValueError(
+                f'JSON 键 "{fromkey}" 所对应的值列表有误：需要 {len_limit} 项，实际上为 {len(value)} 项'
+            )
+        for val in value:
+            validate_item(val, fromkey)
+
+    return validate
+
+
+def _compile_dict(pattern: "dict | AnyKeyValue") -> VALIDATOR:
+    def check_is_dict(jsondict, from_key):
+        if not isinstance(jsondict, dict):
+            raise ValueError(
+                f'json 键"{from_key}" 需要 json 对象，而不是 {_get_cfg_type_name(jsondict)}'
+            )
+
+    if isinstance(pattern, AnyKeyValue):
+        validate_val = _compile(pattern.type)
+
+        def validate_any_key(jsondict, from_key):
+            check_is_dict(jsondict, from_key)
+            for key, val in jsondict.items():
+                validate_val(val, key)
+
+        return validate_any_key
+
+    # 每一项为 (键或键组, 检测器)
+    items: list[tuple[Any, VALIDATOR]] = []
+    for key, std_val in pattern.items():
+        if isinstance(key, KeyGroup | str):
+            items.append((key, _compile(std_val)))
+        else:
+            items.append((key, None))  # type: ignore
+
+    def validate(jsondict, from_key):
+        check_is_dict(jsondict, from_key)
+        for key, validate_val in items:
+            if isinstance(key, str):
+                val_get = jsondict.get(key, FindNone)
+                if val_get is FindNone:
+                    raise ConfigKeyError(f"不存在的 JSON 键：{key}")
+                validate_val(val_get, key)
+            elif isinstance(key, KeyGroup):
+                for k, v in jsondict.items():
+                    if k in key.keys:
+                        validate_val(v, k)
+            else:
+                raise ValueError(f"Invalid key type: {key.__class__.__name__}")
+
+    return validate
 
 
 def auto_to_std(cfg):
@@ -341,26 +505,9 @@ def check_dict(pattern: Any, jsondict: Any, from_key="?"):
         pattern: 标准模版 dict
         jsondict: 待检测的配置文件 dict
     """
-    if not isinstance(jsondict, dict):
-        raise ValueError(
-            f'json 键"{from_key}" 需要 json 对象，而不是 {_get_cfg_type_name(jsondict)}'
-        )
-    if isinstance(pattern, AnyKeyValue):
-        for key, val in jsondict.items():
-            check_auto(pattern.type, val, key)
-    else:
-        for key, std_val in pattern.items():
-            if isinstance(key, KeyGroup):
-                for k, v in jsondict.items():
-                    if k in key.keys:
-                        check_auto(std_val, v, k)
-            elif isinstance(key, str):
-                val_get = jsondict.get(key, FindNone)
-                if val_get == FindNone:
-                    raise ConfigKeyError(f"不存在的 JSON 键：{key}")
-                check_auto(std_val, val_get, key)
-            else:
-                raise ValueError(f"Invalid key type: {key.__class__.__name__}")
+    if not isinstance(pattern, dict | AnyKeyValue):
+        raise ValueError("不是合法的标准字典检测样式")
+    compile_schema(pattern)(jsondict, from_key)
 
 
 def check_list(pattern: JsonList, value: Any, fromkey: Any = "?") -> None:
@@ -380,16 +527,7 @@ def check_list(pattern: JsonList, value: Any, fromkey: Any = "?") -> None:
     """
     if not isinstance(pattern, JsonList):
         raise ValueError("不是合法的标准列表检测样式")
-    if not isinstance(value, list):
-        raise ConfigValueError(
-            f'JSON 键 "{fromkey}" 需要列表 而不是 {_get_cfg_type_name(value)}'
-        )
-    if pattern.len_limit != -1 and len(value) != pattern.len_limit:
-        raise ConfigValueError(
-            f'JSON 键 "{fromkey}" 所对应的值列表有误：需要 {pattern.len_limit} 项，实际上为 {len(value)} 项'
-        )
-    for val in value:
-        check_auto(pattern.patt, val, fromkey)
+    compile_schema(pattern)(value, fromkey)
 
 
 def write_default_cfg_file(path: str, default: dict, force: bool = False) -> None:
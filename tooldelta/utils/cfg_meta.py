@@ -1,3 +1,6 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from types import GenericAlias, UnionType
 from typing import Generic, TypeVar, Any, get_args
 from .cfg import (
@@ -10,7 +13,13 @@ from .cfg import (
     VERSION,
 )
 
-__all__ = ["JsonSchema", "field", "get_plugin_config_and_version", "load_by_schema"]
+__all__ = [
+    "JsonSchema",
+    "compile_schema",
+    "field",
+    "get_plugin_config_and_version",
+    "load_by_schema",
+]
 
 T = TypeVar("T")
 JsonSchemaT = TypeVar("JsonSchemaT", bound="JsonSchema")
@@ -186,115 +195,229 @@ def _annotation_type_check(typ):
         raise TypeError(f"不支持的类型注释 {typ}")
 
 
+# 编译后的加载器, 参数为 (待加载的值, 字段名)
+LOADER = Callable[[Any, str], Any]
+# 缓存的已编译加载器数量上限
+LOADER_CACHE_SIZE = 512
+
+_loader_cache: OrderedDict[Any, LOADER] = OrderedDict()
+_loader_cache_lock = threading.Lock()
+
+
 def load_by_schema(obj, typ: type[T] | None, field_name: str = "") -> T:
+    """
+    按照类型注释或 `JsonSchema` 模版检查并加载 json 值
+
+    Args:
+        obj: 待加载的 json 值
+        typ: 类型注释或 `JsonSchema` 模版类
+        field_name (str, optional): 所属字段名, 用于报错
+
+    Raises:
+        ConfigError: 值不符合模版
+    """
+    return compile_schema(typ)(obj, field_name)
+
+
+def compile_schema(typ: type[T] | None) -> Callable[[Any, str], T]:
+    """
+    将类型注释或 `JsonSchema` 模版类编译为加载器, 结果与 `load_by_schema` 相同。
+    类型注释只在第一次使用时被解释一次, 编译结果按类型缓存,
+    缓存数量有上限, 插件重载时会被清空, 以免保留已卸载的插件的模版类。
+
+    Args:
+        typ: 类型注释或 `JsonSchema` 模版类
+
+    Returns:
+        Callable[[Any, str], T]: 加载器, 参数为 (待加载的值, 字段名)
+    """
+    try:
+        with _loader_cache_lock:
+            loader = _loader_cache.get(typ)
+            if loader is not None:
+                _loader_cache.move_to_end(typ)
+                return loader
+    except TypeError:
+        # 不可哈希的类型注释, 不缓存
+        return _compile(typ)
+    loader = _compile(typ)
+    with _loader_cache_lock:
+        _loader_cache[typ] = loader
+        while len(_loader_cache) > LOADER_CACHE_SIZE:
+            _loader_cache.popitem(last=False)
+    return loader
+
+
+def clear_schema_cache():
+    "清空已编译的加载器缓存"
+    with _loader_cache_lock:
+        _loader_cache.clear()
+
+
+def _type_error(obj, typ, field_name: str) -> ConfigError:
+    return ConfigError(
+        f"值 {obj} 类型错误, 需为 {_get_cfg_type_name(typ)}, 得到 {_get_cfg_type_name(type(obj))}",
+        field_name,
+    )
+
+
+def _compile(typ) -> LOADER:
     if typ in checkable_types:
-        if isinstance(obj, int) and typ is float:
-            return obj  # type: ignore
-        if not isinstance(obj, typ):
-            raise ConfigError(
-                f"值 {obj} 类型错误, 需为 {_get_cfg_type_name(typ)}, 得到 {_get_cfg_type_name(type(obj))}",
-                field_name,
-            )
-        return obj  # type: ignore
+        return _compile_checkable(typ)
     elif isinstance(typ, UnionType):
-        for t in get_args(typ):
-            try:
-                return load_by_schema(obj, t)
-            except ConfigError:
-                pass
-        raise ConfigError(
-            f"值 {obj} 类型错误, 需为 {_get_cfg_type_name(typ)}, 得到 {_get_cfg_type_name(type(obj))}",
-            field_name,
-        )
+        return _compile_union(typ)
     elif isinstance(typ, GenericAlias):
-        # list[...]
         orig = typ.__origin__
         if orig is list:
-            if not isinstance(obj, list):
-                raise ConfigError(
-                    f"值 {obj} 类型错误, 需为列表, 得到 {_get_cfg_type_name(type(obj))}",
-                    field_name,
-                )
-            sub_type = get_args(typ)[0]
-            lst = []
-            for i, v in enumerate(obj):
-                try:
-                    lst.append(load_by_schema(v, sub_type))
-                except ConfigError as e:
-                    raise ConfigError(current_key_or_index=i, fromerr=e)
-            return lst  # type: ignore
+            return _compile_list(typ)
         elif orig is dict:
-            if not isinstance(obj, dict):
-                raise ConfigError(
-                    f"值 {obj} 类型错误, 需为json对象, 得到 {_get_cfg_type_name(type(obj))}",
-                    field_name,
-                )
-            sub_type = get_args(typ)[1]
-            dic = {}
-            for k, v in obj.items():
-                try:
-                    dic[k] = load_by_schema(v, sub_type)
-                except ConfigError as e:
-                    raise ConfigError(current_key_or_index=k, fromerr=e)
-            return dic  # type: ignore
+            return _compile_dict(typ)
         elif orig is tuple:
-            if not isinstance(obj, list):
-                raise ConfigError(
-                    f"值 {obj} 类型错误, 需为列表, 得到 {_get_cfg_type_name(type(obj))}",
-                    field_name,
-                )
-            lst = obj.copy()
-            sub_types = get_args(typ)
-            if len(obj) != len(sub_types):
-                raise ConfigError(
-                    f"值 {obj} 类型错误, 需为长度为 {len(sub_types)} 的列表, 实际上为 {len(obj)}",
-                    field_name,
-                )
-            for i, (schema, obj_i) in enumerate(zip(sub_types, obj)):
-                try:
-                    obj[i] = load_by_schema(obj_i, schema)
-                except ConfigError as e:
-                    raise ConfigError(current_key_or_index=i, fromerr=e)
-            return lst  # type: ignore
-        else:
+            return _compile_tuple(typ)
+
+        def unknown_generic(obj, field_name=""):
             raise RuntimeError(f"未知泛型类型 {typ}")
+
+        return unknown_generic
     elif type(typ) is type and issubclass(typ, JsonSchema):
+        return _compile_json_schema(typ)
+    elif typ is Any:
+        return lambda obj, field_name="": obj
+    elif typ is None:
+
+        def load_none(obj, field_name=""):
+            if obj is not None:
+                raise ConfigError(
+                    f"值 {obj} 类型错误, 需为null, 得到 {_get_cfg_type_name(type(obj))}"
+                )
+            return obj
+
+        return load_none
+
+    def unsupported(obj, field_name=""):
+        raise ValueError(f"不支持的模版参数类型: {typ}")
+
+    return unsupported
+
+
+def _compile_checkable(typ: type) -> LOADER:
+    accept_int = typ is float
+
+    def load(obj, field_name=""):
+        if not isinstance(obj, typ) and not (accept_int and isinstance(obj, int)):
+            raise _type_error(obj, typ, field_name)
+        return obj
+
+    return load
+
+
+def _compile_union(typ: UnionType) -> LOADER:
+    loaders = [compile_schema(t) for t in get_args(typ)]
+
+    def load(obj, field_name=""):
+        for loader in loaders:
+            try:
+                return loader(obj, "")
+            except ConfigError:
+                pass
+        raise _type_error(obj, typ, field_name)
+
+    return load
+
+
+def _compile_list(typ: GenericAlias) -> LOADER:
+    load_item = compile_schema(get_args(typ)[0])
+
+    def load(obj, field_name=""):
+        if not isinstance(obj, list):
+            raise ConfigError(
+                f"值 {obj} 类型错误, 需为列表, 得到 {_get_cfg_type_name(type(obj))}",
+                field_name,
+            )
+        lst = []
+        for i, v in enumerate(obj):
+            try:
+                lst.append(load_item(v, ""))
+            except ConfigError as e:
+                raise ConfigError(current_key_or_index=i, fromerr=e)
+        return lst
+
+    return load
+
+
+def _compile_dict(typ: GenericAlias) -> LOADER:
+    load_val = compile_schema(get_args(typ)[1])
+
+    def load(obj, field_name=""):
+        if not isinstance(obj, dict):
+            raise ConfigError(
+                f"值 {obj} 类型错误, 需为json对象, 得到 {_get_cfg_type_name(type(obj))}",
+                field_name,
+            )
+        dic = {}
+        for k, v in obj.items():
+            try:
+                dic[k] = load_val(v, "")
+            except ConfigError as e:
+                raise ConfigError(current_key_or_index=k, fromerr=e)
+        return dic
+
+    return load
+
+
+def _compile_tuple(typ: GenericAlias) -> LOADER:
+    loaders = [compile_schema(t) for t in get_args(typ)]
+
+    def load(obj, field_name=""):
+        if not isinstance(obj, list):
+            raise ConfigError(
+                f"值 {obj} 类型错误, 需为列表, 得到 {_get_cfg_type_name(type(obj))}",
+                field_name,
+            )
+        if len(obj) != len(loaders):
+            raise ConfigError(
+                f"值 {obj} 类型错误, 需为长度为 {len(loaders)} 的列表, 实际上为 {len(obj)}",
+                field_name,
+            )
+        lst = []
+        for i, (loader, obj_i) in enumerate(zip(loaders, obj)):
+            try:
+                lst.append(loader(obj_i, ""))
+            except ConfigError as e:
+                raise ConfigError(current_key_or_index=i, fromerr=e)
+        return lst
+
+    return load
+
+
+def _compile_json_schema(typ: "type[JsonSchema]") -> LOADER:
+    # 每一项为 (属性名, 配置文件键名, 加载器, 默认值, 是否可选)
+    fields = []
+    for k, v in typ._fields.items():
+        assert v._annotation
+        loader = compile_schema(v._annotation)
+        fields.append((k, v.field_name, loader, v.default_value, v.optional))
+
+    def load(obj, field_name=""):
         if not isinstance(obj, dict):
             raise ConfigError(
                 f"值 {obj} 类型错误, 需为json, 得到 {_get_cfg_type_name(type(obj))}",
                 field_name,
             )
-        instance = typ()
-        for k, v in instance._fields.items():
-            annotation = v._annotation
-            assert annotation
-            field_name = v.field_name
-            if field_name in obj:
+        instance = object.__new__(typ)
+        for attr, key, loader, default, optional in fields:
+            if key in obj:
                 try:
-                    setattr(
-                        instance,
-                        k,
-                        load_by_schema(
-                            obj[v.field_name], annotation, field_name
-                        ),
-                    )
+                    setattr(instance, attr, loader(obj[key], key))
                 except ConfigError as e:
-                    raise ConfigError(current_key_or_index=field_name, fromerr=e)
+                    raise ConfigError(current_key_or_index=key, fromerr=e)
             else:
-                if v.default_value is _missing or not v.optional:
-                    raise ConfigError(f"{v.field_name} 缺少必填字段")
-                setattr(instance, k, v.default_value)
+                if default is _missing or not optional:
+                    raise ConfigError(f"{key} 缺少必填字段")
+                setattr(instance, attr, default)
         return instance
-    elif typ is Any:
-        return obj
-    elif typ is None:
-        if obj is not None:
-            raise ConfigError(
-                f"值 {obj} 类型错误, 需为null, 得到 {_get_cfg_type_name(type(obj))}"
-            )
-        return obj
-    else:
-        raise ValueError(f"不支持的模版参数类型: {typ}")
+
+    return load
 
 
 def dump_param(obj):
@@ -1,6 +1,7 @@
 "支持 mc 颜色代码的输出模块"
 
 import datetime
+import functools
 import threading
 import re
 import logging
@@ -35,6 +36,32 @@ def simple_fmt(kw: dict[str, Any], sub: str) -> str:
     return sub
 
 
+@functools.cache
+def _ansi_color_map(showmode: int) -> dict[str, str]:
+    return {
+        "0": f"\033[{showmode};37;90m",
+        "1": f"\033[{showmode};37;34m",
+        "2": f"\033[{showmode};37;32m",
+        "3": f"\033[{showmode};37;36m",
+        "4": f"\033[{showmode};37;31m",
+        "5": f"\033[{showmode};37;35m",
+        "6": f"\033[{showmode};37;33m",
+        "7": f"\033[{showmode};37;90m",
+        "8": f"\033[{showmode};37;2m",
+        "9": f"\033[{showmode};37;94m",
+        "a": f"\033[{showmode};37;92m",
+        "b": f"\033[{showmode};37;96m",
+        "c": f"\033[{showmode};37;91m",
+        "d": f"\033[{showmode};37;95m",
+        "e": f"\033[{showmode};37;93m",
+        "f": f"\033[{showmode};37;1m",
+        "r": "\033[0m",
+        "u": "\033[4m",
+        "l": "\033[1m",
+    }
+
+
+@functools.lru_cache(maxsize=logger.COLOR_CACHE_SIZE)
 def colormode_replace(text: str, showmode=0) -> str:
     """颜色代码替换
 
@@ -46,34 +73,20 @@ def colormode_replace(text: str, showmode=0) -> str:
         str: 替换后的字符串
     """
     # 1 = bg_color
-    text = _strike(text)
-    return (
-        simple_fmt(
-            {
-                "§0": f"\033[{showmode};37;90m",
-                "§1": f"\033[{showmode};37;34m",
-                "§2": f"\033[{showmode};37;32m",
-                "§3": f"\033[{showmode};37;36m",
-                "§4": f"\033[{showmode};37;31m",
-                "§5": f"\033[{showmode};37;35m",
-                "§6": f"\033[{showmode};37;33m",
-                "§7": f"\033[{showmode};37;90m",
-                "§8": f"\033[{showmode};37;2m",
-                "§9": f"\033[{showmode};37;94m",
-                "§a": f"\033[{showmode};37;92m",
-                "§b": f"\033[{showmode};37;96m",
-                "§c": f"\033[{showmode};37;91m",
-                "§d": f"\033[{showmode};37;95m",
-                "§e": f"\033[{showmode};37;93m",
-                "§f": f"\033[{showmode};37;1m",
-                "§r": "\033[0m",
-                "§u": "\033[4m",
-                "§l": "\033[1m",
-            },
-            text,
-        )
-        + "\033[0m"
-    )
+    if "§S" in text:
+        text = _strike(text)
+    color_map = _ansi_color_map(showmode)
+    parts = text.split("§")
+    out = [parts[0]]
+    for part in parts[1:]:
+        if (code := color_map.get(part[:1])) is not None:
+            out.append(code)
+            out.append(part[1:])
+        else:
+            out.append("§")
+            out.append(part)
+    out.append("\033[0m")
+    return "".join(out)
 
 
 def align(text: str, length: int = 15) -> str:
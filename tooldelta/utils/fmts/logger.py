@@ -1,15 +1,28 @@
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
 import re
 import os
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
 from enum import IntEnum
 from rich.logging import RichHandler
 from rich.console import Console
 from rich.markup import escape
+from .. import sys_args
 
 enable_logger = False
+# 异步日志: 日志记录被放入队列, 由单独的线程渲染并写入终端和日志文件,
+# 调用方 (如数据包回调) 不会被终端 I/O 阻塞
+ASYNC_LOGGING = "async-log" in sys_args.sys_args_to_dict()
+# 标准输出不是终端 (如在容器中运行) 时, 不使用 Rich 渲染, 直接输出去除颜色代码的纯文本
+PLAIN_WHEN_NOT_TTY = "plain-log" in sys_args.sys_args_to_dict()
 
 re_color = re.compile(r"§([0-9a-z])")
+# color_to_rich 缓存的转换结果数量上限
+COLOR_CACHE_SIZE = 4096
 
 color_map = {
     "0": "000000",
@@ -69,30 +82,68 @@ class DailyFileHandler(logging.FileHandler):
     def __init__(self, log_dir: str = "日志文件", filename_fmt: str = "%Y-%m-%d.log"):
         os.makedirs(log_dir, exist_ok=True)
         self.log_dir = log_dir
-        self.current_day = 0
         self.filename_fmt = filename_fmt
-        super().__init__(self._get_current_filename(), encoding="utf-8")
+        # 为 True 时每条记录写入后不立即刷新, 由调用方在一批记录写完后调用 flush()
+        self.batch_writes = False
+        now = datetime.now()
+        self._next_rollover = self._get_next_rollover(now)
+        super().__init__(self._get_current_filename(now), encoding="utf-8")
 
-    def _get_current_filename(self):
-        filename = os.path.join(
-            self.log_dir, datetime.now().strftime(self.filename_fmt)
-        )
+    def _get_current_filename(self, now: datetime):
+        filename = os.path.join(self.log_dir, now.strftime(self.filename_fmt))
         return filename
 
-    def _is_new_day(self):
-        return self.current_day != datetime.now().day
-
-    def _update_day(self):
-        self.current_day = datetime.now().day
+    @staticmethod
+    def _get_next_rollover(now: datetime) -> float:
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight + timedelta(days=1)).timestamp()
 
     def emit(self, record):
-        if self._is_new_day():
-            self._update_day()
+        # 只需与缓存的次日零点时间戳比较, 不必每条记录都获取当前日期
+        if record.created >= self._next_rollover:
+            now = datetime.fromtimestamp(record.created)
+            self._next_rollover = self._get_next_rollover(now)
             self.close()
-            new_filename = self._get_current_filename()
-            self.baseFilename = new_filename
+            self.baseFilename = os.path.abspath(self._get_current_filename(now))
             self.stream = self._open()
-        super().emit(record)
+        if not self.batch_writes:
+            super().emit(record)
+            return
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class PlainConsoleHandler(logging.StreamHandler):
+    """
+    不使用 Rich 渲染的终端处理器, 输出去除颜色代码的纯文本
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+        self.setFormatter(
+            logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", "%H:%M")
+        )
+
+    def format(self, record):
+        return re_color.sub("", super().format(record))
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    异步日志的队列监听器, 在队列被取空时才刷新日志文件,
+    使短时间内的大量日志记录合并为一次写入
+    """
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                if isinstance(handler, DailyFileHandler):
+                    handler.flush()
 
 
 class CustomPrefixRichHandler(RichHandler):
@@ -117,38 +168,56 @@ class CustomPrefixRichHandler(RichHandler):
             )
 
 
+_COLOR_CODE_CHARS = frozenset("0123456789abcdefghijklmnopqrstuvwxyz")
+
+
+@functools.lru_cache(maxsize=COLOR_CACHE_SIZE)
 def color_to_rich(text: str):
+    """
+    将 mc 颜色代码转换为 Rich 标记。
+    加入日志、进出提示等大量重复的文本会命中缓存
+    """
+    text = escape(text)
+    if "§" not in text:
+        return text
     last_color = ""
     bold = False
-
-    text = escape(text)
-
-    def repl_cb(match: re.Match[str]) -> str:
-        nonlocal bold, last_color
-        color_char = match.group()[1]
+    parts = text.split("§")
+    out = [parts[0]]
+    for part in parts[1:]:
+        color_char = part[:1]
+        if color_char not in _COLOR_CODE_CHARS:
+            # 不是颜色代码 (包括末尾单独的 §), 原样保留
+            out.append("§")
+            out.append(part)
+            continue
         if color_char == "r":
             if bold:
                 bold = False
-                return "[/bold]"
-            if last_color:
-                _last_color = last_color
+                out.append("[/bold]")
+            elif last_color:
+                out.append(f"[/#{last_color}]")
                 last_color = ""
-                return f"[/#{_last_color}]"
-            return ""
         elif color_char == "l":
             bold = True
-            return "[bold]"
+            out.append("[bold]")
         elif m := color_map.get(color_char):
             last_color = m
-            return f"[#{m}]"
-        else:
-            return ""
-
-    return re_color.sub(repl_cb, text)
+            out.append(f"[#{m}]")
+        out.append(part[1:])
+    return "".join(out)
 
 
 console = Console(highlight=False)
 rich_handler = CustomPrefixRichHandler(console=console, show_time=True, show_path=False)
+console_handler: logging.Handler = (
+    PlainConsoleHandler()
+    if PLAIN_WHEN_NOT_TTY and not console.is_terminal
+    else rich_handler
+)
+file_handler: DailyFileHandler | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+_queue_listener: BatchQueueListener | None = None
 logging.addLevelName(ExtraLevel.SUCCESS, "成功")
 logging.addLevelName(ExtraLevel.LOADING, "加载")
 logging.basicConfig(
@@ -156,21 +225,84 @@ logging.basicConfig(
     format="%(message)s",
     datefmt="%H:%M",
     handlers=[
-        rich_handler,
+        console_handler,
     ],
 )
 
 
+def _install_handlers():
+    "按当前的设置重新安装根日志记录器的处理器"
+    global _queue_handler, _queue_listener
+    root = logging.getLogger()
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+    for handler in (_queue_handler, file_handler, console_handler):
+        if handler is not None:
+            root.removeHandler(handler)
+    # 文件处理器优先于终端处理器, 因为终端处理器会修改日志记录的内容
+    targets: list[logging.Handler] = [
+        h for h in (file_handler, console_handler) if h is not None
+    ]
+    if file_handler is not None:
+        file_handler.batch_writes = ASYNC_LOGGING
+    if ASYNC_LOGGING:
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        _queue_listener = BatchQueueListener(
+            log_queue, *targets, respect_handler_level=True
+        )
+        _queue_listener.start()
+        root.addHandler(_queue_handler)
+    else:
+        _queue_handler = None
+        for handler in targets:
+            root.addHandler(handler)
+
+
+def flush_async_logs():
+    "等待异步日志队列中的记录全部输出, 未启用异步日志时不做任何事"
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener.start()
+
+
+def switch_async_logging(enabled: bool):
+    """
+    切换异步日志模式
+
+    Args:
+        enabled (bool): 是否启用异步日志
+    """
+    global ASYNC_LOGGING
+    if enabled == ASYNC_LOGGING:
+        return
+    ASYNC_LOGGING = enabled
+    _install_handlers()
+
+
 def init_file_logger():
-    daily_file_handler = DailyFileHandler()
+    global file_handler
+    if file_handler is not None:
+        return
+    file_handler = DailyFileHandler()
     file_formatter = logging.Formatter(
         fmt="%(asctime)s [%(levelname)s] %(message)s", datefmt="[%X]"
     )
-    daily_file_handler.setFormatter(file_formatter)
-    logging.getLogger().removeHandler(rich_handler)
-    logging.getLogger().addHandler(daily_file_handler)
-    # 使其优先级高于 rich_handler
-    logging.getLogger().addHandler(rich_handler)
+    file_handler.setFormatter(file_formatter)
+    _install_handlers()
+
+
+@atexit.register
+def _stop_async_logging():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+if ASYNC_LOGGING:
+    _install_handlers()
 
 
 def switch_logger(enabled: bool):
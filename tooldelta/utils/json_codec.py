@@ -0,0 +1,127 @@
+"""
+JSON 编解码层
+
+安装了 orjson 时使用 orjson 进行编解码, 否则使用标准库 json。
+orjson 无法表示的情况 (缩进不为 2, ensure_ascii=True, 超过 64 位的整数,
+NaN/Infinity 等) 会自动回退到标准库, 因此输出的内容与标准库一致
+(仅在不指定缩进时省略了分隔符后的空格)。
+"""
+
+import json
+import math
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+# 当前使用的编解码引擎, "orjson" 或 "json"
+ENGINE = "json" if orjson is None else "orjson"
+
+if orjson is not None:
+    _ORJSON_OPTS = {
+        None: orjson.OPT_NON_STR_KEYS,
+        2: orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2,
+    }
+
+
+def set_engine(engine: str) -> None:
+    """
+    切换编解码引擎
+
+    Args:
+        engine (str): "orjson" 或 "json"
+
+    Raises:
+        ValueError: 未知的引擎, 或 orjson 未安装
+    """
+    global ENGINE
+    if engine not in ("orjson", "json"):
+        raise ValueError(f"未知的 JSON 编解码引擎: {engine}")
+    if engine == "orjson" and orjson is None:
+        raise ValueError("orjson 未安装")
+    ENGINE = engine
+
+
+def dumps_bytes(obj: Any, indent: int | None = None, ensure_ascii=False) -> bytes:
+    """
+    将对象编码为 UTF-8 编码的 JSON 字节串
+
+    Args:
+        obj (Any): 待序列化对象
+        indent (int | None): 缩进, 与 json.dumps 的 indent 参数相同
+        ensure_ascii (bool): 是否转义非 ASCII 字符, 与 json.dumps 相同 (但默认为 False)
+    """
+    if ENGINE == "orjson" and not ensure_ascii:
+        res = _orjson_dumps(obj, indent)
+        if res is not None:
+            return res
+    return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii).encode("utf-8")
+
+
+def dumps(obj: Any, indent: int | None = None, ensure_ascii=False) -> str:
+    """
+    将对象编码为 JSON 字符串, 参数同 `dumps_bytes`
+    """
+    if ENGINE == "orjson" and not ensure_ascii:
+        res = _orjson_dumps(obj, indent)
+        if res is not None:
+            return res.decode("utf-8")
+    return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)
+
+
+def _orjson_dumps(obj: Any, indent: int | None) -> bytes | None:
+    "使用 orjson 编码, 无法得到与标准库一致的输出时返回 None"
+    opt = _ORJSON_OPTS.get(indent)
+    if opt is None:
+        return None
+    try:
+        res = orjson.dumps(obj, option=opt)
+    except TypeError:
+        return None
+    # orjson 会把 NaN/Infinity 写成 null, 输出中有 null 时才需要检查
+    if b"null" in res and _has_non_finite_float(obj):
+        return None
+    return res
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, float):
+            if not math.isfinite(o):
+                return True
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+    return False
+
+
+def loads(s: str | bytes | bytearray | memoryview) -> Any:
+    """
+    解码 JSON 字符串或 UTF-8 编码的 JSON 字节串
+
+    Raises:
+        JSONDecodeError: JSON 格式错误
+    """
+    if ENGINE == "orjson":
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # orjson 拒绝 NaN/Infinity 和超过 64 位的整数, 交给标准库再试一次
+            pass
+    if isinstance(s, memoryview):
+        s = s.tobytes()
+    return json.loads(s)
+
+
+def load_file(path) -> Any:
+    """读取并解码 UTF-8 编码的 JSON 文件"""
+    with open(path, "rb") as f:
+        return loads(f.read())
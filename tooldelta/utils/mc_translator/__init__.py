@@ -3,6 +3,6 @@ Minecraft 文本翻译模块
 """
 
 from .pool import init_pool
-from .translator import translate
+from .translator import translate, get_cache_stats, set_cache_size, clear_cache
 
-__all__ = ["init_pool", "translate"]
+__all__ = ["clear_cache", "get_cache_stats", "init_pool", "set_cache_size", "translate"]
@@ -57,3 +57,28 @@ def parse_replacer(line: str):
             result.append(cached_result.pop(0))
         result.append(param)
     return result
+
+
+# 预编译的翻译模板: (首段文本, str.format 格式串, 参数槽位)
+# 参数槽位为 (参数序号, 格式化方式), 按在格式串中出现的顺序排列
+SLOT = tuple[int, str | None]
+TEMPLATE = tuple[str, str, tuple[SLOT, ...]]
+
+
+def compile_replacer(replacer: REPLACER) -> TEMPLATE:
+    "将解析后的替换列表编译为可以直接 str.format 的模板"
+    fmt_parts: list[str] = []
+    slots: list[SLOT] = []
+    for param in replacer:
+        if isinstance(param, str):
+            fmt_parts.append(param.replace("{", "{{").replace("}", "}}"))
+        else:
+            fmt_parts.append(f"{{{len(slots)}}}")
+            slots.append(param)
+    first_text = replacer[0]
+    assert isinstance(first_text, str), str(replacer)
+    return first_text, "".join(fmt_parts), tuple(slots)
+
+
+def compile_file(content: str) -> dict[str, TEMPLATE]:
+    return {k: compile_replacer(v) for k, v in parse_file(content).items()}
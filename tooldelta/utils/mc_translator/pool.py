@@ -1,16 +1,70 @@
-from .lang_parser import parse_file, REPLACER
-from .zh_CN import LANG
+import marshal
+import os
+import threading
+from ...constants import TOOLDELTA_SYSTEM_PATH
+from .. import startup_profiler
+from .lang_parser import compile_file, TEMPLATE
 
-translator_pool: dict[str, REPLACER] = {}
+# 编译后的翻译模板缓存文件, 语言文件未变化时直接读取, 不必重新解析
+CACHE_PATH = TOOLDELTA_SYSTEM_PATH / "mc_translator.cache"
+# 模板格式变化时需要递增, 使旧的缓存失效
+CACHE_VERSION = 1
+_LANG_SOURCE = os.path.join(os.path.dirname(__file__), "zh_CN.py")
+
+translator_pool: dict[str, TEMPLATE] = {}
+_pool_lock = threading.Lock()
 
 
 def init_pool():
-    p = parse_file(LANG)
-    translator_pool.update(p)
+    """
+    加载翻译数据池。
+    数据池会在第一次翻译时自动加载, 提前调用可以避免第一次翻译时的延迟
+    """
+    with _pool_lock:
+        if not translator_pool:
+            translator_pool.update(_load_pool())
 
 
 def ensure_inited():
     if not translator_pool:
-        raise ValueError(
-            "翻译数据池未初始化, 使用 mc_translator.init_pool() 以初始化数据池。"
-        )
+        init_pool()
+
+
+def _source_key():
+    try:
+        st = os.stat(_LANG_SOURCE)
+    except OSError:
+        return None
+    return CACHE_VERSION, st.st_mtime_ns, st.st_size
+
+
+@startup_profiler.profiled("加载翻译数据池")
+def _load_pool() -> dict[str, TEMPLATE]:
+    key = _source_key()
+    if key is not None:
+        try:
+            with open(CACHE_PATH, "rb") as f:
+                # 一次读入再解析, 比 marshal.load 逐段读取文件快得多
+                cached_key, pool = marshal.loads(f.read())
+            if cached_key == key:
+                return pool
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    from .zh_CN import LANG
+
+    pool = compile_file(LANG)
+    if key is not None:
+        _write_cache(key, pool)
+    return pool
+
+
+def _write_cache(key, pool: dict[str, TEMPLATE]):
+    tmp_path = f"{CACHE_PATH}.tmp"
+    try:
+        os.makedirs(os.path.dirname(tmp_path) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps((key, pool)))
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        # 缓存只是加速手段, 写入失败时下次启动重新解析即可
+        pass
@@ -1,8 +1,18 @@
 import re
+import threading
+from collections import OrderedDict
 from .pool import translator_pool, ensure_inited
 
 sec_translator = re.compile(r"%([A-Za-z0-9\.\-_]+)")
 
+# 翻译结果缓存的条目数上限, 为 0 时不缓存
+TRANSLATE_CACHE_SIZE = 2048
+
+_cache: OrderedDict[tuple, str] = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
 # feat: 内置文本翻译器
 
 def translate(key: str, args: list | None = None, translate_args=True) -> str:
@@ -17,7 +27,73 @@ def translate(key: str, args: list | None = None, translate_args=True) -> str:
     Returns:
         str: 翻译后的文本, 翻译失败将返回原内容
     """
-    ensure_inited()
+    global _cache_hits, _cache_misses
+    if TRANSLATE_CACHE_SIZE <= 0:
+        return _translate(key, args, translate_args)
+    try:
+        cache_key = (key, None if args is None else tuple(args), translate_args)
+        hash(cache_key)
+    except TypeError:
+        # 参数项中有不可哈希的对象, 不缓存
+        return _translate(key, args, translate_args)
+    with _cache_lock:
+        res = _cache.get(cache_key)
+        if res is not None:
+            _cache.move_to_end(cache_key)
+            _cache_hits += 1
+            return res
+        _cache_misses += 1
+    res = _translate(key, args, translate_args)
+    with _cache_lock:
+        _cache[cache_key] = res
+        while len(_cache) > TRANSLATE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return res
+
+
+def get_cache_stats() -> dict[str, int | float]:
+    """
+    获取翻译结果缓存的统计信息
+
+    Returns:
+        dict[str, int | float]: 命中次数, 未命中次数, 命中率, 当前条目数与条目数上限
+    """
+    with _cache_lock:
+        total = _cache_hits + _cache_misses
+        return {
+            "hits": _cache_hits,
+            "misses": _cache_misses,
+            "hit_rate": _cache_hits / total if total else 0.0,
+            "size": len(_cache),
+            "max_size": TRANSLATE_CACHE_SIZE,
+        }
+
+
+def set_cache_size(size: int):
+    """
+    设置翻译结果缓存的条目数上限
+
+    Args:
+        size (int): 条目数上限, 为 0 时关闭缓存
+    """
+    global TRANSLATE_CACHE_SIZE
+    with _cache_lock:
+        TRANSLATE_CACHE_SIZE = size
+        while len(_cache) > max(size, 0):
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    "清空翻译结果缓存及其统计信息"
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        _cache.clear()
+        _cache_hits = _cache_misses = 0
+
+
+def _translate(key: str, args: list | None, translate_args: bool) -> str:
+    if not translator_pool:
+        ensure_inited()
     if key.startswith("§"):
         # e.g. §emultiplayer.player.joined
         color, key = split_color_and_key(key)
@@ -35,27 +111,27 @@ def translate(key: str, args: list | None = None, translate_args=True) -> str:
     res = translator_pool.get(key)
     if res is None:
         return color + key
+    first_text, fmt, slots = res
     if args is None:
-        first_text = res[0]
-        assert isinstance(first_text, str), str(res)
         return first_text
-    sentence = ""
-    for param in res:
-        if isinstance(param, str):
-            sentence += param
+    if not slots:
+        return color + first_text
+    fmt_args = []
+    for idx, mode in slots:
+        arg = args[idx - 1]
+        if isinstance(arg, str):
+            if translate_args and "%" in arg:
+                arg = sec_translator.sub(_translate_match, arg)
+        elif mode is None:
+            arg = str(arg)
         else:
-            idx, mode = param
-            repl_arg = args[idx - 1]
-            if isinstance(repl_arg, str):
-                if translate_args:
-                    repl_arg = sec_translator.sub(
-                        lambda trans: translate(trans.group(0)),
-                        repl_arg,
-                    )
-                sentence += repl_arg
-            else:
-                sentence += mode % repl_arg
-    return color + sentence
+            arg = mode % arg
+        fmt_args.append(arg)
+    return color + fmt.format(*fmt_args)
+
+
+def _translate_match(match: re.Match[str]) -> str:
+    return translate(match.group(0))
 
 
 def split_color_and_key(key_with_color: str):
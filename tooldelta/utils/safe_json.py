@@ -4,7 +4,8 @@ from typing import Any
 from io import TextIOWrapper
 
 from ..constants import TOOLDELTA_PLUGIN_DATA_DIR
-from .safe_writer import safe_write
+from . import json_codec
+from .safe_writer import safe_write, safe_read
 
 PathLike = str | os.PathLike[str]
 
@@ -29,10 +30,9 @@ def safe_json_load(fp: TextIOWrapper | str) -> Any:
         dict | list: JSON 对象
     """
     if isinstance(fp, str):
-        with open(fp, encoding="utf-8") as file:
-            return json.load(file)
+        return safe_read(fp)
     with fp as file:
-        return json.load(file)
+        return json_codec.loads(file.read())
 
 
 class DataReadError(json.JSONDecodeError):
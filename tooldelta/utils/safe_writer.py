@@ -1,26 +1,53 @@
+import copy
+import hashlib
 import json
 import os
+import threading
+import time
 from typing import Any
-from . import fmts
+from . import fmts, json_codec
 
 PathLike = str | os.PathLike[str]
 
-def safe_write(filepath: PathLike, obj: Any, indent=2):
+# 日志模式下, 快照文件小于该大小时每次写入仍直接重写整个文件
+JOURNAL_MIN_SNAPSHOT_SIZE = 256 * 1024
+# 日志模式下, 每追加多少条补丁或距上次 fsync 多少秒后进行一次 fsync
+JOURNAL_FSYNC_EVERY = 32
+JOURNAL_FSYNC_INTERVAL = 1.0
+# 日志文件大小超过快照文件大小的多少倍后合并为新的快照
+JOURNAL_COMPACT_RATIO = 1.0
+
+
+def safe_write(
+    filepath: PathLike, obj: Any, indent=2, journal: bool = False, fsync: bool = False
+):
     """
     安全地写入文件, 防止文件在写入途中被强行中止。
 
     Args:
         filepath (TextIOWrapper): 文件路径
         obj (Any): 写入的 json 待序列化对象
+        journal (bool): 是否使用日志模式 (见 `JsonJournal`), 只写入与上次相比发生变化的部分;
+            使用日志模式写入的文件需要通过 `safe_read` 读取
+        fsync (bool): 是否在替换原文件前将内容落盘
     """
+    if journal:
+        get_journal(filepath, indent).write(obj)
+        return
+    _safe_write_content(filepath, json_codec.dumps(obj, indent=indent), fsync)
+
+
+def _safe_write_content(filepath: PathLike, content: str, fsync: bool = False):
     retry_times = 0
     while 1:
         try:
             bak_name = str(filepath) + ".bak"
-            content = json.dumps(obj, indent=indent, ensure_ascii=False)
             # 1. make backup
             with open(bak_name, "w", encoding="utf-8") as fp:
                 fp.write(content)
+                if fsync:
+                    fp.flush()
+                    os.fsync(fp.fileno())
             # Seemed unneccessary
             # # 2. write orig file
             # with open(filepath, "w", encoding="utf-8") as fp:
@@ -39,3 +66,201 @@ def safe_write(filepath: PathLike, obj: Any, indent=2):
     except FileNotFoundError:
         pass
     os.rename(bak_name, filepath)
+
+
+def safe_read(filepath: PathLike) -> Any:
+    """
+    读取由 `safe_write` 写入的 json 文件, 若存在日志模式的日志文件则依次应用其中的补丁。
+    日志文件头记录的快照摘要与当前快照不一致时, 说明日志属于更早的快照, 将被忽略。
+
+    Args:
+        filepath (str): 文件路径
+
+    Returns:
+        Any: JSON 对象
+    """
+    with open(filepath, "rb") as f:
+        content = f.read()
+    obj = json_codec.loads(content)
+    journal_path = str(filepath) + ".journal"
+    if os.path.isfile(journal_path):
+        with open(journal_path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                try:
+                    patch = json_codec.loads(line)
+                except json.JSONDecodeError:
+                    # 最后一条补丁可能因崩溃只写入了一半
+                    break
+                if i == 0 and "base" in patch:
+                    if patch["base"] != _snapshot_digest(content):
+                        break
+                    continue
+                obj = _apply_patch(obj, patch)
+    return obj
+
+
+class JsonJournal:
+    """
+    以追加补丁的方式写入 json 文件。
+
+    文件本身作为快照, 之后每次写入只将与上次写入相比发生变化的顶层键
+    以一行紧凑 JSON 追加到 `<文件名>.journal`, 多次写入合并进行一次 fsync;
+    日志文件增长到一定大小后合并为新的快照。
+    日志文件的第一行记录其所基于的快照的内容摘要, 读取时摘要与快照不一致的日志会被忽略,
+    因此在写入新快照与清空日志之间崩溃时, 旧的补丁不会覆盖新快照中的值
+    """
+
+    def __init__(self, filepath: PathLike, indent=2):
+        self.filepath = filepath
+        self.indent = indent
+        self.journal_path = str(filepath) + ".journal"
+        self.lock = threading.Lock()
+        # 上次写入内容的深拷贝, 调用方原地修改嵌套对象后仍能比较出变化
+        self._last: Any = None
+        self._has_last = False
+        self._snapshot_size = (
+            os.path.getsize(filepath) if os.path.isfile(filepath) else 0
+        )
+        self._base_digest = _read_journal_base(filepath, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal_size = self._journal.tell()
+        self._unsynced = 0
+        self._last_fsync = time.time()
+
+    def write(self, obj: Any):
+        """写入新的内容"""
+        with self.lock:
+            if not self._has_last or self._snapshot_size < JOURNAL_MIN_SNAPSHOT_SIZE:
+                self._compact(obj)
+                return
+            patch = _make_patch(self._last, obj)
+            if patch is None:
+                return
+            if "r" in patch:
+                self._last = copy.deepcopy(obj)
+            else:
+                for k in patch["d"]:
+                    del self._last[k]
+                for k, v in patch["s"].items():
+                    self._last[k] = copy.deepcopy(v)
+            line = json_codec.dumps(patch)
+            self._journal.write(line + "\n")
+            self._journal.flush()
+            self._journal_size += len(line) + 1
+            self._unsynced += 1
+            if self._journal_size > self._snapshot_size * JOURNAL_COMPACT_RATIO:
+                self._compact(obj)
+            elif (
+                self._unsynced >= JOURNAL_FSYNC_EVERY
+                or time.time() - self._last_fsync >= JOURNAL_FSYNC_INTERVAL
+            ):
+                self._fsync()
+
+    def flush(self):
+        """将已追加的补丁落盘"""
+        with self.lock:
+            if self._unsynced:
+                self._fsync()
+
+    def compact(self):
+        """将日志合并为新的快照"""
+        with self.lock:
+            if self._has_last and self._journal_size:
+                self._compact(self._last)
+
+    def close(self):
+        """合并快照并关闭日志文件, 之后文件本身即为完整内容"""
+        with self.lock:
+            if self._has_last and self._journal_size:
+                self._compact(self._last)
+            self._journal.close()
+
+    def _compact(self, obj: Any):
+        content = json_codec.dumps(obj, indent=self.indent)
+        digest = _snapshot_digest(content.encode("utf-8"))
+        # 内容与日志所基于的快照相同时不重写快照, 直接清空日志即可;
+        # 否则先写入新快照, 此时旧日志的摘要与新快照不一致, 崩溃后也不会被应用
+        if digest != self._base_digest or not os.path.isfile(self.filepath):
+            _safe_write_content(self.filepath, content, fsync=True)
+        self._snapshot_size = os.path.getsize(self.filepath)
+        self._journal.truncate(0)
+        self._journal.seek(0)
+        header = json_codec.dumps({"base": digest})
+        self._journal.write(header + "\n")
+        # 只统计补丁的大小
+        self._journal_size = 0
+        self._base_digest = digest
+        self._fsync()
+        self._last = copy.deepcopy(obj)
+        self._has_last = True
+
+    def _fsync(self):
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._unsynced = 0
+        self._last_fsync = time.time()
+
+
+_journals: dict[str, JsonJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(filepath: PathLike, indent=2) -> JsonJournal:
+    """获取文件对应的日志写入器, 同一文件共享一个写入器"""
+    key = os.path.abspath(filepath)
+    with _journals_lock:
+        if (j := _journals.get(key)) is None:
+            j = _journals[key] = JsonJournal(filepath, indent)
+        return j
+
+
+def close_journal(filepath: PathLike) -> bool:
+    """合并并关闭文件对应的日志写入器, 返回是否存在该写入器"""
+    with _journals_lock:
+        j = _journals.pop(os.path.abspath(filepath), None)
+    if j is None:
+        return False
+    j.close()
+    return True
+
+
+def _snapshot_digest(content: bytes) -> str:
+    # 文本模式写入时换行符可能被转换, 按统一的换行符计算摘要
+    return hashlib.blake2b(content.replace(b"\r\n", b"\n"), digest_size=16).hexdigest()
+
+
+def _read_journal_base(filepath: PathLike, journal_path: str) -> str | None:
+    "读取日志文件头记录的快照摘要, 与当前快照不一致时返回 None"
+    try:
+        with open(journal_path, encoding="utf-8") as f:
+            header = json_codec.loads(f.readline())
+        if not isinstance(header, dict) or "base" not in header:
+            return None
+        with open(filepath, "rb") as f:
+            if _snapshot_digest(f.read()) != header["base"]:
+                return None
+    except (OSError, json.JSONDecodeError):
+        return None
+    return header["base"]
+
+
+def _make_patch(old: Any, new: Any) -> dict | None:
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return {"r": new}
+    # old 为上次写入内容的深拷贝, 按值比较才能发现嵌套对象的原地修改
+    changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    deleted = [k for k in old if k not in new]
+    if not changed and not deleted:
+        return None
+    return {"s": changed, "d": deleted}
+
+
+def _apply_patch(obj: Any, patch: dict) -> Any:
+    if "r" in patch:
+        return patch["r"]
+    if not isinstance(obj, dict):
+        obj = {}
+    for k in patch["d"]:
+        obj.pop(k, None)
+    obj.update(patch["s"])
+    return obj
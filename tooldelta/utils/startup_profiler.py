@@ -0,0 +1,172 @@
+"""
+启动耗时分析
+
+通过启动参数 -profile-startup [输出路径] 开启。开启后记录框架启动过程中
+读取配置、加载接入点库、加载翻译数据池、导入各插件、执行各插件的预加载
+与连接建立回调、获取玩家数据等阶段的耗时, 启动完成后在控制台输出按耗时排序的汇总,
+并导出 Chrome trace 事件格式的 JSON 文件 (可用 chrome://tracing 或 Perfetto 查看)。
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Any, ParamSpec, TypeVar
+
+from . import fmts, sys_args
+
+PT = ParamSpec("PT")
+RT = TypeVar("RT")
+
+_args = sys_args.sys_args_to_dict()
+# 是否开启启动耗时分析
+ENABLED = "profile-startup" in _args
+# 导出的 trace 文件路径
+TRACE_PATH = _args.get("profile-startup") or "startup_trace.json"
+# 控制台汇总最多显示的条目数
+SUMMARY_LIMIT = 30
+
+_origin = time.perf_counter()
+_events: list[dict[str, Any]] = []
+_thread_names: dict[int, str] = {}
+_lock = threading.Lock()
+_finished = False
+
+
+def record(name: str, start: float, end: float, category: str = "startup", **args):
+    """
+    记录一段已经结束的耗时。
+
+    Args:
+        name (str): 名称
+        start (float): 开始时间 (time.perf_counter)
+        end (float): 结束时间 (time.perf_counter)
+        category (str, optional): 分类, 插件相关的耗时使用 "plugin"
+        **args: 附加在 trace 事件上的信息
+    """
+    if not ENABLED or _finished:
+        return
+    thread = threading.current_thread()
+    tid = threading.get_ident()
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": (start - _origin) * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": os.getpid(),
+        "tid": tid,
+    }
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+        _thread_names[tid] = getattr(thread, "usage", thread.name)
+
+
+@contextmanager
+def span(name: str, category: str = "startup", **args):
+    """
+    记录 with 语句块的耗时。
+
+    Args:
+        name (str): 名称
+        category (str, optional): 分类
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, time.perf_counter(), category, **args)
+
+
+def profiled(name: str, category: str = "startup"):
+    """
+    装饰器: 记录函数每次调用的耗时。
+    未开启启动耗时分析时直接返回原函数, 不产生额外开销。
+
+    Args:
+        name (str): 名称
+        category (str, optional): 分类
+    """
+
+    def decorator(func: Callable[PT, RT]) -> Callable[PT, RT]:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: PT.args, **kwargs: PT.kwargs) -> RT:
+            with span(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def finish():
+    "启动完成时调用: 输出耗时汇总并导出 trace 文件, 之后不再记录"
+    global _finished
+    if not ENABLED:
+        return
+    end = time.perf_counter()
+    with _lock:
+        if _finished:
+            return
+        _finished = True
+        events = list(_events)
+        thread_names = dict(_thread_names)
+    pid = os.getpid()
+    events.append(
+        {
+            "name": "启动",
+            "cat": "startup",
+            "ph": "X",
+            "ts": 0,
+            "dur": (end - _origin) * 1e6,
+            "pid": pid,
+            "tid": threading.get_ident(),
+        }
+    )
+    events.extend(
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": tid,
+            "args": {"name": name},
+        }
+        for tid, name in thread_names.items()
+    )
+    _print_summary(events, end - _origin)
+    try:
+        with open(TRACE_PATH, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False
+            )
+        fmts.print_suc(f"启动耗时 trace 已导出到 {os.path.abspath(TRACE_PATH)}")
+    except OSError as err:
+        fmts.print_err(f"启动耗时 trace 导出失败: {err}")
+
+
+def _print_summary(events: list[dict[str, Any]], total: float):
+    costs = sorted(
+        (e for e in events if e["ph"] == "X" and e["name"] != "启动"),
+        key=lambda e: e["dur"],
+        reverse=True,
+    )
+    fmts.print_inf(f"启动耗时分析 (共 {total:.2f}s):")
+    for event in costs[:SUMMARY_LIMIT]:
+        seconds = event["dur"] / 1e6
+        fmts.print_inf(
+            f" §b{fmts.align(event['name'], 40)}§f {seconds * 1000:>9.1f}ms"
+            f" {seconds / total * 100 if total else 0:>5.1f}%"
+        )
+    if len(costs) > SUMMARY_LIMIT:
+        fmts.print_inf(f" ...其余 {len(costs) - SUMMARY_LIMIT} 项见 trace 文件")
@@ -54,6 +54,24 @@ def print_help():
     print("    -server <号码> 强制指定进入的租赁服/房间号")
     print("    -T <token>  使用传入的而非本地的token来登录验证服务器")
     print("    --auth_server <url> 强制指定验证服务器地址")
+    print(
+        "    -callback-workers <线程数>  NeOmega 系接入点使用固定数量的线程执行数据包回调, 同类数据包的回调按顺序执行"
+    )
+    print("    -callback-queue-size <上限>  回调分发队列的待执行回调上限, 默认 4096")
+    print("    -async-log  在单独的线程中输出日志, 输出日志时不阻塞调用方")
+    print("    -plain-log  标准输出不是终端时, 输出不带颜色的纯文本日志")
+    print(
+        "    -profile-startup [输出路径]  分析启动耗时, 输出汇总并导出 Chrome trace 文件 (默认 startup_trace.json)"
+    )
+    print(
+        "    -parallel-plugin-load  按插件间的依赖关系并行导入类式插件和执行连接建立回调"
+    )
+    print(
+        "    -slow-callback-ms <毫秒>  插件监听器执行超过该时间时输出警告和调用栈, 默认 100, 为 0 时不检测"
+    )
+    print(
+        "    -selective-plugin-reload  重载插件时只重新导入发生变化的插件, 未变化的插件不会重新执行 __init__"
+    )
 
 
 def parse_addopt(opt_str: str):
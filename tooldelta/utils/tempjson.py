@@ -2,13 +2,17 @@ import time
 import json
 import os
 import copy
+import hashlib
+import sqlite3
 from pathlib import Path
 from typing import Any, TypeVar
 from collections.abc import Callable
-from threading import Lock, RLock
+from threading import Condition, Lock, RLock
 
-from .timer_events import timer_event
-from .safe_writer import safe_write
+from . import fmts, json_codec
+from .timer_events import timer_event, TimerEventPriority
+from .tooldelta_thread import ToolDeltaThread
+from .safe_writer import safe_write, safe_read, close_journal
 
 PathLike = str | os.PathLike[str]
 VT = TypeVar("VT")
@@ -16,6 +20,18 @@ VT = TypeVar("VT")
 tempjson_rw_lock = Lock()
 tempjson_paths: dict[Path, "_jsonfile_status"] = {}
 
+# 为 True 时, 缓存文件默认使用显式脏标记模式:
+# write 不再与旧内容进行深比较, 而是直接标记为已修改
+DIRTY_TRACKING = False
+# 设置了 flush_delay 的缓存文件, 从第一次未保存的写入起最多多久后一定会被存盘
+FLUSH_MAX_DELAY = 30.0
+
+# 延迟存盘: 虚拟路径 -> (最后一次写入后的存盘时间, 最晚存盘时间)
+_flush_deadlines: dict[Path, tuple[float, float]] = {}
+_flush_cond = Condition(Lock())
+_flusher_thread: ToolDeltaThread | None = None
+
+
 def validate_path(path: PathLike):
     if isinstance(path, Path):
         return path
@@ -30,9 +46,15 @@ class _jsonfile_status:
         need_file_exists: bool,
         default: Any = None,
         unload_delay: float | None = None,
+        dirty_tracking: bool | None = None,
+        flush_delay: float | None = None,
     ):
         self.path = path
         self.is_changed = False
+        self.dirty_tracking = (
+            DIRTY_TRACKING if dirty_tracking is None else dirty_tracking
+        )
+        self.flush_delay = flush_delay
         self.load_time = time.time()
         self.unload_delay = unload_delay
         self.lock = RLock()
@@ -40,14 +62,17 @@ class _jsonfile_status:
         with self.lock:
             if parent_dir and not os.path.isdir(dp := os.path.dirname(path)):
                 raise ValueError("文件夹: " + dp + " 路径不存在")
-            if not need_file_exists and not os.path.isfile(path):
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(default, f, ensure_ascii=False)
-                self.content = default
-                self.is_changed = True
-            else:
-                with open(path, encoding="utf-8") as f:
-                    self.content = json.load(f)
+            self._load(need_file_exists, default)
+
+    def _load(self, need_file_exists: bool, default: Any):
+        path = self.path
+        if not need_file_exists and not os.path.isfile(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(default, f, ensure_ascii=False)
+            self.content = default
+            self.is_changed = True
+        else:
+            self.content = safe_read(path)
 
     def flush_time(self):
         self.load_time = time.time()
@@ -68,22 +93,251 @@ class _jsonfile_status:
         with self.lock:
             self.flush_time()
             if not self.is_changed:
-                self.is_changed = content != self.content
+                # 同一对象被原地修改后写回时无法比较, 直接视为已修改
+                self.is_changed = (
+                    self.dirty_tracking
+                    or content is self.content
+                    or content != self.content
+                )
             self.content = content
+            if self.is_changed:
+                self._schedule_flush()
+
+    def update(self, key: Any, value: Any):
+        with self.lock:
+            self.flush_time()
+            # 写时复制: 不修改旧的顶层对象, 已被 snapshot 取走的内容不受影响
+            content = self.content.copy()
+            content[key] = value
+            self.content = content
+            self.is_changed = True
+            self._schedule_flush()
+
+    def mark_dirty(self):
+        with self.lock:
+            self.is_changed = True
+            self._schedule_flush()
 
     def save(self):
         with self.lock:
             if self.is_changed:
-                safe_write(self.path, self.content)
+                self.is_changed = False
+                try:
+                    safe_write(self.path, self.content)
+                except BaseException:
+                    self.is_changed = True
+                    raise
+
+    def close(self):
+        pass
+
+    def _schedule_flush(self):
+        if self.flush_delay is None:
+            return
+        now = time.time()
+        with _flush_cond:
+            _, latest = _flush_deadlines.get(self.path, (0, now + FLUSH_MAX_DELAY))
+            _flush_deadlines[self.path] = (now + self.flush_delay, latest)
+            _ensure_flusher()
+            _flush_cond.notify()
+
+
+class _journal_jsonfile_status(_jsonfile_status):
+    """以日志模式写入的缓存文件, 存盘时只追加发生变化的顶层键 (见 safe_writer.JsonJournal)"""
 
+    def save(self):
+        with self.lock:
+            if self.is_changed:
+                self.is_changed = False
+                try:
+                    safe_write(self.path, self.content, journal=True)
+                except BaseException:
+                    self.is_changed = True
+                    raise
+
+    def close(self):
+        with self.lock:
+            close_journal(self.path)
 
 
+class _sqlite_jsonfile_status(_jsonfile_status):
+    """
+    以 SQLite (WAL 模式) 存储的缓存文件, JSON 顶层必须为对象,
+    每个顶层键单独存为一行, 存盘时只写入序列化结果发生变化的键
+    """
+
+    def _load(self, need_file_exists: bool, default: Any):
+        db_path = sqlite_path_of(self.path)
+        if not db_path.is_file():
+            if self.path.is_file():
+                migrate_json_to_sqlite(self.path)
+            elif need_file_exists:
+                raise FileNotFoundError(f"文件不存在: {db_path}")
+        self._conn = _open_sqlite(db_path)
+        self._dirty_keys: set[str] = set()
+        self._rewrite_all = False
+        # 键 -> 数据库中该键的值的摘要, 用于在存盘时跳过实际未变化的键
+        self._saved_digests: dict[str, bytes] = {}
+        self.content = {}
+        for k, v in self._conn.execute("SELECT key, value FROM kv"):
+            self.content[k] = json_codec.loads(v)
+            self._saved_digests[k] = _value_digest(v)
+        if not self.content and default:
+            self.write(_check_json_object(default))
+
+    def write(self, content):
+        _check_json_object(content)
+        with self.lock:
+            self.flush_time()
+            old = self.content
+            if content is old:
+                self._rewrite_all = True
+            else:
+                # 逐键按值比较, 只记录可能发生变化或被删除的键;
+                # 新旧内容共用的可变对象可能已被原地修改, 无法比较, 存盘时再按序列化结果比较
+                for k, v in content.items():
+                    if k not in old:
+                        self._dirty_keys.add(k)
+                    elif old[k] is v:
+                        if isinstance(v, (dict, list)):
+                            self._dirty_keys.add(k)
+                    elif old[k] != v:
+                        self._dirty_keys.add(k)
+                self._dirty_keys.update(k for k in old if k not in content)
+            self.content = content
+            if self._rewrite_all or self._dirty_keys:
+                self.is_changed = True
+                self._schedule_flush()
+
+    def update(self, key: Any, value: Any):
+        with self.lock:
+            super().update(key, value)
+            self._dirty_keys.add(key)
+
+    def mark_dirty(self):
+        with self.lock:
+            self._rewrite_all = True
+            super().mark_dirty()
+
+    def save(self):
+        with self.lock:
+            if not self.is_changed:
+                return
+            content = self.content
+            if self._rewrite_all:
+                upserts = list(content)
+            else:
+                upserts = [k for k in self._dirty_keys if k in content]
+            rows = [(k, json_codec.dumps(content[k])) for k in upserts]
+            if not self._rewrite_all:
+                saved = self._saved_digests
+                rows = [(k, v) for k, v in rows if saved.get(k) != _value_digest(v)]
+            with self._conn:
+                if self._rewrite_all:
+                    self._conn.execute("DELETE FROM kv")
+                else:
+                    self._conn.executemany(
+                        "DELETE FROM kv WHERE key = ?",
+                        [(k,) for k in self._dirty_keys if k not in content],
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", rows
+                )
+            if self._rewrite_all:
+                self._saved_digests.clear()
+            else:
+                for k in self._dirty_keys:
+                    if k not in content:
+                        self._saved_digests.pop(k, None)
+            for k, v in rows:
+                self._saved_digests[k] = _value_digest(v)
+            self._dirty_keys.clear()
+            self._rewrite_all = False
+            self.is_changed = False
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
+
+
+def _value_digest(value: str) -> bytes:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+
+
+def sqlite_path_of(path: PathLike) -> Path:
+    "获取 sqlite 存储后端下, 虚拟路径对应的数据库文件路径"
+    return validate_path(path).with_suffix(".db")
+
+
+def migrate_json_to_sqlite(path: PathLike) -> Path:
+    """
+    将 JSON 文件迁移为 sqlite 存储后端使用的数据库文件,
+    迁移完成后原 JSON 文件会被重命名为 `<原文件名>.migrated` 作为备份。
+    以 sqlite 后端加载时, 若数据库文件不存在而 JSON 文件存在, 会自动进行迁移。
+
+    Args:
+        path (str): JSON 文件路径, 顶层必须为对象
+
+    Returns:
+        Path: 数据库文件路径
+    """
+    path = validate_path(path)
+    db_path = sqlite_path_of(path)
+    if db_path.exists():
+        raise FileExistsError(f"数据库文件已存在: {db_path}")
+    content = _check_json_object(json_codec.load_file(path))
+    tmp_path = db_path.with_suffix(".db.tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = _open_sqlite(tmp_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO kv (key, value) VALUES (?, ?)",
+                ((k, json_codec.dumps(v)) for k, v in content.items()),
+            )
+        # 合并 WAL 日志后再移动, 保证数据库文件本身是完整的
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    os.replace(path, str(path) + ".migrated")
+    return db_path
+
+
+def _open_sqlite(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+    )
+    conn.commit()
+    return conn
+
+
+def _check_json_object(content: Any) -> dict:
+    if not isinstance(content, dict):
+        raise ValueError(
+            f"sqlite 存储后端的 JSON 顶层必须为对象, 而不是 {type(content).__name__}"
+        )
+    return content
+
+
+_backends: dict[str, type[_jsonfile_status]] = {
+    "json": _jsonfile_status,
+    "journal": _journal_jsonfile_status,
+    "sqlite": _sqlite_jsonfile_status,
+}
+
 
 def load_from_path(
     path: PathLike,
     need_file_exists: bool = True,
     default: Any = None,
     unload_delay: int | None = None,
+    dirty_tracking: bool | None = None,
+    flush_delay: float | None = None,
+    backend: str = "json",
 ) -> _jsonfile_status:
     """
     将 json 文件从磁盘加载到缓存区，以便快速读写.
@@ -94,7 +348,14 @@ def load_from_path(
         needFileExists (bool, optional): 默认为 True, 为 False 时，若文件路径不存在，就会自动创建一个文件
         default (Any, optional): 默认为 None, 为 None 时，若文件路径不存在，就会自动创建一个文件，且写入默认值 null
         unload_delay (int, optional): 多久没有再进行读写操作时, 将其从缓存卸载
-
+        dirty_tracking (bool, optional): 是否使用显式脏标记模式, 默认取 DIRTY_TRACKING;
+            开启后 write 不再深比较新旧内容, 适合频繁写入的大文件
+        flush_delay (float, optional): 设置后, 文件在最后一次写入 flush_delay 秒后由后台线程存盘,
+            连续的写入会被合并, 但最晚不超过 FLUSH_MAX_DELAY 秒; 默认仅由定时自动保存存盘
+        backend (str, optional): 存储后端, "json" (默认), "journal" 或 "sqlite"。
+            journal 后端存盘时只将变化的顶层键追加到日志文件, 定期合并为完整的 JSON 文件;
+            sqlite 后端将顶层对象的每个键单独存储在同名的 .db 文件中, 存盘时只写入变化的键;
+            若 .db 文件不存在而 JSON 文件存在, 会自动迁移 (见 `migrate_json_to_sqlite`)
 
     Raises:
         err: 文件不存在时
@@ -102,8 +363,15 @@ def load_from_path(
     path = validate_path(path)
     if j := tempjson_paths.get(path):
         return j
-    j = tempjson_paths[path] = _jsonfile_status(
-        path, need_file_exists=need_file_exists, default=default, unload_delay=unload_delay
+    if backend not in _backends:
+        raise ValueError(f"未知的 tempjson 存储后端: {backend}")
+    j = tempjson_paths[path] = _backends[backend](
+        path,
+        need_file_exists=need_file_exists,
+        default=default,
+        unload_delay=unload_delay,
+        dirty_tracking=dirty_tracking,
+        flush_delay=flush_delay,
     )
     return j
 
@@ -122,7 +390,10 @@ def unload_to_path(path: PathLike) -> bool:
     path = validate_path(path)
     if (jsonf := tempjson_paths.get(path)) is not None:
         jsonf.save()
+        jsonf.close()
         del tempjson_paths[path]
+        with _flush_cond:
+            _flush_deadlines.pop(path, None)
         return True
     return False
 
@@ -159,6 +430,54 @@ def get(path: PathLike) -> Any:
     raise ValueError(f"json 路径未初始化, 不能进行读取和写入操作: {path}")
 
 
+def snapshot(path: PathLike) -> Any:
+    """
+    获取缓存区的该虚拟路径的 JSON 快照, 不进行复制。
+    tempjson 自身不会原地修改已有的内容 (`write`, `update` 都会替换为新对象),
+    因此快照在之后的写入中保持不变; 但快照本身必须被视为只读,
+    需要修改时请使用 `read(...)` 或 `update(...)`
+
+    Args:
+        path (str): 文件的虚拟路径
+    """
+    path = validate_path(path)
+    if jsonf := tempjson_paths.get(path):
+        return jsonf.read(deepcopy=False)
+    raise ValueError(f"json 路径未初始化, 不能进行读取和写入操作: {path}")
+
+
+def update(path: PathLike, key: Any, value: Any) -> None:
+    """
+    以写时复制的方式修改缓存区的该虚拟路径的 JSON 的一个顶层键,
+    只复制顶层容器, 并且不需要比较新旧内容
+
+    Args:
+        path (str): 文件的虚拟路径
+        key (Any): 顶层键 (JSON 顶层为列表时为下标)
+        value (Any): 任何合法的 JSON 类型
+    """
+    path = validate_path(path)
+    if jsonf := tempjson_paths.get(path):
+        jsonf.update(key, value)
+    else:
+        raise ValueError(f"json 路径未初始化, 不能进行读取和写入操作：{path}")
+
+
+def mark_dirty(path: PathLike) -> None:
+    """
+    标记缓存区的该虚拟路径的 JSON 已被修改,
+    用于通过 `get(...)` 取得对象并原地修改之后
+
+    Args:
+        path (str): 文件的虚拟路径
+    """
+    path = validate_path(path)
+    if jsonf := tempjson_paths.get(path):
+        jsonf.mark_dirty()
+    else:
+        raise ValueError(f"json 路径未初始化, 不能进行读取和写入操作：{path}")
+
+
 def write(path: PathLike, obj: Any) -> None:
     """
     对缓存区的该虚拟路径的文件进行写操作，这将会覆盖之前的内容
@@ -179,6 +498,7 @@ def load_and_read(
     need_file_exists: bool = True,
     timeout: int = 60,
     default: Callable[[], VT] | VT = {},
+    backend: str = "json",
 ) -> VT:
     """读取 json 文件并将其从磁盘加载到缓存区，以便一段时间内能快速读写.
 
@@ -187,6 +507,7 @@ def load_and_read(
         needFileExists (bool, optional): 默认为 True, 为 False 时，若文件路径不存在，就会自动创建一个文件，且写入默认值 null
         timeout (int, optional): 多久没有再进行读取操作时卸载缓存
         default (() -> Any | Any, optional):
+        backend (str, optional): 存储后端, 见 `load_from_path`
 
     Returns:
         Any: 该虚拟路径的 JSON
@@ -197,12 +518,17 @@ def load_and_read(
             need_file_exists,
             default() if callable(default) else default,
             timeout,
+            backend=backend,
         )
     return read(path)
 
 
 def load_and_write(
-    path: PathLike, obj: Any, need_file_exists: bool = True, timeout: int = 60
+    path: PathLike,
+    obj: Any,
+    need_file_exists: bool = True,
+    timeout: int = 60,
+    backend: str = "json",
 ) -> None:
     """写入 json 文件并将其从磁盘加载到缓存区，以便一段时间内能快速读写.
 
@@ -211,9 +537,12 @@ def load_and_write(
         obj (Any): 任何合法的 JSON 类型 例如 dict/list/str/bool/int/float
         needFileExists (bool, optional): 默认为 True, 为 False 时，若文件路径不存在，就会自动创建一个文件，且写入默认值 null
         timeout (int, optional): 多久没有再进行读取操作时卸载缓存
+        backend (str, optional): 存储后端, 见 `load_from_path`
     """
     if path not in tempjson_paths.keys():
-        load_from_path(path, need_file_exists, default=obj, unload_delay=timeout)
+        load_from_path(
+            path, need_file_exists, default=obj, unload_delay=timeout, backend=backend
+        )
     write(path, obj)
 
 
@@ -245,7 +574,7 @@ def get_tmps() -> dict:
     return tempjson_paths.copy()
 
 
-@timer_event(30, "缓冲区 json 文件自动保存")
+@timer_event(30, "缓冲区 json 文件自动保存", TimerEventPriority.SYSTEM)
 def jsonfile_auto_save():
     save_all()
 
@@ -255,8 +584,54 @@ def save_all():
         for k, v in tempjson_paths.copy().items():
             v.save()
             if v.should_unload():
+                v.close()
                 del tempjson_paths[k]
+    with _flush_cond:
+        _flush_deadlines.clear()
 
 
 def reset():
+    for v in tempjson_paths.values():
+        v.close()
     tempjson_paths.clear()
+    with _flush_cond:
+        _flush_deadlines.clear()
+
+
+def _ensure_flusher():
+    # 需在持有 _flush_cond 时调用
+    global _flusher_thread
+    if _flusher_thread is None or not _flusher_thread.is_alive():
+        _flusher_thread = ToolDeltaThread(
+            _flusher,
+            usage="缓冲区 json 文件延迟存盘",
+            thread_level=ToolDeltaThread.SYSTEM,
+        )
+
+
+def _flusher():
+    while True:
+        with _flush_cond:
+            while True:
+                now = time.time()
+                due = [
+                    path
+                    for path, (at, latest) in _flush_deadlines.items()
+                    if min(at, latest) <= now
+                ]
+                if due:
+                    for path in due:
+                        del _flush_deadlines[path]
+                    break
+                if _flush_deadlines:
+                    wait = min(min(d) for d in _flush_deadlines.values()) - now
+                else:
+                    wait = None
+                _flush_cond.wait(wait)
+        for path in due:
+            if (jsonf := tempjson_paths.get(path)) is None:
+                continue
+            try:
+                jsonf.save()
+            except Exception as err:
+                fmts.print_err(f"缓冲区 json 文件 {path} 存盘失败: {err}")
@@ -1,4 +1,10 @@
+import heapq
+import itertools
+import queue
 import threading
+import time
+import traceback
+from datetime import datetime, timedelta
 from enum import IntEnum
 from typing import Any, TYPE_CHECKING
 from collections.abc import Callable
@@ -11,29 +17,175 @@ if TYPE_CHECKING:
 
     PT = ParamSpec("PT")
 
+# 执行定时任务的工作线程数
+TIMER_WORKERS = 4
+
 
 class TimerEventPriority(IntEnum):
     SYSTEM = 0
     PLUGIN = 1
 
 
+class CronSchedule:
+    """
+    类 cron 的定时表达式: `分 时 日 月 周`,
+    每个字段支持 `*`, `*/n`, `a`, `a-b`, `a-b/n` 以及用逗号分隔的组合,
+    周的取值为 0-6 (0 为周日), 7 也表示周日
+    """
+
+    _FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式需要 5 个字段: {expr}")
+        self.expr = expr
+        (
+            self.minutes,
+            self.hours,
+            self.days,
+            self.months,
+            weekdays,
+        ) = (self._parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, self._FIELDS))
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, lo: int, hi: int) -> set[int]:
+        values: set[int] = set()
+        for part in field.split(","):
+            rng, _, step = part.partition("/")
+            if rng == "*":
+                start, end = lo, hi
+            elif "-" in rng:
+                start, end = map(int, rng.split("-", 1))
+            else:
+                start = end = int(rng)
+                if step:
+                    end = hi
+            if start < lo or end > hi or start > end:
+                raise ValueError(f"cron 字段超出范围 ({lo}-{hi}): {field}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, t: datetime) -> bool:
+        # 与 cron 相同: 日和周都被限定时, 满足其一即可
+        day_ok = t.day in self.days
+        weekday_ok = (t.isoweekday() % 7) in self.weekdays
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, ts: float) -> float:
+        """获取时间戳 ts 之后下一次触发的时间戳"""
+        t = datetime.fromtimestamp(ts).replace(second=0, microsecond=0)
+        t += timedelta(minutes=1)
+        # 最多向后查找 5 年, 防止永远无法满足的表达式 (如 2 月 31 日) 死循环
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months or not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t.timestamp()
+        raise ValueError(f"cron 表达式永远不会被触发: {self.expr}")
+
+
+class TimerTask:
+    "一个已注册的定时任务及其运行统计"
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        priority: TimerEventPriority,
+        interval: float | None = None,
+        cron: CronSchedule | None = None,
+    ):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.interval = interval
+        self.cron = cron
+        self.next_run = 0.0
+        self.cancelled = False
+        self.running = False
+        self.runs = 0
+        self.errors = 0
+        # 因为落后于计划而被合并跳过的触发次数
+        self.missed = 0
+        self.total_runtime = 0.0
+        self.max_runtime = 0.0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def schedule_first(self, now: float):
+        self.next_run = now if self.cron is None else self.cron.next_after(now)
+
+    def schedule_next(self, now: float):
+        """
+        计算下一次触发时间。
+        按固定频率排布在原计划的时间网格上, 而不是以本次实际执行的时间为起点,
+        因此单次执行延迟不会造成累计漂移; 若已落后多个周期, 则跳到下一个网格点并记录跳过的次数
+        """
+        if self.cron is not None:
+            self.next_run = self.cron.next_after(max(now, self.next_run))
+            return
+        assert self.interval is not None
+        self.next_run += self.interval
+        if self.next_run <= now:
+            behind = int((now - self.next_run) // self.interval) + 1
+            self.missed += behind
+            self.next_run += behind * self.interval
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "schedule": self.cron.expr if self.cron else self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "missed": self.missed,
+            "avg_runtime": self.total_runtime / self.runs if self.runs else 0.0,
+            "max_runtime": self.max_runtime,
+            "avg_lateness": self.total_lateness / self.runs if self.runs else 0.0,
+            "max_lateness": self.max_lateness,
+        }
+
+
 stop_event = threading.Event()
-timer_events_table: dict[
-    int, list[tuple[str, Callable, tuple, dict, TimerEventPriority]]
-] = {}
+timer_tasks: list[TimerTask] = []
 timer_event_lock = threading.Lock()
+_wakeup = threading.Condition(timer_event_lock)
+_heap: list[tuple[float, int, TimerTask]] = []
+_heap_seq = itertools.count()
+_running = False
+# 每次启动定时任务自增, 使上一次启动的调度线程在重载后退出
+_generation = 0
+_work_queue: "queue.Queue[tuple[TimerTask, float]]" = queue.Queue()
+# 存活的工作线程数, 工作线程意外退出时减少, 由调度线程补足
+_worker_count = 0
 
 
 def timer_event(
-    t: int, name: str | None = None, thread_priority=TimerEventPriority.PLUGIN
+    t: float, name: str | None = None, thread_priority=TimerEventPriority.PLUGIN
 ):
     """
     将修饰器下的方法作为一个定时任务, 每隔一段时间被执行一次。
-    注意: 请不要在函数内放可能造成堵塞的内容
+    周期可以小于 1 秒; 任务在工作线程池中执行, 同一任务不会并发执行。
+    注意: 请不要在函数内放可能造成长时间堵塞的内容
     注意: 当方法被 timer_event 修饰后, 需要调用一次该方法才能开始定时任务线程!
 
     Args:
-        seconds (int): 周期秒数
+        seconds (float): 周期秒数
         name (Optional[str], optional): 名字, 默认为自动生成的
 
     ```python
@@ -43,13 +195,46 @@ def timer_event(
         greeting()
     ```
     """
+    if t <= 0:
+        raise ValueError("定时任务周期必须大于 0")
+
+    def receiver(func: "Callable[PT, Any]") -> "Callable[PT, None]":
+        def caller(*args, **kwargs):
+            func_name = name or f"简易方法:{func.__name__}"
+            _add_task(
+                TimerTask(func_name, func, args, kwargs, thread_priority, interval=t)
+            )
+
+        return caller
+
+    return receiver
+
+
+def cron_event(
+    expr: str, name: str | None = None, thread_priority=TimerEventPriority.PLUGIN
+):
+    """
+    将修饰器下的方法作为一个按 cron 表达式 (`分 时 日 月 周`, 本地时间) 触发的定时任务。
+    注意: 当方法被 cron_event 修饰后, 需要调用一次该方法才能开始定时任务!
+
+    Args:
+        expr (str): cron 表达式, 见 `CronSchedule`
+        name (Optional[str], optional): 名字, 默认为自动生成的
+
+    ```python
+        @cron_event("0 4 * * *", "每日备份")
+        def backup():
+            ...
+        backup()
+    ```
+    """
+    schedule = CronSchedule(expr)
 
     def receiver(func: "Callable[PT, Any]") -> "Callable[PT, None]":
         def caller(*args, **kwargs):
             func_name = name or f"简易方法:{func.__name__}"
-            timer_events_table.setdefault(t, [])
-            timer_events_table[t].append(
-                (func_name, func, args, kwargs, thread_priority)
+            _add_task(
+                TimerTask(func_name, func, args, kwargs, thread_priority, cron=schedule)
             )
 
         return caller
@@ -57,20 +242,30 @@ def timer_event(
     return receiver
 
 
+def get_timer_stats() -> dict[str, dict[str, Any]]:
+    """
+    获取所有定时任务的运行统计 (耗时和延迟的单位均为秒)
+
+    Returns:
+        dict[str, dict[str, Any]]: 任务名 -> 统计
+    """
+    with timer_event_lock:
+        return {task.name: task.stats() for task in timer_tasks}
+
+
 def reset():
     "清理所有定时任务"
     with timer_event_lock:
-        for k, funcs_args in timer_events_table.copy().items():
-            for func_args in funcs_args.copy():
-                (_n, _, _, _, priority) = func_args
-                if priority != TimerEventPriority.SYSTEM:
-                    timer_events_table[k].remove(func_args)
-            if timer_events_table[k] == []:
-                del timer_events_table[k]
+        for task in timer_tasks.copy():
+            if task.priority != TimerEventPriority.SYSTEM:
+                task.cancelled = True
+                timer_tasks.remove(task)
 
 
 def stopall():
     stop_event.set()
+    with timer_event_lock:
+        _wakeup.notify_all()
 
 
 def timer_event_boostrap():
@@ -79,15 +274,105 @@ def timer_event_boostrap():
     _internal_timer_event_boostrap()
 
 
+def _add_task(task: TimerTask):
+    with timer_event_lock:
+        timer_tasks.append(task)
+        if _running:
+            task.schedule_first(time.time())
+            _push(task)
+            _wakeup.notify()
+
+
+def _push(task: TimerTask):
+    heapq.heappush(_heap, (task.next_run, next(_heap_seq), task))
+
+
 @thread_func("ToolDelta 定时任务", ToolDeltaThread.SYSTEM)
 def _internal_timer_event_boostrap():
-    timer = 0
+    global _running, _generation
     stop_event.clear()
-    while not stop_event.is_set():
+    with timer_event_lock:
+        _generation += 1
+        generation = _generation
+        _ensure_workers()
+        _heap.clear()
+        now = time.time()
+        for task in timer_tasks:
+            task.schedule_first(now)
+            _push(task)
+        _running = True
+        try:
+            while not stop_event.is_set() and generation == _generation:
+                if not _heap:
+                    _wakeup.wait()
+                    continue
+                due, _, task = _heap[0]
+                now = time.time()
+                if due > now:
+                    _wakeup.wait(due - now)
+                    continue
+                heapq.heappop(_heap)
+                if task.cancelled:
+                    continue
+                if task.running:
+                    # 上一次执行尚未结束, 本次触发合并到上一次中
+                    task.missed += 1
+                else:
+                    task.running = True
+                    _ensure_workers()
+                    _work_queue.put((task, due))
+                task.schedule_next(now)
+                _push(task)
+        finally:
+            if generation == _generation:
+                _running = False
+
+
+def _ensure_workers():
+    "补足工作线程, 需要在持有 timer_event_lock 时调用"
+    global _worker_count
+    while _worker_count < TIMER_WORKERS:
+        _worker_count += 1
+        ToolDeltaThread(
+            _worker,
+            usage=f"ToolDelta 定时任务执行线程 #{_worker_count}",
+            thread_level=ToolDeltaThread.SYSTEM,
+        )
+
+
+def _worker():
+    global _worker_count
+    task: TimerTask | None = None
+    try:
+        while True:
+            task = None
+            task, due = _work_queue.get()
+            _run_task(task, due)
+    finally:
+        # 线程被强制终止时, 让调度线程在下次派发任务前补足工作线程
+        with timer_event_lock:
+            _worker_count -= 1
+            if task is not None:
+                task.running = False
+
+
+def _run_task(task: TimerTask, due: float):
+    start = time.time()
+    try:
+        task.func(*task.args, **task.kwargs)
+    except SystemExit:
+        # 任务中的 exit() 或 ThreadExit 只结束本次执行, 工作线程继续运行
+        pass
+    except BaseException:
+        task.errors += 1
+        fmts.print_err(f"定时任务 {task.name} 出错:\n" + traceback.format_exc())
+    finally:
+        runtime = time.time() - start
+        lateness = start - due
         with timer_event_lock:
-            for k, func_args in timer_events_table.copy().items():
-                if timer % k == 0:
-                    for _, caller, args, kwargs, _ in func_args:
-                        caller(*args, **kwargs)
-        stop_event.wait(1)
-        timer += 1
+            task.running = False
+            task.runs += 1
+            task.total_runtime += runtime
+            task.max_runtime = max(task.max_runtime, runtime)
+            task.total_lateness += lateness
+            task.max_lateness = max(task.max_lateness, lateness)
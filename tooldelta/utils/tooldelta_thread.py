@@ -2,21 +2,80 @@ import ctypes
 import time
 import threading
 import traceback
+from collections import Counter
 from typing import Any, TypeVar, ParamSpec, Generic
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Sequence
 from . import fmts
 
 
 PT = ParamSpec("PT")
 VT = TypeVar("VT")
 RT = TypeVar("RT")
-threads_list: list["ToolDeltaThread"] = []
+
+# 强制终止非系统级线程前, 等待线程响应取消令牌自行退出的秒数
+COOPERATIVE_STOP_TIMEOUT = 1.0
+
+# 线程等级 -> 该等级下正在运行的线程 (dict 作为有序集合, 增删均为 O(1))
+_threads_by_level: dict[int, dict["ToolDeltaThread", None]] = {}
+# 线程用途说明 -> 正在运行的线程数
+_usage_counts: Counter[str] = Counter()
+_registry_lock = threading.Lock()
 
 
 class ThreadExit(SystemExit):
     """线程退出"""
 
 
+class CancellationToken:
+    """
+    协作式取消令牌。
+    线程在循环或等待中定期检查令牌, 被取消后自行清理并退出,
+    以避免被强制终止时停在不安全的位置 (如持有锁或正在写文件)。
+
+    ```python
+        @thread_func("自动保存")
+        def autosave():
+            token = current_cancel_token()
+            while not token.wait(30):
+                save()
+    ```
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        "是否已被取消"
+        return self._event.is_set()
+
+    def cancel(self):
+        "取消令牌"
+        self._event.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        等待至令牌被取消或超时, 可以代替 time.sleep 作为可被打断的等待
+
+        Args:
+            timeout (float | None): 超时秒数, None 为一直等待
+
+        Returns:
+            bool: 令牌是否已被取消
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        """
+        令牌已被取消时抛出 ThreadExit 以结束当前线程
+
+        Raises:
+            ThreadExit: 令牌已被取消
+        """
+        if self._event.is_set():
+            raise ThreadExit
+
+
 class ToolDeltaThread(threading.Thread, Generic[PT, RT]):
     "简化 ToolDelta 子线程创建的 threading.Thread 的子类"
 
@@ -47,6 +106,7 @@ class ToolDeltaThread(threading.Thread, Generic[PT, RT]):
         self.all_args = (args, kwargs)
         self.usage = usage or f"fn:{func.__name__}"
         self.stopping = False
+        self.cancel_token = CancellationToken()
         self._thread_level = thread_level
         self._ret_exc = None
         self._stop_event = threading.Event()
@@ -55,7 +115,9 @@ class ToolDeltaThread(threading.Thread, Generic[PT, RT]):
 
     def run(self) -> None:
         """线程运行方法"""
-        threads_list.append(self)
+        with _registry_lock:
+            _threads_by_level.setdefault(self._thread_level, {})[self] = None
+            _usage_counts[self.usage] += 1
         try:
             args, kwargs = self.all_args
             self._ret = self.func(*args, **kwargs)
@@ -80,13 +142,23 @@ class ToolDeltaThread(threading.Thread, Generic[PT, RT]):
                     + traceback.format_exc()
                 )
         finally:
-            threads_list.remove(self)
+            with _registry_lock:
+                _threads_by_level[self._thread_level].pop(self, None)
+                _usage_counts[self.usage] -= 1
+                if _usage_counts[self.usage] <= 0:
+                    del _usage_counts[self.usage]
             self._stop_event.set()
             del self.all_args
 
+    def cancel(self):
+        "通过取消令牌请求线程自行退出, 不会强制终止线程"
+        self.stopping = True
+        self.cancel_token.cancel()
+
     def stop(self) -> bool:
         """终止线程 注意: 不适合在有长时间sleep的线程内调用"""
         self.stopping = True
+        self.cancel_token.cancel()
         thread_id = self.ident
         if thread_id is None:
             return True
@@ -124,9 +196,73 @@ class ToolDeltaThread(threading.Thread, Generic[PT, RT]):
 createThread = ToolDeltaThread
 
 
-def get_threads_list() -> list["createThread"]:
-    """返回使用 createThread 创建的全线程列表。"""
-    return threads_list
+def get_threads_list(thread_level: int | None = None) -> list["createThread"]:
+    """
+    返回使用 createThread 创建的正在运行的线程列表。
+
+    Args:
+        thread_level (int | None): 只返回该等级的线程, 默认返回全部
+    """
+    with _registry_lock:
+        if thread_level is not None:
+            return list(_threads_by_level.get(thread_level, ()))
+        return [t for threads in _threads_by_level.values() for t in threads]
+
+
+class _ThreadsListView(Sequence["createThread"]):
+    """
+    正在运行的线程的只读视图, 每次访问时从按等级索引的线程表中获取,
+    仅用于兼容旧版本的 `threads_list`; 请改用 `get_threads_list()`
+    """
+
+    def _snapshot(self) -> list["createThread"]:
+        return get_threads_list()
+
+    def __getitem__(self, index):
+        return self._snapshot()[index]
+
+    def __len__(self) -> int:
+        with _registry_lock:
+            return sum(len(threads) for threads in _threads_by_level.values())
+
+    def __iter__(self) -> Iterator["createThread"]:
+        return iter(self._snapshot())
+
+    def __contains__(self, thread: object) -> bool:
+        with _registry_lock:
+            return any(thread in threads for threads in _threads_by_level.values())
+
+    def __repr__(self) -> str:
+        return repr(self._snapshot())
+
+
+# 已弃用: 旧版本的线程列表, 现为只读视图, 请使用 get_threads_list()
+threads_list: Sequence["createThread"] = _ThreadsListView()
+
+
+def get_thread_usage_counts() -> dict[str, int]:
+    """
+    返回各用途说明下正在运行的线程数, 按线程数从多到少排列,
+    可用于排查是哪个插件创建了大量线程
+
+    Returns:
+        dict[str, int]: 用途说明 -> 线程数
+    """
+    with _registry_lock:
+        return dict(_usage_counts.most_common())
+
+
+def current_cancel_token() -> CancellationToken:
+    """
+    获取当前线程的取消令牌; 不在 ToolDeltaThread 中调用时返回一个永远不会被取消的令牌
+
+    Returns:
+        CancellationToken: 取消令牌
+    """
+    thread = threading.current_thread()
+    if isinstance(thread, ToolDeltaThread):
+        return thread.cancel_token
+    return CancellationToken()
 
 
 def thread_func(usage: str, thread_level=ToolDeltaThread.PLUGIN):
@@ -202,15 +338,34 @@ def thread_gather(
 
 
 def force_stop_normal_threads():
-    "强制终止非系统级线程, 仅系统内部调用"
-    for i in threads_list:
-        if i._thread_level != i.SYSTEM:
-            fmts.print_suc(f"正在终止线程 {i.usage}  ", end="\r")
-            res = i.stop()
-            if res:
-                fmts.print_suc(f"已终止线程 <{i.usage}>    ")
-            else:
-                fmts.print_suc(f"无法终止线程 <{i.usage}>  ")
+    """
+    终止非系统级线程, 仅系统内部调用。
+    先取消所有线程的取消令牌, 等待至多 COOPERATIVE_STOP_TIMEOUT 秒让线程自行退出,
+    之后仍在运行的线程再被强制终止
+    """
+    with _registry_lock:
+        threads = [
+            t
+            for level, level_threads in _threads_by_level.items()
+            if level != ToolDeltaThread.SYSTEM
+            for t in level_threads
+        ]
+    for i in threads:
+        i.cancel()
+    deadline = time.time() + COOPERATIVE_STOP_TIMEOUT
+    current = threading.current_thread()
+    for i in threads:
+        if i is not current:
+            i.join(max(0.0, deadline - time.time()))
+    for i in threads:
+        if not i.is_alive():
+            continue
+        fmts.print_suc(f"正在终止线程 {i.usage}  ", end="\r")
+        res = i.stop()
+        if res:
+            fmts.print_suc(f"已终止线程 <{i.usage}>    ")
+        else:
+            fmts.print_suc(f"无法终止线程 <{i.usage}>  ")
 
 
 class TimeoutFunc(Generic[PT, RT]):